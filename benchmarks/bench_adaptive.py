@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Simulate practice sessions: maximum-information selection vs. a fixed shuffled slice.
+
+    python3 benchmarks/bench_adaptive.py --rows 1000000 --learners 2000 --target-se 0.3
+
+Item parameters are calibrated from a synthetic answer_logs export (see
+bench_items.py). Simulated learners then answer according to those
+parameters. Each session stops once the standard error of the ability
+estimate reaches --target-se or after --max-questions. For each selection
+mode the harness reports the questions asked, the share of sessions that
+reached the target, the RMSE of the final estimate, and the cost of one
+select + update step.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_items import synthetic_logs  # noqa: E402
+from cdmp_compiler.irt import AdaptiveSession, ItemSelector, calibrate  # noqa: E402
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def simulate(selector, mode, abilities, args):
+    rng = np.random.default_rng(args.seed)
+    slopes, intercepts = args.params
+    asked, reached, errors, steps = [], 0, [], []
+    for ability in abilities:
+        session = AdaptiveSession(selector)
+        order = rng.permutation(len(selector.ids)).tolist() if mode == 'fixed' else None
+        while not session.done(args.target_se) and session.answers < args.max_questions:
+            started = time.perf_counter()
+            if order is None:
+                question_id = session.next_question()
+            else:
+                question_id = int(selector.ids[order[session.answers]])
+            index = selector.index[question_id]
+            correct = rng.random() < 1 / (1 + np.exp(-(slopes[index] * ability + intercepts[index])))
+            session.answer(question_id, correct)
+            steps.append(time.perf_counter() - started)
+        asked.append(session.answers)
+        reached += session.done(args.target_se)
+        errors.append(session.theta - ability)
+    steps.sort()
+    rmse = float(np.sqrt(np.mean(np.square(errors))))
+    print(f"  {mode:<9} {np.mean(asked):>9.1f} {np.median(asked):>7.0f} {reached / len(abilities):>8.1%} "
+          f"{rmse:>7.3f} {percentile(steps, 0.5) * 1e6:>8.1f} {percentile(steps, 0.99) * 1e6:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='answers in the calibration export')
+    parser.add_argument('--users', type=int, default=5_000)
+    parser.add_argument('--questions', type=int, default=800)
+    parser.add_argument('--model', choices=['1pl', '2pl'], default='2pl')
+    parser.add_argument('--learners', type=int, default=1000, help='simulated sessions per mode')
+    parser.add_argument('--target-se', type=float, default=0.3)
+    parser.add_argument('--max-questions', type=int, default=200, help='the current practice slice')
+    parser.add_argument('--mode', nargs='+', choices=['adaptive', 'fixed'], default=['adaptive', 'fixed'])
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    logs = synthetic_logs(args.rows, args.users, args.questions)
+    started = time.perf_counter()
+    params = calibrate(logs, args.model)
+    calibrated = time.perf_counter()
+    selector = ItemSelector(params['questionId'], params['a'], params['b'])
+    print(f"{args.model.upper()} calibration of {len(logs):,} answers: {params['iterations']} iterations, "
+          f"{calibrated - started:.2f}s; lookup tables {time.perf_counter() - calibrated:.3f}s")
+
+    args.params = (params['a'], -params['a'] * params['b'])
+    abilities = np.random.default_rng(args.seed).normal(0, 1, args.learners)
+    print(f"  {'mode':<9} {'mean q':>9} {'median':>7} {'reached':>8} {'RMSE':>7} {'p50 µs':>8} {'p99 µs':>8}")
+    for mode in args.mode:
+        simulate(selector, mode, abilities, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Benchmark the columnar CSV backend against the row path on a large synthetic bank.
+
+    python3 benchmarks/bench_columnar.py                  # 500k questions, both languages
+    python3 benchmarks/bench_columnar.py --size 100000 --lang en
+
+For each language the bank (generated once, as in bench_pipeline.py) goes
+through:
+
+- parse + validate + transform: iter_questions() drained without writing;
+- end to end: compile_languages() with the default artifacts.
+
+Each backend runs in a fresh interpreter: the row path, the columnar path
+with pyarrow and (with --python) the columnar path on csv.reader alone, each
+building into a fresh directory so the release artifact never finds an
+earlier run's manifest and skips its work. The end-to-end outputs are compared byte for byte with the row path's, and the
+exit status is 1 if any differ.
+"""
+import argparse
+import contextlib
+import filecmp
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cdmp_compiler.compiler import compile_languages, iter_questions  # noqa: E402
+from cdmp_compiler.schema import LANGUAGES  # noqa: E402
+
+from bench_pipeline import in_fresh_process, peak_rss_kb, write_bank  # noqa: E402
+
+DEFAULT_SIZE = 500_000
+BACKENDS = ('rows', 'columnar', 'columnar-python')
+
+
+def _use(backend):
+    """parser argument for backend; columnar-python hides pyarrow from this interpreter."""
+    if backend == 'columnar-python':
+        from cdmp_compiler import columnar
+        columnar.pyarrow = None
+    return 'rows' if backend == 'rows' else 'columnar'
+
+
+def time_questions(csv_path, backend):
+    parser = _use(backend)
+    skipped = []
+    started = time.perf_counter()
+    count = sum(1 for _ in iter_questions(csv_path, lambda row, error: skipped.append(row), parser=parser))
+    return {'seconds': time.perf_counter() - started, 'questions': count, 'skipped': len(skipped),
+            'peakRssKb': peak_rss_kb()}
+
+
+def time_build(src_dir, out_dir, language, backend):
+    parser = _use(backend)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        compile_languages(src_dir, out_dir, [language], parser=parser)
+    return {'seconds': time.perf_counter() - started, 'peakRssKb': peak_rss_kb()}
+
+
+def same_outputs(reference_dir, out_dir):
+    """True when both trees hold the same files, subdirectories (releases/) included, byte for byte."""
+    for root, dirs, names in os.walk(reference_dir):
+        other = os.path.join(out_dir, os.path.relpath(root, reference_dir))
+        if not os.path.isdir(other) or sorted(dirs + names) != sorted(os.listdir(other)):
+            return False
+        _, mismatch, errors = filecmp.cmpfiles(root, other, names, shallow=False)
+        if mismatch or errors:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help='questions in the bank')
+    parser.add_argument('--lang', nargs='+', default=list(LANGUAGES))
+    parser.add_argument('--python', action='store_true', help='also time the columnar path without pyarrow')
+    parser.add_argument('--dir', default=os.path.join(tempfile.gettempdir(), 'cdmp_bench_pipeline'),
+                        help='where banks and outputs are written')
+    args = parser.parse_args()
+
+    backends = BACKENDS if args.python else BACKENDS[:2]
+    differing = 0
+    print(f"  {'lang':<4} {'backend':<16} {'parse+validate+transform':>26} {'end to end':>12} "
+          f"{'speedup':>8} {'peak RSS':>10} {'output':>8}")
+    for language in args.lang:
+        csv_path = write_bank(args.dir, args.size, language)
+        reference = None
+        out_dirs = []
+        for backend in backends:
+            questions = in_fresh_process(time_questions, csv_path, backend)
+            out_dir = tempfile.mkdtemp(prefix=f'out-columnar-{args.size}-{backend}-', dir=args.dir)
+            out_dirs.append(out_dir)
+            build = in_fresh_process(time_build, os.path.dirname(csv_path), out_dir, language, backend)
+            if reference is None:
+                reference = questions, build, out_dir
+                identical = 'ref'
+            else:
+                identical = 'same' if same_outputs(reference[2], out_dir) else 'DIFFERS'
+                differing += identical == 'DIFFERS'
+            speedup = f"{reference[0]['seconds'] / questions['seconds']:.1f}x"
+            rss = max(questions['peakRssKb'], build['peakRssKb'])
+            print(f"  {language:<4} {backend:<16} {questions['seconds']:>25.3f}s {build['seconds']:>11.3f}s "
+                  f"{speedup:>8} {rss / 1024:>6.0f} MiB {identical:>8}")
+        print(f"  {language:<4} {questions['questions']:,} questions, {questions['skipped']:,} rows skipped")
+        for out_dir in out_dirs:
+            shutil.rmtree(out_dir, ignore_errors=True)
+    return 1 if differing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
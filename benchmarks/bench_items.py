@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Time item analysis over a synthetic answer_logs export.
+
+    python3 benchmarks/bench_items.py --rows 10000000 --format parquet
+
+Answers are drawn from a 2PL model (user ability, item difficulty and
+discrimination), so the p-values and point-biserials come out realistic.
+The export is written once and reused on later runs with the same size.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cdmp_compiler.analysis import AnswerLogs, item_analysis, load_answer_logs, pyarrow  # noqa: E402
+from cdmp_compiler.schema import CHOICE_COUNT  # noqa: E402
+
+EPOCH_2025 = 1_735_689_600_000_000  # µs
+
+
+def synthetic_logs(rows, users, questions, seed=0):
+    rng = np.random.default_rng(seed)
+    ability = rng.normal(0, 1, users)
+    difficulty = rng.normal(0, 1, questions)
+    slope = rng.lognormal(0, 0.4, questions)
+    key = rng.integers(0, CHOICE_COUNT, questions)
+
+    user = rng.integers(0, users, rows).astype(np.int32)
+    item = rng.integers(0, questions, rows)
+    p_correct = 0.2 + 0.8 / (1 + np.exp(-slope[item] * (ability[user] - difficulty[item])))
+    correct = rng.random(rows) < p_correct
+    wrong = (key[item] + rng.integers(1, CHOICE_COUNT, rows)) % CHOICE_COUNT
+    chosen = np.where(correct, key[item], wrong).astype(np.int8)
+    answered_at = EPOCH_2025 + np.sort(rng.integers(0, 180 * 86_400_000_000, rows))
+    names = [f'00000000-0000-4000-8000-{n:012x}' for n in range(users)]
+    return AnswerLogs(user, item + 1, chosen, correct, answered_at, names)
+
+
+def write_export(logs, path):
+    """Write logs as an answer_logs export (.csv or .parquet; pyarrow required)."""
+    users = np.array(logs.users, dtype=object)[logs.user]
+    table = pyarrow.table({
+        'id': np.arange(1, len(logs) + 1),
+        'user_id': users,
+        'question_id': logs.question,
+        'chosen_index': logs.chosen,
+        'is_correct': logs.correct,
+        'answered_at': pyarrow.array(logs.answered_at, pyarrow.timestamp('us', tz='UTC')),
+    })
+    if path.endswith('.parquet'):
+        pyarrow.parquet.write_table(table, path)
+    else:
+        pyarrow.csv.write_csv(table, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--users', type=int, default=50_000)
+    parser.add_argument('--questions', type=int, default=800)
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='parquet')
+    parser.add_argument('--dir', default=tempfile.gettempdir(), help='where to keep the synthetic export')
+    args = parser.parse_args()
+    if pyarrow is None:
+        sys.exit("the synthetic export is written with pyarrow (pip install pyarrow)")
+
+    path = os.path.join(args.dir, f'answer_logs_{args.rows}_{args.users}_{args.questions}.{args.format}')
+    if not os.path.exists(path):
+        started = time.perf_counter()
+        write_export(synthetic_logs(args.rows, args.users, args.questions), path)
+        print(f"wrote {path} ({os.path.getsize(path):,} bytes) in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    logs = load_answer_logs(path)
+    loaded = time.perf_counter()
+    stats = item_analysis(logs)
+    done = time.perf_counter()
+    print(f"{len(logs):,} rows: load {loaded - started:.2f}s, analysis {done - loaded:.2f}s "
+          f"({len(logs) / (done - loaded) / 1e6:.1f}M rows/s)")
+    print(f"median p-value {np.nanmedian(stats['pValue']):.3f}, "
+          f"median discrimination {np.nanmedian(stats['discrimination']):.3f}")
+
+
+if __name__ == '__main__':
+    main()
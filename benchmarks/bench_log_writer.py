@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Load-test answer_logs writes: one insert per answer vs. batched inserts.
+
+    python3 benchmarks/bench_log_writer.py --clients 1 10 50 200 --answers 100 --rtt-ms 2
+
+Each client is a user taking a test: it submits an answer, waits until it is
+stored, and moves on to the next question. A share of answers is sent twice
+with the same idempotency key, as a client retry would. For every mode and
+concurrency the harness reports stored rows, write transactions, inserts/s
+and p50/p99 latency from submit to commit.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cdmp_compiler.logwriter import (DEFAULT_BATCH_DELAY, DEFAULT_BATCH_ROWS, AnswerEvent,  # noqa: E402
+                                     AnswerLogStore, BatchWriter, DirectWriter)
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def run_client(writer, answers, duplicate_rate, seed, latencies):
+    rng = random.Random(seed)
+    user_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    for question_id in rng.sample(range(1, 800), answers):
+        chosen = rng.randrange(5)
+        event = AnswerEvent(str(uuid.UUID(int=rng.getrandbits(128))), user_id, question_id, chosen,
+                            chosen == 0, datetime.now(timezone.utc).isoformat())
+        started = time.perf_counter()
+        writer.submit(event).result()
+        latencies.append(time.perf_counter() - started)
+        if rng.random() < duplicate_rate:
+            writer.submit(event).result()
+
+
+def run(mode, target, clients, answers, args):
+    store = AnswerLogStore(target, round_trip=args.rtt_ms / 1000)
+    store.clear()
+    if mode == 'batched':
+        writer = BatchWriter(store, args.batch_rows, args.batch_ms / 1000)
+    else:
+        writer = DirectWriter(store)
+    latencies = []
+    threads = [threading.Thread(target=run_client, args=(writer, answers, args.duplicates, n, latencies))
+               for n in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    rows = store.count()
+    store.close()
+    print(f"  {mode:<9} {clients:>7} {rows:>9,} {store.transactions:>8,} {rows / elapsed:>11,.0f} "
+          f"{percentile(latencies, 0.5) * 1000:>8.2f} {percentile(latencies, 0.99) * 1000:>8.2f}")
+    if rows != clients * answers:
+        print(f"  !! expected {clients * answers:,} rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help='SQLite file or postgresql:// URL (default: a fresh temp file per run)')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 10, 50, 200])
+    parser.add_argument('--answers', type=int, default=100, help='answers per client')
+    parser.add_argument('--mode', nargs='+', choices=['direct', 'batched'], default=['direct', 'batched'])
+    parser.add_argument('--batch-rows', type=int, default=DEFAULT_BATCH_ROWS)
+    parser.add_argument('--batch-ms', type=float, default=DEFAULT_BATCH_DELAY * 1000)
+    parser.add_argument('--rtt-ms', type=float, default=1.0, help='simulated round trip per transaction')
+    parser.add_argument('--duplicates', type=float, default=0.02, help='share of answers sent twice')
+    args = parser.parse_args()
+
+    print(f"  {'mode':<9} {'clients':>7} {'rows':>9} {'txns':>8} {'inserts/s':>11} {'p50 ms':>8} {'p99 ms':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for clients in args.clients:
+            for mode in args.mode:
+                target = args.db or os.path.join(tmp, f'{mode}-{clients}.sqlite3')
+                run(mode, target, clients, args.answers, args)
+
+
+if __name__ == '__main__':
+    main()
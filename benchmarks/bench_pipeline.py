@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""Benchmark the CSV -> artifact pipeline on synthetic banks, stage by stage.
+
+    python3 benchmarks/bench_pipeline.py --sizes 1000 10000 100000 1000000
+    python3 benchmarks/bench_pipeline.py --save-baseline          # record this machine's numbers
+    python3 benchmarks/bench_pipeline.py --baseline benchmarks/pipeline_baseline.json
+
+Synthetic banks are generated in both languages the way sample_converter.py
+does, with varied wording so that the search and dedup artifacts see
+realistic vocabularies. Each (size, language) gets:
+
+- one pass timing CSV parse, validate and transform separately;
+- one pass per artifact timing serialization (sink writes plus finishing
+  the file), with the output size of everything the artifact wrote.
+
+Every pass runs in a fresh interpreter so that its peak RSS is its own, and
+every artifact pass writes into a fresh directory, so a stateful artifact
+(release skips work when a matching manifest is already there) measures the
+code rather than what an earlier run left behind.
+Results go to a JSON file. Against a baseline, a stage that got slower by
+more than --max-slowdown, a peak RSS grown by more than --max-rss-growth, or
+an artifact size that changed is reported, and the exit status is 1.
+"""
+import argparse
+import contextlib
+import csv
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cdmp_compiler.artifacts import ARTIFACTS, DEFAULT_ARTIFACTS, artifact_path  # noqa: E402
+from cdmp_compiler.domains import DEFAULT_DOMAINS, DMBOK_DOMAINS  # noqa: E402
+from cdmp_compiler.reader import iter_rows  # noqa: E402
+from cdmp_compiler.schema import COLUMNS, HEADER_ALIASES, LANGUAGES, csv_filename  # noqa: E402
+from cdmp_compiler.transform import SkipRow, build_question, validate_row  # noqa: E402
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pipeline_baseline.json')
+STAGES = ('parse', 'validate', 'transform')
+MIN_COMPARED_SECONDS = 0.05  # shorter stages are too noisy to flag
+
+WORDS = {
+    'en': ('data', 'quality', 'governance', 'metadata', 'master', 'reference', 'warehouse', 'steward',
+           'architecture', 'model', 'security', 'integration', 'lineage', 'catalog', 'policy', 'owner',
+           'process', 'standard', 'business', 'glossary', 'retention', 'privacy', 'profiling', 'record'),
+    'ja': ('データ', '品質', 'ガバナンス', 'メタデータ', 'マスター', '参照', 'ウェアハウス', 'スチュワード',
+           'アーキテクチャ', 'モデル', 'セキュリティ', '統合', 'リネージ', 'カタログ', 'ポリシー', '所有者',
+           'プロセス', '標準', 'ビジネス', '用語集', '保持', 'プライバシー', 'プロファイリング', 'レコード'),
+}
+TEMPLATES = {
+    'en': ('Sample question {i}: which statement about {words} is correct?', 'Option {letter}: {words}',
+           'Explanation for option {letter} of question {i}: {words}.'),
+    'ja': ('サンプル問題{i}：{words}について正しいものはどれか', '選択肢{letter}：{words}',
+           '問題{i}の選択肢{letter}の説明：{words}。'),
+}
+SEPARATOR = {'en': ' ', 'ja': ''}
+
+
+def header(language):
+    """CSV header of the language's export (the Japanese one uses translated names)."""
+    if language == 'ja':
+        names = {column: alias for alias, column in HEADER_ALIASES.items()}
+        return [names.get(column, column) for column in COLUMNS]
+    return list(COLUMNS)
+
+
+def synthetic_rows(count, language, seed=0):
+    """Yield CSV rows of a synthetic bank, ids 1..count, in the canonical column order."""
+    rng = random.Random(seed)
+    words = WORDS[language]
+    question, option, explanation = TEMPLATES[language]
+    domains = [name for code, name in sorted(DMBOK_DOMAINS.items()) if code]
+
+    def phrase(length):
+        return SEPARATOR[language].join(rng.choice(words) for _ in range(length))
+
+    for i in range(1, count + 1):
+        row = [i, question.format(i=i, words=phrase(4))]
+        for letter in 'ABCDE':
+            row.append(option.format(letter=letter, words=phrase(3)))
+            row.append(explanation.format(i=i, letter=letter, words=phrase(12)))
+        row.extend([i % 5 + 1, domains[(i - 1) % len(domains)]])
+        yield row
+
+
+def write_bank(directory, count, language):
+    """Write (once) a synthetic cdmp_questions_<lang>.csv of count questions; returns its path."""
+    bank_dir = os.path.join(directory, f'bank-{count}')
+    path = os.path.join(bank_dir, csv_filename(language))
+    if not os.path.exists(path):
+        os.makedirs(bank_dir, exist_ok=True)
+        with open(path + '.tmp', 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header(language))
+            writer.writerows(synthetic_rows(count, language))
+        os.replace(path + '.tmp', path)
+    return path
+
+
+def peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def time_stages(csv_path):
+    """One streaming pass; seconds spent in each of STAGES."""
+    clock = time.perf_counter
+    spent = dict.fromkeys(STAGES, 0.0)
+    rows = iter_rows(csv_path)
+    count = 0
+    while True:
+        started = clock()
+        item = next(rows, None)
+        parsed = clock()
+        spent['parse'] += parsed - started
+        if item is None:
+            break
+        try:
+            fields = validate_row(item[1])
+        except (SkipRow, ValueError, KeyError):
+            spent['validate'] += clock() - parsed
+            continue
+        validated = clock()
+        build_question(fields, DEFAULT_DOMAINS)
+        spent['transform'] += clock() - validated
+        spent['validate'] += validated - parsed
+        count += 1
+    return {'questions': count, 'stages': spent, 'peakRssKb': peak_rss_kb()}
+
+
+def time_artifact(csv_path, out_dir, language, name):
+    """One pass feeding artifact `name`; seconds spent writing and finishing it."""
+    clock = time.perf_counter
+    spent = 0.0
+    path = artifact_path(out_dir, language, name)
+    sink = ARTIFACTS[name].open(path, {})
+    with contextlib.ExitStack() as stack:
+        started = clock()
+        stack.enter_context(sink)
+        spent += clock() - started
+        for _, row in iter_rows(csv_path):
+            try:
+                question = build_question(validate_row(row), DEFAULT_DOMAINS)
+            except (SkipRow, ValueError, KeyError):
+                continue
+            started = clock()
+            sink.write(question)
+            spent += clock() - started
+        started = clock()
+    spent += clock() - started
+    outputs = [output for output in ARTIFACTS[name].outputs(path) if os.path.exists(output)]
+    return {'seconds': spent, 'bytes': sum(os.path.getsize(output) for output in outputs),
+            'files': len(outputs), 'peakRssKb': peak_rss_kb()}
+
+
+def in_fresh_process(function, *args):
+    """Run function(*args) in a new interpreter so its peak RSS is not the harness'."""
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        return pool.apply(function, args)
+
+
+def print_entry(entry):
+    seconds, size, rss = entry['seconds'], entry['bytes'], entry['peakRssKb']
+    columns = [
+        '' if seconds is None else f"{seconds:.3f}",
+        '' if not seconds else f"{entry['size'] / seconds:,.0f}",
+        '' if size is None else f"{size:,}",
+        '' if rss is None else f"{rss / 1024:.0f} MiB",
+    ]
+    print(f"  {entry['size']:>9,} {entry['language']:<4} {entry['stage']:<18} "
+          f"{columns[0]:>9} {columns[1]:>11} {columns[2]:>14} {columns[3]:>10}")
+
+
+def run(sizes, languages, artifacts, work_dir):
+    results = []
+    print(f"  {'size':>9} {'lang':<4} {'stage':<18} {'seconds':>9} {'rows/s':>11} {'bytes':>14} {'peak RSS':>10}")
+    for size in sizes:
+        for language in languages:
+            started = time.perf_counter()
+            csv_path = write_bank(work_dir, size, language)
+            generated = time.perf_counter() - started
+            if generated > 0.5:
+                print(f"  generated {csv_path} ({os.path.getsize(csv_path):,} bytes) in {generated:.1f}s")
+            measured = in_fresh_process(time_stages, csv_path)
+            entries = [{'stage': stage, 'seconds': seconds, 'bytes': None, 'peakRssKb': measured['peakRssKb']}
+                       for stage, seconds in measured['stages'].items()]
+            entries.append({'stage': 'csv', 'seconds': None, 'bytes': os.path.getsize(csv_path), 'peakRssKb': None})
+            for name in artifacts:
+                out_dir = tempfile.mkdtemp(prefix=f'out-{size}-', dir=work_dir)
+                try:
+                    measured = in_fresh_process(time_artifact, csv_path, out_dir, language, name)
+                finally:
+                    shutil.rmtree(out_dir, ignore_errors=True)
+                entries.append({'stage': f'serialize:{name}', 'seconds': measured['seconds'],
+                                'bytes': measured['bytes'], 'peakRssKb': measured['peakRssKb']})
+            for entry in entries:
+                entry.update(size=size, language=language)
+                print_entry(entry)
+            results.extend(entries)
+    return results
+
+
+def compare(results, baseline, max_slowdown, max_rss_growth):
+    """Lines describing regressions against baseline results."""
+    previous = {(entry['size'], entry['language'], entry['stage']): entry for entry in baseline['results']}
+    regressions = []
+    for entry in results:
+        key = (entry['size'], entry['language'], entry['stage'])
+        before = previous.get(key)
+        if before is None:
+            continue
+        label = f"{entry['size']:,} {entry['language']} {entry['stage']}"
+        if (entry['seconds'] and (before['seconds'] or 0) >= MIN_COMPARED_SECONDS
+                and entry['seconds'] > before['seconds'] * (1 + max_slowdown)):
+            regressions.append(f"{label}: {before['seconds']:.3f}s -> {entry['seconds']:.3f}s")
+        if (entry['peakRssKb'] and before['peakRssKb']
+                and entry['peakRssKb'] > before['peakRssKb'] * (1 + max_rss_growth)):
+            regressions.append(f"{label}: peak RSS {before['peakRssKb']:,} KiB -> {entry['peakRssKb']:,} KiB")
+        if entry['bytes'] != before['bytes']:
+            regressions.append(f"{label}: {before['bytes']} bytes -> {entry['bytes']} bytes")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='questions per bank')
+    parser.add_argument('--lang', nargs='+', default=list(LANGUAGES))
+    parser.add_argument('--artifacts', nargs='+', default=list(DEFAULT_ARTIFACTS) + ['bin'], choices=list(ARTIFACTS))
+    parser.add_argument('--dir', default=os.path.join(tempfile.gettempdir(), 'cdmp_bench_pipeline'),
+                        help='where synthetic banks are kept between runs')
+    parser.add_argument('--output', default='pipeline_results.json', help='results file')
+    parser.add_argument('--baseline', help='results file to compare against')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help=f'also store the results as the baseline (default: {DEFAULT_BASELINE})')
+    parser.add_argument('--max-slowdown', type=float, default=0.25, help='allowed time growth, as a fraction')
+    parser.add_argument('--max-rss-growth', type=float, default=0.25, help='allowed peak RSS growth')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.lang, args.artifacts, args.dir)
+    report = {
+        'v': RESULTS_VERSION,
+        'createdAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()} ({os.cpu_count()} cpus)",
+        'results': results
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+        print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.max_slowdown, args.max_rss_growth)
+        for line in regressions:
+            print(f"  !! {line}")
+        print(f"{len(regressions)} regressions against {args.baseline}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Time full-text lookups against a built .search.json index.
+
+    python3 benchmarks/bench_search.py --out public/data --lang en ja
+
+Reports load time and, per query, cold (first touch decodes postings) and
+warm latency over many repetitions.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cdmp_compiler.artifacts import artifact_path  # noqa: E402
+from cdmp_compiler.cli import DATA_DIR  # noqa: E402
+from cdmp_compiler.search import SearchIndex  # noqa: E402
+
+QUERIES = {
+    'en': ['master data', 'data quality dimensions', 'metadata', 'governance council steward',
+           'reference', 'data warehouse', 'xyzzy'],
+    'ja': ['マスターデータ', 'データ品質', 'メタデータ', 'データガバナンス', '参照', '表',
+           'データウェアハウス', '該当なし語句'],
+}
+
+
+def bench_language(out_dir, language, repeat):
+    path = artifact_path(out_dir, language, 'search')
+    started = time.perf_counter()
+    index = SearchIndex.load(path)
+    load_ms = (time.perf_counter() - started) * 1000
+    print(f"[{language}] {os.path.basename(path)}: {len(index):,} terms, loaded in {load_ms:.1f} ms")
+
+    for query in QUERIES.get(language, QUERIES['en']):
+        started = time.perf_counter()
+        matches = index.search(query)
+        cold_us = (time.perf_counter() - started) * 1e6
+
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            index.search(query)
+            samples.append((time.perf_counter() - started) * 1e6)
+        samples.sort()
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        print(f"  {query!r:<28} {len(matches):>5} hits  cold {cold_us:8.1f} us  "
+              f"warm median {statistics.median(samples):7.1f} us  p99 {p99:7.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default=DATA_DIR, help='directory holding the built artifacts')
+    parser.add_argument('--lang', nargs='+', default=['en', 'ja'])
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+    for language in args.lang:
+        bench_language(args.out, language, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
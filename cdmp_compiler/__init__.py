@@ -0,0 +1,72 @@
+"""Question-bank compiler for the CDMP quiz data in public/data."""
+from .artifacts import ARTIFACTS, DEFAULT_ARTIFACTS, artifact_path
+from .bilingual import write_bundle
+from .binary import BinaryBankWriter, QuestionBank
+from .compact import CompactWriter, from_compact, read_compact, to_compact
+from .compiler import compile_languages, convert_csv_to_json, iter_questions, transform_rows
+from .dedup import DuplicateDetector, DuplicateFilter, signature
+from .domains import DomainIndexWriter, DomainTable, load_domain_index
+from .exams import ExamAssembler, write_forms
+from .hotcold import HotColdWriter, read_cold_block
+from .lint import LintReport, lint_banks
+from .metrics import Metrics
+from .ndjson import NdjsonReader, NdjsonWriter, iter_ndjson
+from .parallel import compile_languages_parallel, plan_chunks
+from .reader import iter_rows
+from .releases import ReleaseWriter, apply_patch, load_release, release_version
+from .search import SearchIndex, SearchIndexWriter, tokenize
+from .sync import copy_file, sync_tree
+from .transform import SkipRow, row_to_question
+from .watch import watch
+from .writer import ListWriter, QuestionsWriter, format_question
+
+__all__ = [
+    'ARTIFACTS',
+    'BinaryBankWriter',
+    'CompactWriter',
+    'DEFAULT_ARTIFACTS',
+    'DomainIndexWriter',
+    'DuplicateDetector',
+    'DuplicateFilter',
+    'ExamAssembler',
+    'HotColdWriter',
+    'DomainTable',
+    'LintReport',
+    'ListWriter',
+    'Metrics',
+    'NdjsonReader',
+    'NdjsonWriter',
+    'QuestionBank',
+    'QuestionsWriter',
+    'ReleaseWriter',
+    'SearchIndex',
+    'SearchIndexWriter',
+    'SkipRow',
+    'apply_patch',
+    'artifact_path',
+    'compile_languages',
+    'compile_languages_parallel',
+    'convert_csv_to_json',
+    'copy_file',
+    'format_question',
+    'from_compact',
+    'iter_ndjson',
+    'iter_questions',
+    'iter_rows',
+    'lint_banks',
+    'load_domain_index',
+    'load_release',
+    'plan_chunks',
+    'read_cold_block',
+    'read_compact',
+    'release_version',
+    'row_to_question',
+    'signature',
+    'sync_tree',
+    'to_compact',
+    'tokenize',
+    'write_bundle',
+    'write_forms',
+    'transform_rows',
+    'watch',
+]
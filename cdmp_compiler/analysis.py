@@ -0,0 +1,346 @@
+"""Item analysis of exported answer_logs with NumPy.
+
+An export of public.answer_logs (CSV, optionally gzipped, or Parquet) is loaded
+into one NumPy array per column. Each user UUID is replaced by a dense integer
+code. Every statistic is then a grouped sum computed with np.bincount over
+those codes, so the cost is a handful of passes over the arrays no matter how
+many rows there are:
+
+- pValue: share of attempts answered correctly (item difficulty);
+- discrimination: point-biserial correlation between answering the item
+  correctly and the user's rest score (their share correct on all *other*
+  answers), so the item does not correlate with itself;
+- choiceCounts: how often each of the five positions was chosen.
+
+chosen_index is the position the user saw. Where the app shuffles options,
+the histogram counts display positions, not original choices.
+
+Parquet needs pyarrow. CSV is read with pyarrow when it is installed and with
+the csv module otherwise (same result, slower).
+"""
+import csv
+import gzip
+import itertools
+import json
+from datetime import datetime, timezone
+
+import numpy as np
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.csv
+    import pyarrow.parquet
+except ImportError:  # optional: pip install pyarrow
+    pyarrow = None
+
+from .schema import CHOICE_COUNT
+
+LOG_COLUMNS = ('user_id', 'question_id', 'chosen_index', 'is_correct', 'answered_at')
+TRUE_VALUES = ('true', 't', '1', 'True', 'TRUE')
+FALSE_VALUES = ('false', 'f', '0', 'False', 'FALSE')
+REPORT_VERSION = 1
+DEFAULT_CHUNK_ROWS = 1_000_000
+READ_BUFFER = 1 << 20
+
+# Defaults for flag_items(); p-value bounds follow the usual 0.2-0.95 band.
+MIN_ATTEMPTS = 30
+MIN_P_VALUE = 0.2
+MAX_P_VALUE = 0.95
+MIN_DISCRIMINATION = 0.1
+
+
+class AnswerLogs:
+    """Column arrays of an answer_logs export; user holds codes into users.
+
+    ids holds the export's id column, or None when the export has none.
+    """
+
+    def __init__(self, user, question, chosen, correct, answered_at, users, ids=None):
+        self.user = np.asarray(user, dtype=np.int32)
+        self.question = np.asarray(question, dtype=np.int32)
+        self.chosen = np.asarray(chosen, dtype=np.int8)
+        self.correct = np.asarray(correct, dtype=bool)
+        self.answered_at = np.asarray(answered_at, dtype=np.int64)  # µs since epoch, UTC
+        self.users = list(users)
+        self.ids = None if ids is None else np.asarray(ids, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.question)
+
+    def select(self, mask):
+        return AnswerLogs(self.user[mask], self.question[mask], self.chosen[mask], self.correct[mask],
+                          self.answered_at[mask], self.users, None if self.ids is None else self.ids[mask])
+
+
+def parse_timestamp(value):
+    """Postgres/ISO timestamp text to µs since epoch (naive values are taken as UTC)."""
+    if not value:
+        return 0
+    moment = datetime.fromisoformat(value.strip())
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return round(moment.timestamp() * 1_000_000)
+
+
+def parse_bool(value):
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def _open_text(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8-sig', newline='')
+    return open(path, 'r', encoding='utf-8-sig', newline='')
+
+
+def _iter_csv_python(path, chunk_rows):
+    """Yield AnswerLogs of chunk_rows rows (None: one chunk), users coded per chunk."""
+    with _open_text(path) as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        u, q, c, k, t = (header.index(name) for name in LOG_COLUMNS)
+        i = header.index('id') if 'id' in header else None
+        first = True
+        while True:
+            codes = {}
+            user, question, chosen, correct, answered_at, ids = [], [], [], [], [], []
+            for row in itertools.islice(reader, chunk_rows):
+                user.append(codes.setdefault(row[u], len(codes)))
+                question.append(int(row[q]))
+                chosen.append(int(row[c]))
+                correct.append(parse_bool(row[k]))
+                answered_at.append(parse_timestamp(row[t]))
+                if i is not None:
+                    ids.append(int(row[i]))
+            if question or first:
+                yield AnswerLogs(user, question, chosen, correct, answered_at, codes,
+                                 ids if i is not None else None)
+            first = False
+            if chunk_rows is None or len(question) < chunk_rows:
+                return
+
+
+def _column(data, name):
+    column = data.column(name)
+    return column.combine_chunks() if isinstance(column, pyarrow.ChunkedArray) else column
+
+
+def _from_arrow(data):
+    """AnswerLogs from a pyarrow Table or RecordBatch."""
+    users = _column(data, 'user_id').cast(pyarrow.string()).dictionary_encode()
+    stamps = pyarrow.compute.cast(_column(data, 'answered_at'), pyarrow.timestamp('us', tz='UTC'))
+    ids = None
+    if 'id' in data.schema.names:
+        ids = _column(data, 'id')
+        ids = None if ids.null_count == len(ids) and len(ids) else ids.fill_null(0).to_numpy()
+    return AnswerLogs(
+        users.indices.to_numpy(zero_copy_only=False),
+        _column(data, 'question_id').to_numpy(),
+        _column(data, 'chosen_index').to_numpy(),
+        _column(data, 'is_correct').to_numpy(zero_copy_only=False),
+        stamps.cast(pyarrow.int64()).fill_null(0).to_numpy(),
+        users.dictionary.to_pylist(),
+        ids
+    )
+
+
+def _csv_convert_options():
+    return pyarrow.csv.ConvertOptions(
+        include_columns=['id', *LOG_COLUMNS], include_missing_columns=True,
+        column_types={'id': pyarrow.int64(), 'user_id': pyarrow.string(), 'question_id': pyarrow.int32(),
+                      'chosen_index': pyarrow.int8(), 'is_correct': pyarrow.bool_(),
+                      'answered_at': pyarrow.timestamp('us', tz='UTC')},
+        true_values=list(TRUE_VALUES), false_values=list(FALSE_VALUES))
+
+
+def _parquet_columns(schema):
+    return [name for name in ('id', *LOG_COLUMNS) if name in schema.names]
+
+
+def _require_arrow(path):
+    if path.endswith('.parquet') and pyarrow is None:
+        raise RuntimeError("reading Parquet needs pyarrow (pip install pyarrow)")
+
+
+def load_answer_logs(path):
+    """Load an answer_logs export (.csv, .csv.gz or .parquet) into AnswerLogs."""
+    _require_arrow(path)
+    if path.endswith('.parquet'):
+        columns = _parquet_columns(pyarrow.parquet.read_schema(path))
+        return _from_arrow(pyarrow.parquet.read_table(path, columns=columns))
+    if pyarrow is not None:
+        return _from_arrow(pyarrow.csv.read_csv(path, convert_options=_csv_convert_options()))
+    return next(_iter_csv_python(path, None))
+
+
+def _row_groups_since(parquet, since):
+    """Parquet row groups that may hold answered_at >= since (µs), judged by their statistics."""
+    column = parquet.schema_arrow.get_field_index('answered_at')
+    groups = []
+    for group in range(parquet.metadata.num_row_groups):
+        stats = parquet.metadata.row_group(group).column(column).statistics
+        if stats is not None and stats.has_min_max:
+            latest = stats.max
+            if isinstance(latest, datetime):
+                latest = round((latest if latest.tzinfo else latest.replace(tzinfo=timezone.utc))
+                               .timestamp() * 1_000_000)
+            if latest < since:
+                continue
+        groups.append(group)
+    return groups
+
+
+def iter_answer_logs(path, chunk_rows=DEFAULT_CHUNK_ROWS, since=0):
+    """Yield an export as AnswerLogs chunks of about chunk_rows rows, users coded per chunk.
+
+    Only one chunk is held at a time, so exports larger than memory can be read.
+    since (µs) lets Parquet row groups that end before it be skipped unread;
+    rows before it may still be yielded and are for the caller to filter.
+    """
+    _require_arrow(path)
+    if path.endswith('.parquet'):
+        parquet = pyarrow.parquet.ParquetFile(path, pre_buffer=False, buffer_size=READ_BUFFER)
+        groups = _row_groups_since(parquet, since) if since else None
+        if groups == []:
+            return
+        for batch in parquet.iter_batches(batch_size=chunk_rows, row_groups=groups,
+                                          columns=_parquet_columns(parquet.schema_arrow)):
+            yield _from_arrow(batch)
+    elif pyarrow is not None:
+        # pyarrow reads ahead several blocks, so blocks stay small and are regrouped into chunks.
+        read = pyarrow.csv.ReadOptions(block_size=READ_BUFFER)
+        with pyarrow.csv.open_csv(path, read_options=read, convert_options=_csv_convert_options()) as reader:
+            batches, rows = [], 0
+            for batch in reader:
+                batches.append(batch)
+                rows += batch.num_rows
+                if rows >= chunk_rows:
+                    yield _from_arrow(pyarrow.Table.from_batches(batches))
+                    batches, rows = [], 0
+            if batches:
+                yield _from_arrow(pyarrow.Table.from_batches(batches))
+    else:
+        yield from _iter_csv_python(path, chunk_rows)
+
+
+def dense_codes(values):
+    """(codes, uniques) with uniques[codes] == values; a lookup table when ids are small."""
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=values.dtype)
+    low, high = int(values.min()), int(values.max())
+    if low >= 0 and high < max(4 * len(values), 1 << 20):
+        present = np.bincount(values, minlength=high + 1) > 0
+        lookup = np.cumsum(present) - 1
+        return lookup[values], np.flatnonzero(present).astype(values.dtype)
+    uniques, codes = np.unique(values, return_inverse=True)
+    return codes, uniques
+
+
+def item_analysis(logs):
+    """Per-question statistics as a dict of arrays aligned on 'questionId'."""
+    valid = (logs.chosen >= 0) & (logs.chosen < CHOICE_COUNT)
+    if not valid.all():
+        logs = logs.select(valid)
+    q, question_ids = dense_codes(logs.question)
+    items = len(question_ids)
+    x = logs.correct.astype(np.float64)
+
+    attempts = np.bincount(q, minlength=items)
+    corrects = np.bincount(q, weights=x, minlength=items)
+    choices = np.bincount(q * CHOICE_COUNT + logs.chosen, minlength=items * CHOICE_COUNT)
+    choices = choices.reshape(items, CHOICE_COUNT)
+
+    # Rest score: the user's share correct over their other answers. Users with
+    # a single answer have no rest score and are left out of the correlation.
+    user_attempts = np.bincount(logs.user)[logs.user]
+    user_corrects = np.bincount(logs.user, weights=x)[logs.user]
+    w = (user_attempts > 1).astype(np.float64)
+    rest = (user_corrects - x) / np.maximum(user_attempts - 1, 1) * w
+    n = np.bincount(q, weights=w, minlength=items)
+    sx = np.bincount(q, weights=x * w, minlength=items)
+    sy = np.bincount(q, weights=rest, minlength=items)
+    sxy = np.bincount(q, weights=x * rest, minlength=items)
+    syy = np.bincount(q, weights=rest * rest, minlength=items)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p_value = corrects / attempts
+        spread = (n * sx - sx * sx) * (n * syy - sy * sy)
+        discrimination = np.where(spread > 0, (n * sxy - sx * sy) / np.sqrt(spread), np.nan)
+
+    return {
+        'questionId': question_ids,
+        'attempts': attempts,
+        'corrects': corrects.astype(np.int64),
+        'pValue': p_value,
+        'discrimination': discrimination,
+        'choiceCounts': choices
+    }
+
+
+def flag_items(stats, keys, min_attempts=MIN_ATTEMPTS, p_range=(MIN_P_VALUE, MAX_P_VALUE),
+               min_discrimination=MIN_DISCRIMINATION):
+    """List of flag lists, one per item. keys maps question id -> correctIndex."""
+    flags = []
+    for row in range(len(stats['questionId'])):
+        found = []
+        question_id = int(stats['questionId'][row])
+        key = keys.get(question_id)
+        if key is None:
+            found.append('not in bank')
+        if stats['attempts'][row] >= min_attempts:
+            p_value = stats['pValue'][row]
+            discrimination = stats['discrimination'][row]
+            if p_value < p_range[0]:
+                found.append('too hard')
+            elif p_value > p_range[1]:
+                found.append('too easy')
+            if discrimination < 0:
+                found.append('negative discrimination')
+            elif discrimination < min_discrimination:
+                found.append('low discrimination')
+            counts = stats['choiceCounts'][row]
+            if key is not None and 0 <= key < CHOICE_COUNT and np.delete(counts, key).max() > counts[key]:
+                found.append('distractor chosen more than key')
+        flags.append(found)
+    return flags
+
+
+def _number(value, digits=4):
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def item_report(stats, questions, **thresholds):
+    """Join item statistics with a compiled bank (iterable of question dicts)."""
+    bank = {question['id']: question for question in questions}
+    keys = {question_id: question['correctIndex'] for question_id, question in bank.items()}
+    flags = flag_items(stats, keys, **thresholds)
+    items = []
+    for row, question_id in enumerate(stats['questionId'].tolist()):
+        question = bank.get(question_id, {})
+        attempts = int(stats['attempts'][row])
+        items.append({
+            "id": question_id,
+            "domain": question.get('domain'),
+            "correctIndex": question.get('correctIndex'),
+            "attempts": attempts,
+            "pValue": _number(stats['pValue'][row]),
+            "discrimination": _number(stats['discrimination'][row]),
+            "choiceCounts": stats['choiceCounts'][row].tolist(),
+            "flags": flags[row]
+        })
+    return {
+        "version": REPORT_VERSION,
+        "answers": int(stats['attempts'].sum()),
+        "questions": len(items),
+        "flagged": sum(1 for item in items if item['flags']),
+        "items": items
+    }
+
+
+def write_item_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
@@ -0,0 +1,79 @@
+"""Registry of the artifacts a build can emit, and the size report."""
+import os
+
+from .bilingual import BilingualSourceWriter
+from .binary import BinaryBankWriter
+from .compact import CompactWriter
+from .domains import DomainIndexWriter
+from .hotcold import HotColdWriter
+from .ndjson import NdjsonWriter
+from .releases import ReleaseWriter
+from .search import SearchIndexWriter
+from .shards import PracticeSetWriter
+from .writer import QuestionsWriter
+
+ARTIFACTS = {
+    'json': QuestionsWriter,
+    'min': CompactWriter,
+    'sets': PracticeSetWriter,
+    'bin': BinaryBankWriter,
+    'domains': DomainIndexWriter,
+    'search': SearchIndexWriter,
+    'hot': HotColdWriter,
+    'ndjson': NdjsonWriter,
+    'release': ReleaseWriter,
+    'bilingual': BilingualSourceWriter,
+}
+
+DEFAULT_ARTIFACTS = ('json', 'min', 'sets', 'domains', 'search', 'hot', 'ndjson', 'release')
+
+# What the app fetches today; listed in the size report for comparison.
+LEGACY_SUFFIX = '.json.backup'
+
+
+def artifact_path(out_dir, language, name, options=None):
+    """Where an artifact goes: out_dir, or the directory named by its writer's directory_option if set."""
+    writer = ARTIFACTS[name]
+    directory = (options or {}).get(getattr(writer, 'directory_option', None)) or out_dir
+    return os.path.join(directory, f'cdmp_questions_{language}{writer.suffix}')
+
+
+def artifact_name(sink):
+    """Registry name of a sink's artifact (its class name for sinks outside the registry)."""
+    for name, writer in ARTIFACTS.items():
+        if type(sink) is writer:
+            return name
+    return type(sink).__name__
+
+
+def open_sinks(out_dir, language, names, options=None):
+    """Instantiate one writer per requested artifact (not yet entered).
+
+    options carries per-artifact settings such as 'set_sizes'.
+    """
+    options = options or {}
+    return [ARTIFACTS[name].open(artifact_path(out_dir, language, name, options), options) for name in names]
+
+
+def variant_paths(out_dir, language, names):
+    """Every existing file a build of `language` produced, plus the legacy file."""
+    paths = [os.path.join(out_dir, f'cdmp_questions_{language}{LEGACY_SUFFIX}')]
+    for name in names:
+        paths.extend(ARTIFACTS[name].outputs(artifact_path(out_dir, language, name)))
+    return [path for path in paths if os.path.exists(path)]
+
+
+def print_size_report(out_dir, language, names):
+    """Print each variant's size relative to the full JSON artifact."""
+    paths = variant_paths(out_dir, language, names)
+    if not paths:
+        return
+    reference_path = artifact_path(out_dir, language, 'json')
+    reference = os.path.getsize(reference_path) if os.path.exists(reference_path) else None
+    width = max(len(os.path.basename(path)) for path in paths)
+
+    print(f"Size report ({language}):")
+    for path in paths:
+        size = os.path.getsize(path)
+        ratio = f"  {size / reference:6.1%}" if reference else ''
+        print(f"  {os.path.basename(path):<{width}}  {size:>12,} bytes{ratio}")
@@ -0,0 +1,270 @@
+"""Aligned bilingual bundle: the language banks joined by question id.
+
+The CSVs of every language share question numbers. The bundle stores what
+they share once, in cdmp_questions.bilingual.json:
+
+    {"v": 1, "languages": ["en", "ja"], "ids": [...], "a": [correctIndex],
+     "d": [domain code], "domains": {"3": "3 Data Governance", ...},
+     "text": {"en": {"file": "cdmp_questions_en.text.json", "bytes": ..., "sha256": ...}, ...}}
+
+Each language's text goes into arrays parallel to ids, one file per language
+(cdmp_questions_<lang>.text.json, with .gz/.br siblings):
+
+    {"v": 1, "language": "en", "q": [text], "c": [[choices]], "e": [[explanations]]}
+
+Position k of every array belongs to question ids[k]. A language without
+that question has null there. When the build also writes the hot artifact,
+"e" is left out and the language's text entry names its cold index instead
+("cold": "cdmp_questions_en.cold.json"); explanations then come from the
+cold blocks. The app fetches the shared file once and the
+text file of the language on screen, so switching languages only costs the
+missing text file.
+
+The bundle is joined from the build's own question stream: the 'bilingual'
+artifact (BilingualSourceWriter) writes each language's compact records, one
+per line, to cdmp_questions_<lang>.bilingual.ndjson as they are compiled,
+so near-duplicate dropping and the parser choice carry over, and a language
+an incremental build skipped keeps its last records. The report remembers a
+digest of those sources; while it matches, the bundle is left as it is, and
+a text file whose content did not change is never rewritten. The sources
+are build-internal: the 'bilingual_dir' option (sources_directory(), under
+.cache/ for the CLI) keeps them out of the served output directory.
+
+The join also reports where the banks disagree: ids that only some languages
+have, ids repeated within a bank (the first row is kept), and ids whose
+correct answer or domain differs (the first language's is kept).
+"""
+import hashlib
+import json
+import os
+
+from .compact import format_compact, write_compressed
+from .domains import code_of_name
+from .hotcold import HotColdWriter, cold_paths
+from .shards import file_sha256
+from .writer import ListWriter
+
+BUNDLE_VERSION = 1
+SOURCES_DIR = 'bilingual'
+REPORT_VERSION = 1
+BUNDLE_FILENAME = 'cdmp_questions.bilingual.json'
+REPORT_FILENAME = 'cdmp_bilingual_report.json'
+
+
+def text_filename(language):
+    return f'cdmp_questions_{language}.text.json'
+
+
+class BilingualSourceWriter(ListWriter):
+    """One language's compact records, one per line in build order, for the bundle's join."""
+
+    suffix = '.bilingual.ndjson'
+    opening = ''
+    separator = '\n'
+    closing = '\n'
+    empty_closing = ''
+    directory_option = 'bilingual_dir'
+    format = staticmethod(format_compact)
+
+
+def source_path(out_dir, language):
+    return os.path.join(out_dir, f'cdmp_questions_{language}{BilingualSourceWriter.suffix}')
+
+
+def sources_directory(cache_dir, out_dir):
+    """Where the join sources of builds into out_dir go: under cache_dir, one directory per out_dir."""
+    key = hashlib.sha256(os.path.abspath(out_dir).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(cache_dir, SOURCES_DIR, key)
+
+
+def remove_served_sources(out_dir, languages):
+    """Delete join sources that builds without 'bilingual_dir' left in out_dir; returns how many."""
+    removed = 0
+    for language in languages:
+        path = source_path(out_dir, language)
+        if os.path.exists(path):
+            os.remove(path)
+            removed += 1
+    return removed
+
+
+class BankKeys:
+    """Shared fields and text of one language's bank, by id; the first row of a repeated id wins."""
+
+    def __init__(self, language):
+        self.language = language
+        self.order = []
+        self.correct = {}
+        self.domain = {}
+        self.text = {}
+        self.duplicates = []
+
+    def add(self, record):
+        question_id = record['i']
+        if question_id in self.correct:
+            self.duplicates.append(question_id)
+            return
+        self.order.append(question_id)
+        self.correct[question_id] = record['a']
+        self.domain[question_id] = record['d']
+        self.text[question_id] = (record['q'], record['c'], record['e'])
+
+
+def read_source(path, language):
+    """BankKeys of a BilingualSourceWriter file."""
+    keys = BankKeys(language)
+    with open(path, 'r', encoding='utf-8', newline='\n') as f:
+        for line in f:
+            keys.add(json.loads(line))
+    return keys
+
+
+def source_digest(sources, explanations=True):
+    """Digest of the bundle's inputs: each language's source file and whether explanations are inline."""
+    digest = hashlib.sha256(json.dumps([BUNDLE_VERSION, explanations]).encode('utf-8'))
+    for language, path in sources.items():
+        digest.update(f'{language}:{file_sha256(path)}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def join(banks):
+    """(ids, correct indexes, domain names, report) for a list of BankKeys; the first bank leads."""
+    ids = []
+    seen = set()
+    for bank in banks:
+        for question_id in bank.order:
+            if question_id not in seen:
+                seen.add(question_id)
+                ids.append(question_id)
+
+    correct, domain = [], []
+    mismatched = {'correct': [], 'domain': []}
+    for question_id in ids:
+        present = [bank for bank in banks if question_id in bank.correct]
+        correct.append(present[0].correct[question_id])
+        domain.append(present[0].domain[question_id])
+        for field, values in (('correct', [bank.correct for bank in present]),
+                              ('domain', [bank.domain for bank in present])):
+            if len({value[question_id] for value in values}) > 1:
+                entry = {"id": question_id}
+                entry.update((bank.language, value[question_id]) for bank, value in zip(present, values))
+                mismatched[field].append(entry)
+
+    report = {
+        "v": REPORT_VERSION,
+        "languages": [bank.language for bank in banks],
+        "questions": len(ids),
+        "counts": {bank.language: len(bank.order) for bank in banks},
+        "missing": {bank.language: [question_id for question_id in ids if question_id not in bank.correct]
+                    for bank in banks},
+        "duplicates": {bank.language: bank.duplicates for bank in banks},
+        "correctMismatch": mismatched['correct'],
+        "domainMismatch": mismatched['domain']
+    }
+    return ids, correct, domain, report
+
+
+def text_document(bank, ids, explanations=True):
+    """One language's text arrays aligned on ids, serialized.
+
+    explanations=False leaves out "e" (they are in the cold blocks).
+    """
+    texts, choices, explained = [], [], []
+    for question_id in ids:
+        text, choice, explanation = bank.text.get(question_id, (None, None, None))
+        texts.append(text)
+        choices.append(choice)
+        explained.append(explanation)
+    text = {"v": BUNDLE_VERSION, "language": bank.language, "q": texts, "c": choices}
+    if explanations:
+        text["e"] = explained
+    return json.dumps(text, ensure_ascii=False, separators=(',', ':'))
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_bundle(out_dir, sources, explanations=True, previous_dir=None):
+    """Join the languages' sources into the bundle and the disagreement report in out_dir.
+
+    sources maps each language, first one leading, to its
+    BilingualSourceWriter file. explanations=False points the text entries
+    at the hot artifact's cold index instead of carrying the explanations.
+    previous_dir (default out_dir) holds the last bundle: when its report
+    has the same source digest nothing is written and None is returned,
+    and a text file there with unchanged content is not written again.
+    Otherwise returns the report.
+    """
+    previous_dir = previous_dir or out_dir
+    digest = source_digest(sources, explanations)
+    previous = _read_json(os.path.join(previous_dir, REPORT_FILENAME))
+    bundle = _read_json(os.path.join(previous_dir, BUNDLE_FILENAME))
+    if previous and bundle and previous.get('sourceDigest') == digest:
+        return None
+
+    os.makedirs(out_dir, exist_ok=True)
+    banks = [read_source(path, language) for language, path in sources.items()]
+    ids, correct, domain, report = join(banks)
+    report["sourceDigest"] = digest
+
+    written = bundle['text'] if bundle else {}
+    text = {}
+    for bank in banks:
+        language = bank.language
+        data = text_document(bank, ids, explanations).encode('utf-8')
+        text[language] = {"file": text_filename(language), "bytes": len(data),
+                          "sha256": hashlib.sha256(data).hexdigest()}
+        last = written.get(language, {})
+        if last.get('sha256') != text[language]['sha256'] \
+                or not os.path.exists(os.path.join(previous_dir, text_filename(language))):
+            path = os.path.join(out_dir, text_filename(language))
+            with open(path, 'wb') as f:
+                f.write(data)
+            write_compressed(path)
+        if not explanations:
+            _, index_path = cold_paths(os.path.join(out_dir, f'cdmp_questions_{language}{HotColdWriter.suffix}'))
+            text[language]["cold"] = os.path.basename(index_path)
+
+    codes = [code_of_name(name) for name in domain]
+    bundle = {
+        "v": BUNDLE_VERSION,
+        "languages": [bank.language for bank in banks],
+        "ids": ids,
+        "a": correct,
+        "d": codes,
+        "domains": {str(code): name for code, name in sorted(dict(zip(codes, domain)).items())},
+        "text": text
+    }
+    path = os.path.join(out_dir, BUNDLE_FILENAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(bundle, f, ensure_ascii=False, separators=(',', ':'))
+    write_compressed(path)
+    with open(os.path.join(out_dir, REPORT_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    return report
+
+
+def describe(report, limit=10):
+    """Console lines summarizing a join report."""
+    counts = ', '.join(f"{language} {count}" for language, count in report['counts'].items())
+    lines = [f"Bilingual bundle: {report['questions']} questions ({counts})"]
+    for language, ids in report['missing'].items():
+        if ids:
+            lines.append(f"  {len(ids)} ids missing in {language}: {_sample(ids, limit)}")
+    for language, ids in report['duplicates'].items():
+        if ids:
+            lines.append(f"  {len(ids)} ids repeated in {language} (first row kept): {_sample(ids, limit)}")
+    for key, label in (('correctMismatch', 'correct answers'), ('domainMismatch', 'domains')):
+        if report[key]:
+            lines.append(f"  {len(report[key])} {label} differ: {_sample([entry['id'] for entry in report[key]], limit)}")
+    return lines
+
+
+def _sample(ids, limit):
+    shown = ', '.join(map(str, ids[:limit]))
+    return shown + (f", ... ({len(ids) - limit} more)" if len(ids) > limit else '')
@@ -0,0 +1,247 @@
+"""Binary columnar question bank and a memory-mapped reader.
+
+Layout (little-endian), each section starting on an 8-byte boundary:
+
+    header        magic b'CDMPQB01', u32 count, u32 domain_count,
+                  u32 fields per question, u32 reserved
+    text_offsets  u64[count * fields + 1]   spans into the string blob
+    domain_offsets u64[domain_count + 1]    spans into the string blob
+    ids           i32[count]
+    domain_codes  u16[count]                DMBOK code, index into the domain table
+    correct_index u8[count]
+    blob          UTF-8 text, no separators
+
+Question i's text fields are, in order, the question, the choices and then
+the explanations; field f spans blob[text_offsets[i*fields+f] :
+text_offsets[i*fields+f+1]]. Option ids are not stored: the compiler always
+makes them id * 10 + n.
+
+QuestionBank maps the file and decodes strings only when they are read, so
+opening a bank costs a few page faults regardless of its size.
+"""
+import array
+import mmap
+import os
+import shutil
+import struct
+import sys
+
+from .domains import code_of_name
+from .schema import CHOICE_COUNT
+
+MAGIC = b'CDMPQB01'
+HEADER = struct.Struct('<8sIIII')
+FIELDS = 1 + 2 * CHOICE_COUNT
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def _pad(size):
+    return -size % 8
+
+
+def _dump_array(f, values):
+    if not _LITTLE_ENDIAN:
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    values.tofile(f)
+    f.write(b'\0' * _pad(len(values) * values.itemsize))
+
+
+def format_binary_record(question):
+    texts = [question['text']]
+    texts.extend(option['text'] for option in question['options'])
+    texts.extend(question['explanations'])
+    return question['id'], question['correctIndex'], question['domain'], [t.encode('utf-8') for t in texts]
+
+
+class BinaryBankWriter:
+    """Stream questions into the columnar layout.
+
+    Text goes straight to a temporary blob file; only the fixed-width
+    columns (under 100 bytes per question) are kept in memory until close,
+    when the header and columns are written in front of the blob.
+    """
+
+    suffix = '.bin'
+    format = staticmethod(format_binary_record)
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._ids = array.array('i')
+        self._correct = array.array('B')
+        self._domain_codes = array.array('H')
+        self._text_offsets = array.array('Q', [0])
+        self._domains = {}
+        self._blob = None
+
+    @classmethod
+    def open(cls, path, options):
+        return cls(path)
+
+    @classmethod
+    def outputs(cls, path):
+        return [path]
+
+    def __enter__(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._blob = open(self.path + '.blob.tmp', 'w+b')
+        return self
+
+    def write(self, question):
+        self.write_formatted(self.format(question))
+
+    def write_formatted(self, record):
+        question_id, correct_index, domain, texts = record
+        if len(texts) != FIELDS:
+            raise ValueError(f"question {question_id} has {len(texts)} text fields, expected {FIELDS}")
+        self._ids.append(question_id)
+        self._correct.append(correct_index)
+        code = code_of_name(domain)
+        self._domains[code] = domain
+        self._domain_codes.append(code)
+        offset = self._text_offsets[-1]
+        for text in texts:
+            self._blob.write(text)
+            offset += len(text)
+            self._text_offsets.append(offset)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        blob_path = self._blob.name
+        try:
+            if exc_type is None:
+                self._finish()
+        finally:
+            self._blob.close()
+            self._blob = None
+            os.remove(blob_path)
+        return False
+
+    def _finish(self):
+        # The domain table is indexed by code; codes no question uses stay empty.
+        domain_bytes = [self._domains.get(code, '').encode('utf-8')
+                        for code in range(max(self._domains, default=-1) + 1)]
+        text_size = self._text_offsets[-1]
+        # Domain names are appended after the question text in the blob.
+        domain_offsets = array.array('Q', [text_size])
+        for encoded in domain_bytes:
+            domain_offsets.append(domain_offsets[-1] + len(encoded))
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.count, len(domain_bytes), FIELDS, 0))
+            for column in (self._text_offsets, domain_offsets, self._ids, self._domain_codes, self._correct):
+                _dump_array(f, column)
+            self._blob.seek(0)
+            shutil.copyfileobj(self._blob, f, 1024 * 1024)
+            for encoded in domain_bytes:
+                f.write(encoded)
+        os.replace(tmp_path, self.path)
+
+
+class QuestionBank:
+    """Read-only, memory-mapped view of a .bin question bank.
+
+    Columns are exposed as memoryviews (ids, correct_index, domain_codes);
+    strings are decoded on access. question(i) and iteration rebuild the
+    exact dicts the JSON artifact holds.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, domain_count, fields, _ = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a question bank (magic {magic!r})")
+        self.count = count
+        self.fields = fields
+
+        view = memoryview(self._mm)
+        position = HEADER.size
+        columns = []
+        for typecode, length in (('Q', count * fields + 1), ('Q', domain_count + 1),
+                                 ('i', count), ('H', count), ('B', count)):
+            size = length * array.array(typecode).itemsize
+            columns.append(self._column(view[position:position + size], typecode))
+            position += size + _pad(size)
+        self._text_offsets, self._domain_offsets, self.ids, self.domain_codes, self.correct_index = columns
+        self._blob = view[position:]
+        self._domains = None
+        self._positions = None
+
+    @staticmethod
+    def _column(view, typecode):
+        if _LITTLE_ENDIAN:
+            return view.cast(typecode)
+        values = array.array(typecode, bytes(view))
+        values.byteswap()
+        return memoryview(values)
+
+    def close(self):
+        for name in ('ids', 'domain_codes', 'correct_index', '_text_offsets', '_domain_offsets', '_blob'):
+            getattr(self, name).release()
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __len__(self):
+        return self.count
+
+    def _string(self, start, end):
+        return str(self._blob[start:end], 'utf-8')
+
+    def field(self, i, f):
+        k = i * self.fields + f
+        return self._string(self._text_offsets[k], self._text_offsets[k + 1])
+
+    @property
+    def domains(self):
+        if self._domains is None:
+            offsets = self._domain_offsets
+            self._domains = [self._string(offsets[k], offsets[k + 1]) for k in range(len(offsets) - 1)]
+        return self._domains
+
+    def text(self, i):
+        return self.field(i, 0)
+
+    def choices(self, i):
+        return [self.field(i, 1 + n) for n in range(CHOICE_COUNT)]
+
+    def explanations(self, i):
+        return [self.field(i, 1 + CHOICE_COUNT + n) for n in range(CHOICE_COUNT)]
+
+    def domain(self, i):
+        return self.domains[self.domain_codes[i]]
+
+    def position(self, question_id):
+        """Row index of a question id (KeyError if absent)."""
+        if self._positions is None:
+            self._positions = {question_id: i for i, question_id in enumerate(self.ids)}
+        return self._positions[question_id]
+
+    def question(self, i):
+        question_id = self.ids[i]
+        explanations = self.explanations(i)
+        return {
+            "id": question_id,
+            "text": self.text(i),
+            "options": [
+                {"id": question_id * 10 + n + 1, "text": choice, "explanation": explanation}
+                for n, (choice, explanation) in enumerate(zip(self.choices(i), explanations))
+            ],
+            "correctIndex": self.correct_index[i],
+            "explanations": explanations,
+            "domain": self.domain(i)
+        }
+
+    def __iter__(self):
+        return (self.question(i) for i in range(self.count))
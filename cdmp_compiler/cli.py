@@ -0,0 +1,532 @@
+"""Command line entry point: python -m cdmp_compiler <command> ..."""
+import argparse
+import json
+import os
+import sys
+import time
+
+from .artifacts import ARTIFACTS, DEFAULT_ARTIFACTS, artifact_path, print_size_report
+from .bilingual import describe as describe_bundle, remove_served_sources, source_path, sources_directory, write_bundle
+from .binary import QuestionBank
+from .compiler import compile_languages, iter_questions
+from .dedup import DEFAULT_THRESHOLD, DuplicateDetector, signature, write_report
+from .domains import DomainTable, load_domain_index
+from .exams import CDMP_BLUEPRINT, DEFAULT_EXAM_SIZE, ExamAssembler, forms_filename, write_forms
+from .hotcold import DEFAULT_COLD_BLOCK
+from .lint import RULES, lint_banks
+from .metrics import METRICS_FORMATS, PROFILE_MODES, Metrics
+from .parallel import DEFAULT_CHUNK_BYTES, compile_languages_parallel
+from .releases import (DEFAULT_KEEP, describe as describe_releases, patch_lines, read_manifest, read_patch,
+                       read_release, write_release)
+from .shards import DEFAULT_SET_SIZES
+from .schema import LANGUAGES, csv_filename
+from .search import SearchIndex
+from .sync import DEFAULT_PATTERNS, sync_tree
+from .watch import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL, watch
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'public', 'data')
+DOCS_DIR = os.path.join(os.path.dirname(BASE_DIR), 'docs')
+CACHE_DIR = os.path.join(BASE_DIR, '.cache')
+
+
+def artifact_options(args, domains):
+    """The build options of the artifact arguments shared by build and watch."""
+    options = {'set_sizes': args.set_size, 'domains': domains.to_config()}
+    if 'hot' in args.artifacts:
+        options['cold_block'] = args.cold_block
+    if 'release' in args.artifacts:
+        options['keep_releases'] = args.keep_releases
+    if args.drop_duplicates:
+        options['drop_duplicates'] = args.dup_threshold
+    if wants_bundle(args):
+        options['bilingual_dir'] = sources_directory(CACHE_DIR, args.out)  # build-internal, never served
+    return options
+
+
+def wants_bundle(args):
+    return len(args.lang) > 1 and not args.no_bilingual
+
+
+def build_artifacts(args):
+    """The requested artifacts, plus the bundle's per-language source when the bundle is built."""
+    artifacts = list(args.artifacts)
+    if wants_bundle(args) and 'bilingual' not in artifacts:
+        artifacts.append('bilingual')
+    return artifacts
+
+
+def cmd_build(args):
+    print("Starting CSV to JSON conversion...")
+    started = time.perf_counter()
+    domains = DomainTable.load(args.domain_aliases) if args.domain_aliases else DomainTable()
+    options = artifact_options(args, domains)
+    artifacts = build_artifacts(args)
+    incremental = not args.no_cache
+    metrics = Metrics(args.profile) if args.metrics or args.profile else None
+    if args.jobs > 1 and (metrics is not None or args.parser != 'rows'):
+        print("Stage metrics and the columnar parser run in-process; building serially (ignoring --jobs)")
+    if args.jobs > 1 and metrics is None and args.parser == 'rows':
+        counts = compile_languages_parallel(args.src, args.out, args.lang, args.jobs, args.chunk_bytes,
+                                            artifacts, options, incremental, args.force)
+    elif metrics is not None:
+        with metrics:
+            counts = compile_languages(args.src, args.out, args.lang, artifacts, options,
+                                       incremental, args.force, metrics, args.parser)
+    else:
+        counts = compile_languages(args.src, args.out, args.lang, artifacts, options,
+                                   incremental, args.force, parser=args.parser)
+    elapsed = time.perf_counter() - started
+
+    print('---')
+    print("Conversion Summary:")
+    for language, count in counts.items():
+        print(f"{language}: {count} questions")
+
+    for language in args.lang:
+        print_size_report(args.out, language, args.artifacts)
+        manifest_path = artifact_path(args.out, language, 'release')
+        if 'release' in args.artifacts and os.path.exists(manifest_path):
+            for line in describe_releases(manifest_path):
+                print(line)
+    if wants_bundle(args) and all(counts.values()):
+        sources = {language: source_path(options['bilingual_dir'], language) for language in args.lang}
+        report = write_bundle(args.out, sources, explanations='hot' not in args.artifacts)
+        for line in describe_bundle(report) if report else ["Bilingual bundle is up to date"]:
+            print(line)
+    if wants_bundle(args) and remove_served_sources(args.out, args.lang):
+        print(f"Removed join sources left in {args.out}; they are kept in {options['bilingual_dir']}")
+    if metrics is not None:
+        print("Stage metrics:")
+        for line in metrics.summary():
+            print(line)
+        if args.metrics:
+            metrics.write(args.metrics, args.metrics_format)
+            print(f"Metrics written to {args.metrics}")
+        if args.profile == 'cpu':
+            paths = metrics.write_profiles(args.profile_dir)
+            print(f"{len(paths)} stage profiles written to {args.profile_dir} (python3 -m pstats <file>)")
+    print(f"Finished in {elapsed:.3f}s")
+
+    return 0 if all(counts.values()) else 1
+
+
+def cmd_watch(args):
+    domains = DomainTable.load(args.domain_aliases) if args.domain_aliases else DomainTable()
+    if not os.path.isdir(args.src):
+        print(f"Error: {args.src} is not a directory")
+        return 1
+    os.makedirs(args.out, exist_ok=True)
+    watch(args.src, args.out, args.lang, build_artifacts(args), artifact_options(args, domains),
+          args.debounce, args.polling, args.poll_interval, args.log, not args.no_bilingual, not args.no_sync,
+          args.staging)
+    return 0
+
+
+def cmd_search(args):
+    index = SearchIndex.load(artifact_path(args.out, args.lang, 'search'))
+    started = time.perf_counter()
+    ids = index.search(args.query)
+    elapsed = time.perf_counter() - started
+
+    bank_path = artifact_path(args.out, args.lang, 'bin')
+    if os.path.exists(bank_path):
+        with QuestionBank(bank_path) as bank:
+            for question_id in ids[:args.limit]:
+                print(f"{question_id:>6}  {bank.text(bank.position(question_id))}")
+    else:
+        for question_id in ids[:args.limit]:
+            print(f"{question_id:>6}")
+    print(f"{len(ids)} matches in {elapsed * 1000:.3f} ms")
+    return 0
+
+
+def cmd_patch(args):
+    header, lines = read_release(args.release)
+    if args.patch:
+        patch_path = args.patch
+    else:
+        manifest_path = artifact_path(args.out, args.lang, 'release')
+        manifest = read_manifest(manifest_path)
+        if header['version'] == manifest['latest']:
+            print(f"{args.release} is already the latest release ({header['version']})")
+            return 0
+        entries = [entry for entry in manifest['patches'] if entry['from'] == header['version']]
+        if not entries:
+            print(f"No patch from {header['version']} in {manifest_path}; fetch the latest release instead")
+            return 1
+        patch_path = os.path.join(os.path.dirname(manifest_path), entries[0]['path'])
+
+    started = time.perf_counter()
+    patch = read_patch(patch_path)
+    try:
+        lines = patch_lines(lines, patch)
+    except ValueError as e:
+        print(f"{patch_path}: {e}")
+        return 1
+    version = write_release(args.to, lines)
+    elapsed = time.perf_counter() - started
+    print(f"Patched {header['version']} -> {version} (+{len(patch['added'])} ~{len(patch['changed'])} "
+          f"-{len(patch['removed'])}) in {elapsed * 1000:.1f} ms; wrote {args.to}")
+    return 0
+
+
+def cmd_dedup(args):
+    domains = DomainTable.load(args.domain_aliases) if args.domain_aliases else DomainTable()
+    detector = DuplicateDetector(args.dup_threshold)
+    started = time.perf_counter()
+    for language in args.lang:
+        csv_path = os.path.join(args.src, csv_filename(language))
+        for question in iter_questions(csv_path, on_error=lambda row_num, e: None, domains=domains):
+            detector.add((language, question['id']), signature(question))
+    elapsed = time.perf_counter() - started
+
+    report_path = args.report or os.path.join(args.out, 'cdmp_duplicates.json')
+    write_report(detector, report_path)
+    report = detector.report()
+    cross = sum(1 for cluster in report['clusters'] if cluster['crossLanguage'])
+    print(f"{report['questions']} questions, {len(report['clusters'])} duplicate clusters "
+          f"({cross} across languages, {len(report['mirrored'])} mirrored in several languages) "
+          f"in {elapsed:.2f}s")
+    for cluster in report['clusters'][:args.limit]:
+        print('  ' + ', '.join(f"{m['language']}:{m['id']}" for m in cluster['members']))
+    print(f"Report written to {report_path}")
+    return 0
+
+
+def cmd_lint(args):
+    domains = DomainTable.load(args.domain_aliases) if args.domain_aliases else DomainTable()
+    started = time.perf_counter()
+    try:
+        report = lint_banks(args.src, args.lang, args.jobs, args.chunk_bytes, args.disable, domains.to_config())
+    except OSError as e:
+        print(f"Error linting {args.src}: {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+
+    for line in report.summary(args.limit):
+        print(line)
+    rows = ', '.join(f"{language} {count:,}" for language, count in report.rows.items())
+    print(f"{report.errors:,} errors, {report.warnings:,} warnings in {rows} rows in {elapsed:.2f}s")
+    if args.report:
+        report.write(args.report)
+        print(f"Report written to {args.report}")
+    return 1 if report.failed(args.strict) else 0
+
+
+def cmd_sync(args):
+    print(f"Syncing {args.src} -> {args.out}")
+    started = time.perf_counter()
+    results = sync_tree(args.src, args.out, args.pattern, args.jobs, args.verify)
+    elapsed = time.perf_counter() - started
+
+    copied = failed = 0
+    for name, action, detail in results:
+        if action == 'failed':
+            failed += 1
+            print(f"  failed     {name}: {detail}")
+        elif action == 'copied':
+            copied += 1
+            size = os.path.getsize(os.path.join(args.out, name))
+            resumed = f" (resumed at {detail:,})" if detail else ""
+            print(f"  copied     {name}: {size:,} bytes{resumed}")
+        elif args.verbose:
+            print(f"  {action:<10} {name}")
+    print(f"{len(results)} files: {copied} copied, {len(results) - copied - failed} up to date, "
+          f"{failed} failed in {elapsed:.3f}s")
+    return 1 if failed else 0
+
+
+def load_bank(args):
+    """Compiled questions of args.lang: the built JSON when present, else the CSV."""
+    json_path = artifact_path(args.out, args.lang, 'json')
+    if os.path.exists(json_path):
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)['questions']
+    csv_path = os.path.join(args.src, csv_filename(args.lang))
+    return list(iter_questions(csv_path, on_error=lambda row_num, e: None))
+
+
+def cmd_items(args):
+    from .analysis import item_analysis, item_report, load_answer_logs, write_item_report  # needs numpy
+
+    started = time.perf_counter()
+    logs = load_answer_logs(args.export)
+    loaded = time.perf_counter()
+    stats = item_analysis(logs)
+    analysed = time.perf_counter()
+    print(f"{len(logs):,} answers from {len(logs.users):,} users on {len(stats['questionId']):,} questions "
+          f"(load {loaded - started:.2f}s, analysis {analysed - loaded:.2f}s)")
+
+    report = item_report(stats, load_bank(args), min_attempts=args.min_attempts)
+    report_path = args.report or os.path.join(args.out, 'cdmp_item_stats.json')
+    write_item_report(report, report_path)
+    flagged = [item for item in report['items'] if item['flags']]
+    for item in flagged[:args.limit]:
+        print(f"{item['id']:>6}  p={item['pValue']}  r={item['discrimination']}  {', '.join(item['flags'])}")
+    print(f"{len(flagged)} of {report['questions']} questions flagged; report written to {report_path}")
+    return 0
+
+
+def cmd_irt(args):
+    from .analysis import load_answer_logs  # needs numpy
+    from .irt import calibrate, write_item_parameters
+
+    started = time.perf_counter()
+    logs = load_answer_logs(args.export)
+    loaded = time.perf_counter()
+    params = calibrate(logs, args.model, args.max_iterations, args.tolerance)
+    calibrated = time.perf_counter()
+    state = 'converged' if params['converged'] else 'did not converge'
+    print(f"{len(logs):,} answers from {len(params['userId']):,} users on {len(params['questionId']):,} questions; "
+          f"{args.model.upper()} {state} after {params['iterations']} iterations "
+          f"(load {loaded - started:.2f}s, calibration {calibrated - loaded:.2f}s)")
+    print(f"a {params['a'].min():.2f}..{params['a'].max():.2f}, b {params['b'].min():.2f}..{params['b'].max():.2f}")
+
+    path = args.params or os.path.join(args.out, 'cdmp_irt_params.json')
+    write_item_parameters(params, path)
+    print(f"Item parameters written to {path}")
+    return 0
+
+
+def cmd_ingest(args):
+    from .ingest import AnswerAggregates, format_timestamp, write_question_stats  # needs numpy
+
+    aggregates = AnswerAggregates() if args.full else AnswerAggregates.load(args.checkpoint)
+    print(f"Checkpoint: {aggregates.rows:,} answers up to {format_timestamp(aggregates.watermark[0]) or 'the start'}")
+    started = time.perf_counter()
+    for export in args.export:
+        read, counted = aggregates.ingest(export, args.chunk_rows)
+        print(f"{export}: {read:,} rows read, {counted:,} new")
+    elapsed = time.perf_counter() - started
+
+    aggregates.save(args.checkpoint)
+    stats_path = args.stats or os.path.join(args.out, 'cdmp_answer_stats.json')
+    write_question_stats(aggregates, stats_path)
+    print(f"{aggregates.rows:,} answers from {len(aggregates.users):,} users; "
+          f"watermark {format_timestamp(aggregates.watermark[0])}; ingested in {elapsed:.2f}s")
+    print(f"Statistics written to {stats_path}")
+    return 0
+
+
+def cmd_profiles(args):
+    from .analysis import load_answer_logs  # needs numpy
+    from .profiles import build_profiles, write_profiles
+
+    index_path = artifact_path(args.out, args.lang, 'domains')
+    if not os.path.exists(index_path):
+        print(f"{index_path} is missing; run `python3 -m cdmp_compiler build` first")
+        return 1
+    started = time.perf_counter()
+    logs = load_answer_logs(args.export)
+    count = write_profiles(build_profiles(logs, load_domain_index(index_path), queue_size=args.queue_size),
+                          args.profiles)
+    elapsed = time.perf_counter() - started
+    print(f"{count:,} user profiles from {len(logs):,} answers written to {args.profiles} in {elapsed:.2f}s")
+    return 0
+
+
+def cmd_exams(args):
+    blueprint = CDMP_BLUEPRINT
+    if args.blueprint:
+        with open(args.blueprint, 'r', encoding='utf-8') as f:
+            blueprint = {int(code): weight for code, weight in json.load(f).items()}
+    started = time.perf_counter()
+    for language in args.lang:
+        index_path = artifact_path(args.out, language, 'domains')
+        if not os.path.exists(index_path):
+            print(f"{index_path} is missing; run `python3 -m cdmp_compiler build` first")
+            return 1
+        assembler = ExamAssembler(load_domain_index(index_path), blueprint, args.size)
+        path = os.path.join(args.out, forms_filename(language))
+        written = write_forms(assembler, path, args.forms, args.seed)
+        print(f"[{language}] {args.forms:,} forms of {args.size} questions "
+              f"({', '.join(f'{code}:{n}' for code, n in sorted(assembler.counts.items()))}) "
+              f"-> {path} ({written / max(args.forms, 1):,.0f} bytes per form)")
+    print(f"Finished in {time.perf_counter() - started:.3f}s")
+    return 0
+
+
+def add_artifact_arguments(parser):
+    """Arguments that shape the artifacts, shared by build and watch."""
+    parser.add_argument('--artifacts', nargs='+', choices=sorted(ARTIFACTS), default=list(DEFAULT_ARTIFACTS),
+                        help='artifacts to emit: json (app format), min (compact + .gz/.br), '
+                             'sets (one compact shard per practice set + manifest), '
+                             'bin (columnar binary for Python tooling), domains (domain -> ids index), '
+                             'search (full-text inverted index), hot (bank without explanations + '
+                             'explanation blocks behind an offset index), ndjson (header line + one '
+                             'compact record per line, in practice-set order), release (content-hash '
+                             'versioned releases with per-question patches to the latest), bilingual '
+                             '(each language\'s records for the bundle\'s join, kept under .cache/; added '
+                             'automatically when the bundle is built)')
+    parser.add_argument('--set-size', nargs='+', type=int, default=list(DEFAULT_SET_SIZES),
+                        help='practice-set sizes in question ids; the last size repeats')
+    parser.add_argument('--keep-releases', type=int, default=DEFAULT_KEEP,
+                        help='releases kept (with patches to the latest) by the release artifact')
+    parser.add_argument('--cold-block', type=int, default=DEFAULT_COLD_BLOCK,
+                        help='questions per explanation block of the hot artifact')
+    parser.add_argument('--domain-aliases', metavar='JSON',
+                        help='extra domain names/aliases merged over the built-in DMBOK table')
+    parser.add_argument('--drop-duplicates', action='store_true',
+                        help='leave out questions that nearly duplicate an earlier one of the same language')
+    parser.add_argument('--dup-threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='estimated Jaccard similarity at which two questions count as duplicates')
+    parser.add_argument('--no-bilingual', action='store_true',
+                        help='skip the bundle that joins the languages by id (shared fields once, '
+                             'text per language) and its disagreement report')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cdmp_compiler', description=__doc__)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='convert question CSVs to JSON')
+    build.add_argument('--src', default=DATA_DIR, help='directory holding cdmp_questions_<lang>.csv')
+    build.add_argument('--out', default=DATA_DIR, help='directory to write the JSON banks to')
+    build.add_argument('--lang', nargs='+', default=list(LANGUAGES), help='languages to build')
+    add_artifact_arguments(build)
+    build.add_argument('--jobs', '-j', type=int, default=1,
+                       help='worker processes; >1 converts all languages and CSV chunks concurrently')
+    build.add_argument('--chunk-bytes', type=int, default=DEFAULT_CHUNK_BYTES,
+                       help='approximate size of the row chunks handed to each worker')
+    build.add_argument('--force', action='store_true',
+                       help='rebuild every artifact even if the build cache says it is current')
+    build.add_argument('--no-cache', action='store_true',
+                       help='neither read nor write the incremental build cache')
+    build.add_argument('--parser', choices=['rows', 'columnar'], default='rows',
+                       help='columnar: parse and validate the CSV in column batches (needs numpy; '
+                            'pyarrow makes it faster); same output')
+    build.add_argument('--metrics', metavar='PATH',
+                       help='write stage timings and counters here (JSON Lines are appended)')
+    build.add_argument('--metrics-format', choices=list(METRICS_FORMATS), default='jsonl',
+                       help='jsonl, or prometheus for a textfile collector')
+    build.add_argument('--profile', choices=list(PROFILE_MODES),
+                       help='cpu: one cProfile per stage; memory: tracemalloc peak per stage')
+    build.add_argument('--profile-dir', default=os.path.join(CACHE_DIR, 'profiles'),
+                       help='where --profile cpu writes <stage>-<lang>.prof files')
+    build.set_defaults(func=cmd_build)
+
+    dedup = commands.add_parser('dedup', help='report near-duplicate questions within and across languages')
+    dedup.add_argument('--src', default=DATA_DIR, help='directory holding cdmp_questions_<lang>.csv')
+    dedup.add_argument('--out', default=DATA_DIR, help='directory for cdmp_duplicates.json')
+    dedup.add_argument('--report', help='report path (default: <out>/cdmp_duplicates.json)')
+    dedup.add_argument('--lang', nargs='+', default=list(LANGUAGES), help='languages to scan')
+    dedup.add_argument('--dup-threshold', type=float, default=DEFAULT_THRESHOLD)
+    dedup.add_argument('--domain-aliases', metavar='JSON')
+    dedup.add_argument('--limit', type=int, default=20, help='clusters to print')
+    dedup.set_defaults(func=cmd_dedup)
+
+    lint = commands.add_parser('lint', help='check the question CSVs against the rule registry (exit 1 on errors)')
+    lint.add_argument('--src', default=DATA_DIR, help='directory holding cdmp_questions_<lang>.csv')
+    lint.add_argument('--lang', nargs='+', default=list(LANGUAGES), help='languages to check (and compare)')
+    lint.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                      help='worker processes linting CSV chunks of every language concurrently')
+    lint.add_argument('--chunk-bytes', type=int, default=DEFAULT_CHUNK_BYTES)
+    lint.add_argument('--disable', nargs='+', default=[], choices=sorted(RULES), metavar='RULE',
+                      help=f"rules to skip: {', '.join(sorted(RULES))}")
+    lint.add_argument('--strict', action='store_true', help='exit 1 on warnings too')
+    lint.add_argument('--domain-aliases', metavar='JSON')
+    lint.add_argument('--limit', type=int, default=5, help='examples to print per rule')
+    lint.add_argument('--report', metavar='PATH', help='write every finding here as JSON')
+    lint.set_defaults(func=cmd_lint)
+
+    watch_cmd = commands.add_parser('watch', help='rebuild the banks whenever a source CSV is saved')
+    watch_cmd.add_argument('--src', default=DOCS_DIR, help='directory holding cdmp_questions_<lang>.csv to watch')
+    watch_cmd.add_argument('--out', default=DATA_DIR, help='directory the artifacts are swapped into')
+    watch_cmd.add_argument('--lang', nargs='+', default=list(LANGUAGES), help='languages to watch')
+    add_artifact_arguments(watch_cmd)
+    watch_cmd.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                           help='seconds without further saves before a rebuild starts')
+    watch_cmd.add_argument('--polling', action='store_true', help='poll with stat() even where inotify works')
+    watch_cmd.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                           help='seconds between stat() polls')
+    watch_cmd.add_argument('--log', metavar='PATH', default=os.path.join(CACHE_DIR, 'watch.jsonl'),
+                           help='append each rebuild (languages, build time, edit-to-artifact latency) here')
+    watch_cmd.add_argument('--no-sync', action='store_true',
+                           help='do not copy the changed CSVs into --out as well')
+    watch_cmd.add_argument('--staging', default=os.path.join(CACHE_DIR, 'watch'),
+                           help='where rebuilds are staged (must share a filesystem with --out; '
+                                'the parent of --out is used otherwise)')
+    watch_cmd.set_defaults(func=cmd_watch)
+
+    sync = commands.add_parser('sync', help='copy source data files into public/data (checksummed, resumable)')
+    sync.add_argument('--src', default=DOCS_DIR, help='directory tree to copy from')
+    sync.add_argument('--out', default=DATA_DIR, help='directory to copy into')
+    sync.add_argument('--pattern', nargs='+', default=list(DEFAULT_PATTERNS), help='file name patterns to sync')
+    sync.add_argument('--jobs', '-j', type=int, default=4, help='files copied concurrently')
+    sync.add_argument('--verify', action='store_true', help='re-read each copied file and compare hashes')
+    sync.add_argument('--verbose', '-v', action='store_true', help='also list files that were up to date')
+    sync.set_defaults(func=cmd_sync)
+
+    items = commands.add_parser('items', help='item analysis (difficulty, discrimination, choices) of answer_logs')
+    items.add_argument('export', help='answer_logs export: .csv, .csv.gz or .parquet')
+    items.add_argument('--lang', default='en', choices=list(LANGUAGES), help='bank to join the statistics with')
+    items.add_argument('--src', default=DATA_DIR, help='directory holding cdmp_questions_<lang>.csv')
+    items.add_argument('--out', default=DATA_DIR, help='directory holding the built bank and the report')
+    items.add_argument('--report', help='report path (default: <out>/cdmp_item_stats.json)')
+    items.add_argument('--min-attempts', type=int, default=30, help='attempts needed before a question is flagged')
+    items.add_argument('--limit', type=int, default=20, help='flagged questions to print')
+    items.set_defaults(func=cmd_items)
+
+    irt = commands.add_parser('irt', help='calibrate 1PL/2PL IRT item parameters from answer_logs')
+    irt.add_argument('export', help='answer_logs export: .csv, .csv.gz or .parquet')
+    irt.add_argument('--model', default='2pl', choices=['1pl', '2pl'])
+    irt.add_argument('--out', default=DATA_DIR, help='directory for cdmp_irt_params.json')
+    irt.add_argument('--params', help='parameter file path (default: <out>/cdmp_irt_params.json)')
+    irt.add_argument('--max-iterations', type=int, default=100)
+    irt.add_argument('--tolerance', type=float, default=1e-3, help='largest parameter change that counts as converged')
+    irt.set_defaults(func=cmd_irt)
+
+    ingest = commands.add_parser('ingest', help='fold new answer_logs rows into running per-question/user totals')
+    ingest.add_argument('export', nargs='+', help='answer_logs exports: .csv, .csv.gz or .parquet')
+    ingest.add_argument('--checkpoint', default=os.path.join(CACHE_DIR, 'answer_stats.npz'),
+                        help='running totals and watermark (holds user ids; keep out of public/)')
+    ingest.add_argument('--out', default=DATA_DIR, help='directory for cdmp_answer_stats.json')
+    ingest.add_argument('--stats', help='statistics path (default: <out>/cdmp_answer_stats.json)')
+    ingest.add_argument('--chunk-rows', type=int, default=1_000_000, help='rows read and folded in at a time')
+    ingest.add_argument('--full', action='store_true', help='ignore the checkpoint and count the exports from scratch')
+    ingest.set_defaults(func=cmd_ingest)
+
+    profiles = commands.add_parser('profiles', help='materialize per-user weakness profiles and review queues')
+    profiles.add_argument('export', help='answer_logs export: .csv, .csv.gz or .parquet')
+    profiles.add_argument('--profiles', default=os.path.join(CACHE_DIR, 'user_profiles.jsonl'),
+                          help='JSON Lines output, one {"user_id", "profile"} per line (holds user ids)')
+    profiles.add_argument('--lang', default='en', choices=list(LANGUAGES), help='bank whose domain index to use')
+    profiles.add_argument('--out', default=DATA_DIR, help='directory holding the built domain index')
+    profiles.add_argument('--queue-size', type=int, default=50, help='review-queue entries kept per user')
+    profiles.set_defaults(func=cmd_profiles)
+
+    exams = commands.add_parser('exams', help='pre-generate blueprint-weighted mock exam forms')
+    exams.add_argument('--lang', nargs='+', default=list(LANGUAGES), help='banks to draw from')
+    exams.add_argument('--out', default=DATA_DIR, help='directory holding the built domain index')
+    exams.add_argument('--forms', type=int, default=1000, help='number of forms to generate')
+    exams.add_argument('--size', type=int, default=DEFAULT_EXAM_SIZE, help='questions per form')
+    exams.add_argument('--seed', type=int, default=0, help='seed of the first form; form n uses seed + n')
+    exams.add_argument('--blueprint', metavar='JSON', help='{"<domain code>": weight} replacing the CDMP weights')
+    exams.set_defaults(func=cmd_exams)
+
+    patch = commands.add_parser('patch', help='bring a held release up to date with a verified patch')
+    patch.add_argument('release', help='release file held (releases/cdmp_questions_<lang>/<version>.ndjson.gz)')
+    patch.add_argument('--to', required=True, metavar='PATH', help='where to write the patched release')
+    patch.add_argument('--patch', help='patch file to apply (default: the one the release manifest lists)')
+    patch.add_argument('--lang', default='en', choices=list(LANGUAGES))
+    patch.add_argument('--out', default=DATA_DIR, help='directory holding the built release manifest')
+    patch.set_defaults(func=cmd_patch)
+
+    search = commands.add_parser('search', help='query the full-text index of a built bank')
+    search.add_argument('query')
+    search.add_argument('--lang', default='en', choices=list(LANGUAGES))
+    search.add_argument('--out', default=DATA_DIR, help='directory holding the built artifacts')
+    search.add_argument('--limit', type=int, default=20, help='matches to print')
+    search.set_defaults(func=cmd_search)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""Columnar CSV backend: parse, validate and strip whole column batches at once.
+
+The row path (reader.iter_rows + transform.row_to_question) builds a dict per
+row and strips and checks twelve cells one at a time. This backend reads the
+CSV in batches of columns instead:
+
+- with pyarrow, the CSV is parsed in C++ into string columns, 1 MiB block
+  at a time. Cells are stripped with utf8_trim using exactly the characters
+  str.strip() removes, and plain digit strings are cast to integers in bulk;
+- without it, or once pyarrow meets a row it cannot take (a short or long
+  row, which csv.DictReader pads or truncates), csv.reader rows are
+  transposed into columns from that row on.
+
+The validation rules of transform.validate_row then run as NumPy masks over
+the batch, in the same order, so every row fails on the same rule. Rows that
+pass go through transform.build_question, and dropped rows are reported with
+the same exceptions. The questions, and therefore every artifact, are
+identical to the row path's.
+"""
+import csv
+import itertools
+import sys
+
+import numpy as np
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.csv
+except ImportError:  # optional: pip install pyarrow
+    pyarrow = None
+
+from .domains import DEFAULT_DOMAINS
+from .schema import CHOICE_COUNT, normalize_header
+from .transform import CHOICE_COLUMNS, EXPLANATION_COLUMNS, RowFields, SkipRow, build_question
+
+DEFAULT_BATCH_ROWS = 65536
+READ_BLOCK = 1 << 20
+TEXT_COLUMNS = ['question'] + CHOICE_COLUMNS + EXPLANATION_COLUMNS
+REQUIRED_COLUMNS = ('number', 'question', 'correct')
+COLUMN_SET = frozenset(['number', 'correct', 'domain'] + TEXT_COLUMNS)
+# Exactly the characters str.strip() removes (str.isspace()).
+WHITESPACE = ''.join(c for c in map(chr, range(sys.maxunicode + 1)) if c.isspace())
+PLAIN_INTEGER = r'^[0-9]{1,18}$'
+
+# Validation rules in validate_row's order; the first one a row fails is the one reported.
+RULES = (
+    ('missing_required', 'Missing required fields'),
+    ('correct_out_of_range', None),
+    ('missing_choices', 'Missing choices'),
+    ('missing_explanations', 'Missing explanations'),
+)
+
+
+class ColumnBatch:
+    """Stripped text columns (lists), parsed integers and per-row parse results of one batch.
+
+    ids and corrects are int64 arrays for the masks. Cells int() rejects are
+    in errors, and values too large for int64 are in exact (the array holds a
+    stand-in that fails the same rules).
+    """
+
+    def __init__(self, first_row, integers, texts, domains):
+        self.first_row = first_row
+        self.ids, self.id_errors, self.exact_ids = integers[0]
+        self.corrects, self.correct_errors, self.exact_corrects = integers[1]
+        self.texts = texts              # {column: [stripped str]}
+        self.domains = domains          # raw domain cells, or None when the CSV has no domain column
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def _parse_int_cells(count, plain, cells, stand_in):
+    """(int64 values, {offset: ValueError}, {offset: int beyond int64}) for one column.
+
+    plain marks cells already known to be short digit strings; cells() returns
+    the raw cells, which int() parses for every other row.
+    """
+    values = np.zeros(count, dtype=np.int64)
+    errors, exact = {}, {}
+    others = np.flatnonzero(~plain).tolist()
+    raw = cells() if others else None
+    for offset in others:
+        try:
+            value = int(raw[offset])
+        except ValueError as e:
+            errors[offset] = e
+            continue
+        if -2 ** 63 <= value < 2 ** 63:
+            values[offset] = value
+        else:
+            exact[offset] = value
+            values[offset] = stand_in
+    return values, errors, exact
+
+
+def _arrow_batch(batch, first_row):
+    columns = dict(zip(batch.schema.names, batch.columns))
+    integers = []
+    for name, stand_in in (('number', 1), ('correct', CHOICE_COUNT + 1)):
+        trimmed = pyarrow.compute.utf8_trim(columns[name], characters=WHITESPACE)
+        plain = pyarrow.compute.match_substring_regex(trimmed, PLAIN_INTEGER).to_numpy(zero_copy_only=False)
+        values, errors, exact = _parse_int_cells(batch.num_rows, plain, columns[name].to_pylist, stand_in)
+        if plain.any():
+            digits = pyarrow.compute.if_else(plain, trimmed, '0')
+            values[plain] = pyarrow.compute.cast(digits, pyarrow.int64()).to_numpy()[plain]
+        integers.append((values, errors, exact))
+    texts = {name: pyarrow.compute.utf8_trim(columns[name], characters=WHITESPACE).to_pylist()
+             if name in columns else [''] * batch.num_rows for name in TEXT_COLUMNS}
+    domains = columns['domain'].to_pylist() if 'domain' in columns else None
+    return ColumnBatch(first_row, integers, texts, domains)
+
+
+def _python_batch(rows, positions, first_row):
+    def cells(name):
+        i = positions.get(name)
+        if i is None:
+            return [''] * len(rows)
+        return [row[i] if i < len(row) else '' for row in rows]
+
+    no_plain = np.zeros(len(rows), dtype=bool)
+    integers = [_parse_int_cells(len(rows), no_plain, lambda name=name: cells(name), stand_in)
+                for name, stand_in in (('number', 1), ('correct', CHOICE_COUNT + 1))]
+    texts = {name: [cell.strip() for cell in cells(name)] for name in TEXT_COLUMNS}
+    domains = cells('domain') if 'domain' in positions else None
+    return ColumnBatch(first_row, integers, texts, domains)
+
+
+def _python_batches(csv_path, positions, skip_rows, first_row, batch_rows):
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as csvfile:
+        rows = (row for row in csv.reader(csvfile) if row)  # DictReader skips blank lines too
+        next(rows, None)
+        rows = itertools.islice(rows, skip_rows, None)
+        while True:
+            chunk = list(itertools.islice(rows, batch_rows))
+            if not chunk:
+                return
+            yield _python_batch(chunk, positions, first_row)
+            first_row += len(chunk)
+
+
+def _arrow_reader(csv_path, header):
+    return pyarrow.csv.open_csv(
+        csv_path,
+        read_options=pyarrow.csv.ReadOptions(block_size=READ_BLOCK),
+        parse_options=pyarrow.csv.ParseOptions(newlines_in_values=True),
+        convert_options=pyarrow.csv.ConvertOptions(
+            column_types={name: pyarrow.string() for name in header},
+            include_columns=[name for name in header if normalize_header([name])[0] in COLUMN_SET],
+            strings_can_be_null=False, quoted_strings_can_be_null=False))
+
+
+def read_header(csv_path):
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as csvfile:
+        return next(csv.reader(csvfile), None)
+
+
+def iter_column_batches(csv_path, batch_rows=DEFAULT_BATCH_ROWS, use_arrow=True):
+    """Yield ColumnBatch objects covering every non-blank data row, in order."""
+    header = read_header(csv_path)
+    if header is None:
+        return
+    names = normalize_header(header)
+    positions = {}
+    for i, name in enumerate(names):
+        positions[name] = i  # a repeated name keeps its last column, as DictReader does
+    row = 1
+    if use_arrow and pyarrow is not None and len(set(header)) == len(header):
+        try:
+            reader = _arrow_reader(csv_path, header)
+            for batch in reader:
+                batch = batch.rename_columns(normalize_header(batch.schema.names))
+                for start in range(0, batch.num_rows, batch_rows):
+                    part = _arrow_batch(batch.slice(start, batch_rows), row)
+                    yield part
+                    row += len(part)
+            return
+        except (pyarrow.ArrowInvalid, UnicodeDecodeError):
+            pass  # continue with csv.reader from the first row not yet yielded
+    yield from _python_batches(csv_path, positions, row - 1, row, batch_rows)
+
+
+def failed_rules(batch):
+    """Array of the index of the first rule in RULES each row fails (-1: valid, -2: parse error)."""
+    lengths = {name: np.fromiter(map(len, batch.texts[name]), dtype=np.int64, count=len(batch))
+               for name in TEXT_COLUMNS}
+    masks = [
+        (lengths['question'] == 0) | (batch.ids == 0) | (batch.corrects == 0),
+        (batch.corrects < 1) | (batch.corrects > CHOICE_COUNT),
+        np.logical_or.reduce([lengths[name] == 0 for name in CHOICE_COLUMNS]),
+        np.logical_or.reduce([lengths[name] == 0 for name in EXPLANATION_COLUMNS]),
+    ]
+    failed = np.select(masks, range(len(masks)), default=-1)
+    unparsed = list(batch.id_errors) + list(batch.correct_errors)
+    failed[unparsed] = -2
+    return failed
+
+
+def _row_error(batch, offset, rule):
+    if rule == -2:
+        return batch.id_errors.get(offset) or batch.correct_errors[offset]
+    reason, message = RULES[rule]
+    if message is None:
+        message = f'Invalid correct index {batch.exact_corrects.get(offset, int(batch.corrects[offset]))}'
+    return SkipRow(message, reason)
+
+
+def iter_columnar_questions(csv_path, on_error, domains=DEFAULT_DOMAINS, metrics=None,
+                            batch_rows=DEFAULT_BATCH_ROWS):
+    """Yield the questions transform_rows(iter_rows(csv_path)) would, column batch by batch."""
+    batches = iter_column_batches(csv_path, batch_rows)
+    if metrics is not None:
+        batches = metrics.timed('parse', batches)
+    for batch in batches:
+        if metrics is not None:
+            metrics.count('rows_read', len(batch))
+            with metrics.stage('validate'):
+                failed = failed_rules(batch)
+            metrics.handled('validate', len(batch))
+        else:
+            failed = failed_rules(batch)
+        ids = batch.ids.tolist()
+        for offset, value in batch.exact_ids.items():
+            ids[offset] = value
+        rows = zip(failed.tolist(), ids, batch.corrects.tolist(), batch.texts['question'],
+                   zip(*(batch.texts[name] for name in CHOICE_COLUMNS)),
+                   zip(*(batch.texts[name] for name in EXPLANATION_COLUMNS)),
+                   batch.domains if batch.domains is not None else itertools.repeat(None))
+        for offset, (rule, question_id, correct, text, choices, explanations, domain) in enumerate(rows):
+            if rule != -1:
+                error = _row_error(batch, offset, rule)
+                if metrics is not None:
+                    metrics.count('rows_skipped', reason=_reason(error))
+                on_error(batch.first_row + offset, error)
+                continue
+            fields = RowFields(question_id, correct, text, list(choices), list(explanations), domain)
+            if metrics is not None:
+                with metrics.stage('transform'):
+                    question = build_question(fields, domains)
+                metrics.handled('transform')
+            else:
+                question = build_question(fields, domains)
+            yield question
+
+
+def _reason(error):
+    return error.reason if isinstance(error, SkipRow) else 'unparseable_number'
+
+
+def can_read(csv_path):
+    """False when the header lacks a column validate_row reads with row[...] (use the row path)."""
+    header = read_header(csv_path)
+    return header is not None and all(name in normalize_header(header) for name in REQUIRED_COLUMNS)
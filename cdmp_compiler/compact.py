@@ -0,0 +1,124 @@
+"""Minified question-bank artifact with gzip and brotli siblings.
+
+The compact form drops what the app can rebuild: option ids are always
+id * 10 + n, and each explanation is stored once instead of both in
+options[n].explanation and explanations[n]. Keys are shortened:
+
+    {"v": 1, "q": [{"i": id, "q": text, "c": [choices], "e": [explanations],
+                    "a": correctIndex, "d": domain}, ...]}
+"""
+import gzip
+import json
+import os
+import shutil
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+from .writer import ListWriter
+
+COMPACT_VERSION = 1
+COPY_BUFFER = 1024 * 1024
+
+_warned_brotli = False
+
+
+def to_compact(question):
+    return {
+        "i": question["id"],
+        "q": question["text"],
+        "c": [option["text"] for option in question["options"]],
+        "e": question["explanations"],
+        "a": question["correctIndex"],
+        "d": question["domain"]
+    }
+
+
+def from_compact(record):
+    """Expand a compact record back into the app's question dict."""
+    question_id = record["i"]
+    return {
+        "id": question_id,
+        "text": record["q"],
+        "options": [
+            {"id": question_id * 10 + i + 1, "text": choice, "explanation": explanation}
+            for i, (choice, explanation) in enumerate(zip(record["c"], record["e"]))
+        ],
+        "correctIndex": record["a"],
+        "explanations": list(record["e"]),
+        "domain": record["d"]
+    }
+
+
+def format_compact(question):
+    return json.dumps(to_compact(question), ensure_ascii=False, separators=(',', ':'))
+
+
+def write_gzip(path):
+    """Write path + '.gz'; mtime is pinned so identical input gives identical bytes."""
+    with open(path, 'rb') as src, open(path + '.gz', 'wb') as raw:
+        with gzip.GzipFile(filename='', mode='wb', fileobj=raw, compresslevel=9, mtime=0) as dst:
+            shutil.copyfileobj(src, dst, COPY_BUFFER)
+    return path + '.gz'
+
+
+def write_brotli(path):
+    """Write path + '.br', or return None when the brotli module is missing."""
+    if brotli is None:
+        return None
+    compressor = brotli.Compressor(quality=11, mode=brotli.MODE_TEXT)
+    with open(path, 'rb') as src, open(path + '.br', 'wb') as dst:
+        for block in iter(lambda: src.read(COPY_BUFFER), b''):
+            dst.write(compressor.process(block))
+        dst.write(compressor.finish())
+    return path + '.br'
+
+
+def write_compressed(path):
+    """Write the precompressed siblings of path; returns the paths written."""
+    global _warned_brotli
+    written = [write_gzip(path)]
+    br_path = write_brotli(path)
+    if br_path is None:
+        if os.path.exists(path + '.br'):
+            os.remove(path + '.br')  # never leave a .br that no longer matches
+        if not _warned_brotli:
+            print("brotli module not installed; skipping .br artifacts")
+            _warned_brotli = True
+    else:
+        written.append(br_path)
+    return written
+
+
+def read_compact(path):
+    """Load a compact artifact (plain, .gz or .br) as a list of full questions."""
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    elif path.endswith('.br'):
+        with open(path, 'rb') as f:
+            data = json.loads(brotli.decompress(f.read()).decode('utf-8'))
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    return [from_compact(record) for record in data["q"]]
+
+
+class CompactWriter(ListWriter):
+    suffix = '.min.json'
+    opening = f'{{"v":{COMPACT_VERSION},"q":['
+    closing = ']}'
+    empty_closing = ']}'
+    format = staticmethod(format_compact)
+
+    @classmethod
+    def outputs(cls, path):
+        return [path, path + '.gz', path + '.br']
+
+    def __exit__(self, exc_type, exc, tb):
+        super().__exit__(exc_type, exc, tb)
+        if exc_type is None:
+            write_compressed(self.path)
+        return False
@@ -0,0 +1,223 @@
+"""CSV to JSON compilation for the question banks."""
+import contextlib
+import os
+
+from .artifacts import DEFAULT_ARTIFACTS, artifact_name, open_sinks
+from .dedup import DuplicateDetector, DuplicateFilter
+from .domains import DEFAULT_DOMAINS, DomainTable
+from .incremental import BuildCache
+from .reader import iter_rows
+from .schema import LANGUAGES, csv_filename
+from .transform import SkipRow, build_question, row_to_question, validate_row
+from .writer import QuestionsWriter
+
+
+def describe_error(row_num, error):
+    """Human readable line for a row that was dropped."""
+    if isinstance(error, SkipRow):
+        return f"Skipping row {row_num}: {error}"
+    return f"Error parsing row {row_num}: {error}"
+
+
+def print_error(row_num, error):
+    print(describe_error(row_num, error))
+
+
+def skip_reason(error):
+    """Counter label for a dropped row: the failed rule, or why its fields did not parse."""
+    if isinstance(error, SkipRow):
+        return error.reason
+    if isinstance(error, KeyError):
+        return 'missing_column'
+    return 'unparseable_number'
+
+
+def transform_rows(rows, on_error=print_error, domains=DEFAULT_DOMAINS, metrics=None):
+    """Yield questions for (row_num, row) pairs; dropped rows go to on_error(row_num, error)."""
+    if metrics is not None:
+        yield from _measured_transform_rows(rows, on_error, domains, metrics)
+        return
+    for row_num, row in rows:
+        try:
+            yield row_to_question(row, domains)
+        except (SkipRow, ValueError, KeyError) as e:
+            on_error(row_num, e)
+
+
+def _measured_transform_rows(rows, on_error, domains, metrics):
+    validate, transform = metrics.stage('validate'), metrics.stage('transform')
+    for row_num, row in metrics.timed('parse', rows):
+        metrics.count('rows_read')
+        try:
+            with validate:
+                fields = validate_row(row)
+            metrics.handled('validate')
+            with transform:
+                question = build_question(fields, domains)
+            metrics.handled('transform')
+        except (SkipRow, ValueError, KeyError) as e:
+            metrics.count('rows_skipped', reason=skip_reason(e))
+            on_error(row_num, e)
+            continue
+        yield question
+
+
+def iter_questions(csv_path, on_error=print_error, domains=DEFAULT_DOMAINS, metrics=None, parser='rows'):
+    """Yield validated questions from a CSV, reporting rows that are dropped.
+
+    parser='columnar' reads the CSV in column batches (columnar.py, needs
+    numpy); the questions are the same.
+    """
+    if parser == 'columnar':
+        from .columnar import can_read, iter_columnar_questions  # needs numpy
+
+        if can_read(csv_path):
+            return iter_columnar_questions(csv_path, on_error, domains, metrics)
+    return transform_rows(iter_rows(csv_path), on_error, domains, metrics)
+
+
+def write_questions(questions, sinks, metrics=None):
+    """Feed every question to every sink; returns the number of questions."""
+    if metrics is not None:
+        sinks = [MeasuredSink(sink, metrics) for sink in sinks]
+    count = 0
+    with contextlib.ExitStack() as stack:
+        for sink in sinks:
+            stack.enter_context(sink)
+        for question in questions:
+            for sink in sinks:
+                sink.write(question)
+            count += 1
+    if metrics is not None:
+        metrics.count('questions_written', count)
+    return count
+
+
+class MeasuredSink:
+    """Wraps a sink so its writes and its finishing step count as its serialize stage."""
+
+    def __init__(self, sink, metrics):
+        self.sink = sink
+        self.path = sink.path
+        self.metrics = metrics
+        self.stage = metrics.stage(f'serialize:{artifact_name(sink)}')
+
+    def __enter__(self):
+        with self.stage:
+            self.sink.__enter__()
+        return self
+
+    def write(self, question):
+        with self.stage:
+            self.sink.write(question)
+        self.metrics.handled(self.stage.name)
+
+    def __exit__(self, exc_type, exc, tb):
+        with self.stage:
+            return self.sink.__exit__(exc_type, exc, tb)
+
+
+def report_written(count, sinks):
+    print(f"Successfully parsed {count} questions")
+    for sink in sinks:
+        print(f"Wrote {sink.path} ({os.path.getsize(sink.path):,} bytes)")
+
+
+def compile_csv(csv_path, sinks, domains=DEFAULT_DOMAINS, duplicates=None, metrics=None, parser='rows'):
+    """Stream one CSV into the given sinks; returns the question count (0 on failure).
+
+    duplicates, a dedup.DuplicateFilter, drops near-duplicates before they
+    reach any sink. metrics, a metrics.Metrics, receives stage timings and
+    counters. parser picks the CSV backend (see iter_questions).
+    """
+    print(f"Converting {csv_path}...")
+
+    try:
+        print(f"CSV file size: {os.path.getsize(csv_path):,} bytes")
+        questions = iter_questions(csv_path, domains=domains, metrics=metrics, parser=parser)
+        if duplicates is not None:
+            questions = duplicates.filter(questions)
+            if metrics is not None:
+                questions = metrics.timed('dedup', questions)
+        count = write_questions(questions, sinks, metrics)
+        if metrics is not None and duplicates is not None:
+            metrics.count('duplicates_dropped', duplicates.dropped)
+        report_written(count, sinks)
+        return count
+
+    except Exception as e:
+        print(f"Error converting {csv_path}: {e}")
+        return 0
+
+
+def convert_csv_to_json(csv_path, json_path):
+    """Convert a question CSV to the app's JSON format, streaming row by row."""
+    return compile_csv(csv_path, [QuestionsWriter(json_path)])
+
+
+def make_detector(options):
+    """DuplicateDetector when the build drops near-duplicates (options['drop_duplicates'] = threshold)."""
+    threshold = options.get('drop_duplicates')
+    return DuplicateDetector(threshold) if threshold else None
+
+
+def rewrite_stale_sets(csv_path, out_dir, language, artifacts, options, sink_options, cache, duplicates,
+                       parser='rows'):
+    """Rebuild a language again when its near-duplicate drops moved into sets the plan skipped.
+
+    Returns the question count and the DuplicateFilter of the build that
+    stands (the given ones when nothing was stale).
+    """
+    stale = cache.stale_sets(sink_options, duplicates.pairs if duplicates is not None else [])
+    if not stale:
+        return None, duplicates
+    print(f"Near-duplicates changed in practice sets {', '.join(str(n) for n in sorted(stale))}; rewriting them")
+    sink_options = dict(sink_options, only_sets=sorted(set(sink_options['only_sets']) | stale))
+    duplicates = DuplicateFilter(make_detector(options), language)
+    domains = DomainTable.from_config(options.get('domains'))
+    count = compile_csv(csv_path, open_sinks(out_dir, language, artifacts, sink_options), domains, duplicates,
+                        parser=parser)
+    return count, duplicates
+
+
+def compile_languages(src_dir, out_dir, languages=LANGUAGES, artifacts=DEFAULT_ARTIFACTS, options=None,
+                      incremental=False, force=False, metrics=None, parser='rows'):
+    """Build the requested artifacts for each language; return counts by language.
+
+    With incremental=True, languages whose CSV rows are unchanged since the
+    last build are skipped and only affected practice-set shards are
+    rewritten (see incremental.py); force=True rebuilds everything but still
+    refreshes the cache.
+    """
+    options = options or {}
+    domains = DomainTable.from_config(options.get('domains'))
+    detector = make_detector(options)
+    counts = {}
+    for i, language in enumerate(languages):
+        if i:
+            print('---')
+        csv_path = os.path.join(src_dir, csv_filename(language))
+        sink_options = options
+        cache = None
+        if incremental:
+            cache = BuildCache(csv_path, out_dir, language, artifacts, options)
+            sink_options = cache.plan(force)
+            if sink_options is None:
+                print(f"{csv_path} is up to date")
+                counts[language] = cache.count
+                continue
+            print(f"{csv_path}: {cache.describe(sink_options)}")
+
+        duplicates = DuplicateFilter(detector, language) if detector is not None else None
+        if metrics is not None:
+            metrics.labels = {'language': language}
+        counts[language] = compile_csv(csv_path, open_sinks(out_dir, language, artifacts, sink_options),
+                                       domains, duplicates, metrics, parser)
+        if cache is not None and counts[language]:
+            count, duplicates = rewrite_stale_sets(csv_path, out_dir, language, artifacts, options, sink_options,
+                                                   cache, duplicates, parser)
+            if count is not None:
+                counts[language] = count
+            if counts[language]:
+                cache.save(counts[language], duplicates.pairs if duplicates is not None else None)
+    return counts
@@ -0,0 +1,208 @@
+"""Near-duplicate question detection with MinHash signatures and LSH banding.
+
+A question is reduced to shingles: consecutive token pairs (see
+search.tokenize) of its text and of each choice. Choices contribute as a set,
+so reordered options do not hide a duplicate. Explanations are ignored. Each
+shingle set becomes a 64-value MinHash signature whose agreement rate
+estimates Jaccard similarity. The 64 hash functions run as one NumPy
+computation over the question's shingle hashes (dedup needs numpy).
+
+Signatures are cut into 16 bands of 4 values; questions sharing any band
+bucket are candidates and are confirmed when their estimated similarity
+reaches the threshold. Each question is compared only with its bucket mates,
+so a whole bank is processed in near-linear time. Because questions are
+added one at a time, the same detector serves as a streaming filter that
+drops later copies during a build.
+"""
+import array
+import json
+import random
+import zlib
+
+from .search import tokenize
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.8
+MAX_BUCKET_COMPARE = 32
+REPORT_VERSION = 1
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_PERM)]
+_coefficients = None
+
+
+def shingles(question):
+    result = set()
+    texts = [question['text']] + sorted(option['text'] for option in question['options'])
+    for text in texts:
+        tokens = list(tokenize(text))
+        if len(tokens) < 2:
+            result.update(tokens)
+        result.update(f'{a} {b}' for a, b in zip(tokens, tokens[1:]))
+    return result
+
+
+def _mod_prime(np, values):
+    """values mod 2**61 - 1 for uint64 values (one folding step suffices below 2**64)."""
+    values = (values & _PRIME) + (values >> 61)
+    return np.where(values >= _PRIME, values - _PRIME, values)
+
+
+def _permutation_columns(np):
+    """(a >> 32, a & 0xFFFFFFFF, b) of every permutation as uint64 columns."""
+    global _coefficients
+    if _coefficients is None:
+        a = np.array([a for a, _ in _PERMUTATIONS], dtype=np.uint64)[:, None]
+        b = np.array([b for _, b in _PERMUTATIONS], dtype=np.uint64)[:, None]
+        _coefficients = a >> 32, a & 0xFFFFFFFF, b
+    return _coefficients
+
+
+def signature(question):
+    """MinHash signature (array of 64 unsigned 32-bit values)."""
+    import numpy as np  # needs numpy
+
+    # crc32 rather than hash(): signatures must agree across worker processes.
+    hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles(question)] or [0]
+    x = np.array(hashes, dtype=np.uint64)[None, :]
+    a_high, a_low, b = _permutation_columns(np)
+    # (a * x + b) mod 2**61 - 1 without overflowing 64 bits: a = a_high * 2**32 + a_low
+    # with a_high < 2**29, and 2**61 = 1 (mod 2**61 - 1) folds the high product back down.
+    high = a_high * x
+    high = (high >> 29) + ((high & ((1 << 29) - 1)) << 32)
+    values = _mod_prime(np, _mod_prime(np, a_low * x) + high + b)
+    return array.array('I', (values.min(axis=1) & 0xFFFFFFFF).astype(np.uint32).tobytes())
+
+
+def similarity(first, second):
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_PERM
+
+
+class DuplicateDetector:
+    """Incremental LSH index over keys of the form (language, question id).
+
+    Keys may repeat (a bank can reuse an id); every add() is its own entry.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._keys = []
+        self._signatures = []
+        self._parent = []
+        self._buckets = [{} for _ in range(BANDS)]
+        self.pairs = []
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _find(self, node):
+        parent = self._parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def add(self, key, sig):
+        """Index key; return [(earlier key, similarity)] at or above the threshold."""
+        node = len(self._keys)
+        candidates = set()
+        for band, buckets in enumerate(self._buckets):
+            members = buckets.setdefault(sig[band * ROWS:(band + 1) * ROWS].tobytes(), [])
+            candidates.update(members[:MAX_BUCKET_COMPARE])
+            members.append(node)
+
+        self._keys.append(key)
+        self._signatures.append(sig)
+        self._parent.append(node)
+        matches = []
+        for other in sorted(candidates):
+            score = similarity(sig, self._signatures[other])
+            if score >= self.threshold:
+                matches.append((self._keys[other], score))
+                self.pairs.append((other, node, score))
+                self._parent[self._find(node)] = self._find(other)
+        return sorted(matches, key=lambda match: -match[1])
+
+    def clusters(self):
+        """Node groups of two or more linked by confirmed pairs, in insertion order."""
+        groups = {}
+        for node in range(len(self._keys)):
+            groups.setdefault(self._find(node), []).append(node)
+        return [members for members in groups.values() if len(members) > 1]
+
+    def report(self):
+        """Machine-readable summary of every cluster, within and across languages."""
+        def member(node):
+            language, question_id = self._keys[node]
+            return {"language": language, "id": question_id}
+
+        root_pairs = {}
+        for a, b, score in self.pairs:
+            root_pairs.setdefault(self._find(a), []).append(
+                {"a": member(a), "b": member(b), "similarity": round(score, 3)})
+
+        clusters = []
+        # ids forming a cluster within a language -> languages where that holds
+        mirrored = {}
+        for members in self.clusters():
+            by_language = {}
+            for node in members:
+                language, question_id = self._keys[node]
+                by_language.setdefault(language, []).append(question_id)
+            for language, ids in by_language.items():
+                if len(ids) > 1:
+                    mirrored.setdefault(tuple(sorted(ids)), set()).add(language)
+            clusters.append({
+                "members": [member(node) for node in members],
+                "languages": sorted(by_language),
+                "crossLanguage": len(by_language) > 1,
+                "pairs": root_pairs.get(self._find(members[0]), [])
+            })
+
+        return {
+            "version": REPORT_VERSION,
+            "threshold": self.threshold,
+            "numPerm": NUM_PERM,
+            "bands": BANDS,
+            "questions": len(self._keys),
+            "clusters": clusters,
+            "mirrored": [{"ids": list(ids), "languages": sorted(languages)}
+                         for ids, languages in sorted(mirrored.items()) if len(languages) > 1]
+        }
+
+
+class DuplicateFilter:
+    """Build-time filter: drop a question that nearly duplicates an earlier one of its language.
+
+    pairs lists [dropped id, kept id] for every drop, for incremental builds.
+    """
+
+    def __init__(self, detector, language):
+        self.detector = detector
+        self.language = language
+        self.dropped = 0
+        self.pairs = []
+
+    def keep(self, question_id, sig):
+        matches = [(key, score) for key, score in self.detector.add((self.language, question_id), sig)
+                   if key[0] == self.language]
+        if not matches:
+            return True
+        (_, original), score = matches[0]
+        print(f"Dropping question {question_id}: near-duplicate of question {original} (similarity {score:.2f})")
+        self.dropped += 1
+        self.pairs.append([question_id, original])
+        return False
+
+    def filter(self, questions):
+        for question in questions:
+            if self.keep(question['id'], signature(question)):
+                yield question
+
+
+def write_report(detector, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(detector.report(), f, ensure_ascii=False, indent=2)
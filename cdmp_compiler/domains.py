@@ -0,0 +1,181 @@
+"""Canonical DMBOK knowledge areas and the alias table that maps source spellings onto them.
+
+Every canonical name starts with its numeric code ("10 Reference and Master
+Data"); code 0 is "Unknown" and catches blanks and pandas' "nan". A raw
+domain is resolved by, in order: an exact alias (case and whitespace
+insensitive), an exact canonical name, then its leading number. The table can
+be replaced or extended with a JSON file of the same shape as to_config():
+
+    {"names": {"12": "12 Metadata Management", ...},
+     "aliases": {"12 Metadata": 12, ...}}
+"""
+import json
+import os
+import re
+
+UNKNOWN_CODE = 0
+
+DMBOK_DOMAINS = {
+    0: 'Unknown',
+    1: '1 Data Management',
+    2: '2 Data Handling Ethics',
+    3: '3 Data Governance',
+    4: '4 Data Architecture',
+    5: '5 Data Modelling and Design',
+    6: '6 Data Storage and Operations',
+    7: '7 Data Security',
+    8: '8 Data Integration & Interoperability',
+    9: '9 Document and Content Management',
+    10: '10 Reference and Master Data',
+    11: '11 Data Warehousing and Business Intelligence',
+    12: '12 Metadata Management',
+    13: '13 Data Quality',
+    14: '14 Big Data and Data Science',
+}
+
+DEFAULT_ALIASES = {
+    '': UNKNOWN_CODE,
+    'nan': UNKNOWN_CODE,
+    '5 Data Modelling': 5,
+    '5 Data Modeling and Design': 5,
+    '8 Data Integration and Interoperability': 8,
+    '9 Document & Content Management': 9,
+    '10 Reference & Master Data': 10,
+    '11 Data Warehousing and Busines': 11,
+    '12 Metadata': 12,
+}
+
+_LEADING_CODE = re.compile(r'\s*(\d+)\b')
+
+
+def _key(raw):
+    return ' '.join(raw.split()).casefold()
+
+
+def code_of_name(name):
+    """Code of a canonical name, read back from its leading number."""
+    match = _LEADING_CODE.match(name)
+    return int(match.group(1)) if match else UNKNOWN_CODE
+
+
+class DomainTable:
+    """Resolve raw domain strings to (code, canonical name)."""
+
+    def __init__(self, names=None, aliases=None):
+        self.names = {int(code): name for code, name in (names or DMBOK_DOMAINS).items()}
+        self.names.setdefault(UNKNOWN_CODE, DMBOK_DOMAINS[UNKNOWN_CODE])
+        for code, name in self.names.items():
+            if code != UNKNOWN_CODE and code_of_name(name) != code:
+                raise ValueError(f"domain name {name!r} must start with its code {code}")
+        aliases = DEFAULT_ALIASES if aliases is None else aliases
+        self._lookup = {_key(name): code for code, name in self.names.items()}
+        self._lookup.update((_key(alias), int(code)) for alias, code in aliases.items())
+        self.aliases = dict(aliases)
+        self._canonical = {}  # raw -> canonical name; a bank repeats a handful of spellings
+
+    @classmethod
+    def from_config(cls, config):
+        if not config:
+            return cls()
+        return cls(config.get('names'), config.get('aliases'))
+
+    @classmethod
+    def load(cls, path):
+        """Default table extended (and overridden) by a JSON alias file."""
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        names = dict(DMBOK_DOMAINS)
+        names.update((int(code), name) for code, name in config.get('names', {}).items())
+        aliases = dict(DEFAULT_ALIASES)
+        aliases.update(config.get('aliases', {}))
+        return cls(names, aliases)
+
+    def to_config(self):
+        return {
+            "names": {str(code): name for code, name in sorted(self.names.items())},
+            "aliases": dict(sorted(self.aliases.items()))
+        }
+
+    def code(self, raw):
+        key = _key(raw or '')
+        code = self._lookup.get(key)
+        if code is None:
+            code = code_of_name(key)
+            if code not in self.names:
+                code = UNKNOWN_CODE
+        return code
+
+    def canonical(self, raw):
+        name = self._canonical.get(raw)
+        if name is None:
+            name = self._canonical[raw] = self.names[self.code(raw)]
+        return name
+
+
+DEFAULT_DOMAINS = DomainTable()
+
+
+def format_index_record(question):
+    return question['id'], question['domain']
+
+
+class DomainIndexWriter:
+    """Precomputed domain -> question-id index, cdmp_questions_<lang>.domains.json.
+
+    {"version": 1, "domains": [{"code": 10, "name": "10 Reference and Master
+    Data", "count": 51, "ids": [...]}, ...]}, ordered by code, ids in bank
+    order. Filtering by knowledge area becomes a lookup instead of a scan.
+    """
+
+    suffix = '.domains.json'
+    format = staticmethod(format_index_record)
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._ids = {}
+        self._names = {}
+
+    @classmethod
+    def open(cls, path, options):
+        return cls(path)
+
+    @classmethod
+    def outputs(cls, path):
+        return [path]
+
+    def __enter__(self):
+        return self
+
+    def write(self, question):
+        self.write_formatted(self.format(question))
+
+    def write_formatted(self, record):
+        question_id, name = record
+        code = code_of_name(name)
+        self._names[code] = name
+        self._ids.setdefault(code, []).append(question_id)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            return False
+        index = {
+            "version": 1,
+            "domains": [
+                {"code": code, "name": self._names[code], "count": len(self._ids[code]), "ids": self._ids[code]}
+                for code in sorted(self._ids)
+            ]
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+        return False
+
+
+def load_domain_index(path):
+    """{code: {"name", "count", "ids"}} from a .domains.json artifact."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return {entry['code']: entry for entry in json.load(f)['domains']}
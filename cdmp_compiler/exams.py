@@ -0,0 +1,170 @@
+"""Blueprint-weighted mock exam forms drawn from the domain index.
+
+The CDMP Fundamentals exam weights the DMBOK knowledge areas unevenly. For
+example, Data Governance is 11% of the questions and Data Handling Ethics 2%.
+An exam of `size` questions is apportioned over the areas by the largest
+remainder method. An area with too few questions gives its shortfall to the
+others in proportion to their weights.
+
+Each form is then drawn without replacement. Robert Floyd's algorithm takes
+c ids from an area's pool with c random draws, and the form is shuffled
+once, so a form costs O(size) however large the bank is. Each question also
+gets a random option order, stored as its rank among the 120 permutations of
+five options (a Lehmer code, see decode_permutation).
+
+A form is reproducible from (bank, blueprint, seed). Many forms are
+pre-generated, one small file each, so a client fetches only the form it
+uses. For cdmp_exams_en.json (the manifest) they go into exams/cdmp_exams_en/
+next to it:
+
+    {"v": 2, "size": 100, "blueprint": {"3": 11, ...},
+     "count": 1000, "firstSeed": 0, "dir": "exams/cdmp_exams_en"}
+
+    exams/cdmp_exams_en/<seed>.json: {"seed": 0, "q": [ids], "p": [permutation codes]}
+"""
+import json
+import math
+import os
+import random
+
+from .domains import UNKNOWN_CODE
+from .schema import CHOICE_COUNT
+
+FORMS_VERSION = 2
+FORMS_DIR = 'exams'
+DEFAULT_EXAM_SIZE = 100
+PERMUTATIONS = math.factorial(CHOICE_COUNT)
+
+# Percent of the CDMP Fundamentals exam per DMBOK knowledge area code.
+CDMP_BLUEPRINT = {
+    1: 2,    # Data Management Process
+    2: 2,    # Data Handling Ethics
+    3: 11,   # Data Governance
+    4: 6,    # Data Architecture
+    5: 11,   # Data Modelling and Design
+    6: 6,    # Data Storage and Operations
+    7: 6,    # Data Security
+    8: 6,    # Data Integration & Interoperability
+    9: 6,    # Document and Content Management
+    10: 10,  # Reference and Master Data
+    11: 10,  # Data Warehousing and Business Intelligence
+    12: 11,  # Metadata Management
+    13: 11,  # Data Quality
+    14: 2,   # Big Data and Data Science
+}
+
+
+def forms_filename(language):
+    return f'cdmp_exams_{language}.json'
+
+
+def forms_directory(path):
+    """Directory holding the form files of the manifest at path."""
+    base = os.path.basename(path)[:-len('.json')]
+    return os.path.join(os.path.dirname(path), FORMS_DIR, base)
+
+
+def allocate(weights, size, available):
+    """{code: count} summing to size, proportional to weights and capped by available."""
+    counts = {code: 0 for code in weights}
+    open_codes = {code for code, weight in weights.items() if weight > 0 and available.get(code, 0) > 0}
+    remaining = size
+    while remaining and open_codes:
+        total = sum(weights[code] for code in open_codes)
+        shares = {code: remaining * weights[code] / total for code in open_codes}
+        grant = {code: int(share) for code, share in shares.items()}
+        leftover = remaining - sum(grant.values())
+        for code in sorted(open_codes, key=lambda c: (grant[c] - shares[c], -weights[c], c))[:leftover]:
+            grant[code] += 1
+        for code in sorted(open_codes):
+            take = min(grant[code], available[code] - counts[code])
+            counts[code] += take
+            remaining -= take
+            if counts[code] == available[code]:
+                open_codes.discard(code)
+    if remaining:
+        raise ValueError(f"the bank has only {size - remaining} questions in the blueprint's domains")
+    return {code: count for code, count in counts.items() if count}
+
+
+def floyd_sample(rng, n, k):
+    """k distinct indices from range(n) in O(k) (Floyd's algorithm); order is not random."""
+    chosen = []
+    seen = set()
+    for j in range(n - k, n):
+        t = rng.randrange(j + 1)
+        pick = j if t in seen else t
+        seen.add(pick)
+        chosen.append(pick)
+    return chosen
+
+
+def decode_permutation(code, size=CHOICE_COUNT):
+    """Lehmer code -> order, where order[i] is the original option shown at position i."""
+    remaining = list(range(size))
+    order = []
+    for position in range(size - 1, -1, -1):
+        digit, code = divmod(code, math.factorial(position))
+        order.append(remaining.pop(digit))
+    return order
+
+
+def domain_pools(domain_index):
+    """{code: [ids]} from load_domain_index() output; an id repeated in the bank is kept once."""
+    seen = set()
+    pools = {}
+    for code in sorted(domain_index):
+        pool = [i for i in domain_index[code]['ids'] if not (i in seen or seen.add(i))]
+        if pool and code != UNKNOWN_CODE:
+            pools[code] = pool
+    return pools
+
+
+class ExamAssembler:
+    """Draws duplicate-free, blueprint-weighted exam forms from one bank's domain index."""
+
+    def __init__(self, domain_index, blueprint=CDMP_BLUEPRINT, size=DEFAULT_EXAM_SIZE):
+        self.pools = domain_pools(domain_index)
+        self.size = size
+        self.counts = allocate(blueprint, size, {code: len(pool) for code, pool in self.pools.items()})
+
+    def form(self, seed):
+        """(question ids, option permutation codes) of form `seed`."""
+        rng = random.Random(seed)
+        ids = []
+        for code in sorted(self.counts):
+            pool = self.pools[code]
+            ids.extend(pool[i] for i in floyd_sample(rng, len(pool), self.counts[code]))
+        rng.shuffle(ids)
+        return ids, [rng.randrange(PERMUTATIONS) for _ in ids]
+
+    def forms(self, count, first_seed=0):
+        for seed in range(first_seed, first_seed + count):
+            ids, permutations = self.form(seed)
+            yield {"seed": seed, "q": ids, "p": permutations}
+
+
+def write_forms(assembler, path, count, first_seed=0):
+    """Write `count` forms and their manifest at path; returns the bytes of the form files."""
+    directory = forms_directory(path)
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith('.json'):
+            os.remove(os.path.join(directory, name))  # forms of an earlier, possibly larger, run
+    written = 0
+    for form in assembler.forms(count, first_seed):
+        form_path = os.path.join(directory, f"{form['seed']}.json")
+        with open(form_path, 'w', encoding='utf-8') as f:
+            json.dump(form, f, separators=(',', ':'))
+        written += os.path.getsize(form_path)
+    manifest = {
+        "v": FORMS_VERSION,
+        "size": assembler.size,
+        "blueprint": {str(code): n for code, n in sorted(assembler.counts.items())},
+        "count": count,
+        "firstSeed": first_seed,
+        "dir": os.path.relpath(directory, os.path.dirname(path) or '.').replace(os.sep, '/')
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    return written
@@ -0,0 +1,138 @@
+"""Hot/cold split of a bank: what a question needs on screen, and its explanations apart.
+
+Explanations are most of a bank's bytes but are only read once a question is
+answered. For cdmp_questions_en.hot.json three files are written:
+
+- the hot file (with .gz/.br siblings), the compact records without "e":
+
+    {"v": 1, "cold": "cdmp_questions_en.cold.json",
+     "q": [{"i": id, "q": text, "c": [choices], "a": correctIndex, "d": domain}, ...]}
+
+- cdmp_questions_en.cold.ndjson, the explanations in blocks of consecutive
+  questions, one JSON document per line:
+
+    {"i": [ids], "e": [[explanations], ...]}
+
+- cdmp_questions_en.cold.json, the offset index of those blocks:
+
+    {"v": 1, "file": "cdmp_questions_en.cold.ndjson", "blockSize": 20, "count": ...,
+     "bytes": ..., "sha256": ..., "blocks": [{"offset": o, "length": n, "ids": [ids]}, ...]}
+
+A client maps a question id to its block through the index and fetches
+bytes offset..offset+length-1 with a Range request. The blocks are not
+compressed: a byte range of a compressed file could not be decoded on its own.
+"""
+import json
+import os
+
+from .compact import COMPACT_VERSION, to_compact, write_compressed
+from .shards import file_sha256
+from .writer import ListWriter
+
+DEFAULT_COLD_BLOCK = 20
+COLD_INDEX_VERSION = 1
+
+
+def cold_paths(hot_path):
+    """(cold blocks, cold index) written next to a hot file."""
+    base = hot_path[:-len(HotColdWriter.suffix)]
+    return base + '.cold.ndjson', base + '.cold.json'
+
+
+def format_hot_record(question):
+    """(hot record text, id, explanations text) of one question."""
+    record = to_compact(question)
+    explanations = record.pop('e')
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':')), record['i'],
+            json.dumps(explanations, ensure_ascii=False, separators=(',', ':')))
+
+
+def read_cold_block(index_path, question_id):
+    """{id: explanations} of the block holding question_id (empty when it has none)."""
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    for block in index['blocks']:
+        if question_id in block['ids']:
+            with open(os.path.join(os.path.dirname(index_path), index['file']), 'rb') as f:
+                f.seek(block['offset'])
+                data = json.loads(f.read(block['length']).decode('utf-8'))
+            explanations = {}
+            for block_id, value in zip(data['i'], data['e']):
+                explanations.setdefault(block_id, value)  # a repeated id keeps its first row
+            return explanations
+    return {}
+
+
+class HotColdWriter(ListWriter):
+    """Stream the hot records, and the explanations block by block."""
+
+    suffix = '.hot.json'
+    closing = ']}'
+    empty_closing = ']}'
+    format = staticmethod(format_hot_record)
+
+    def __init__(self, path, block_size=DEFAULT_COLD_BLOCK):
+        super().__init__(path)
+        if block_size < 1:
+            raise ValueError(f"cold block size must be positive: {block_size!r}")
+        self.block_size = block_size
+        self.cold_path, self.index_path = cold_paths(path)
+        self.opening = (f'{{"v":{COMPACT_VERSION},"cold":{json.dumps(os.path.basename(self.index_path))},'
+                        f'"q":[')
+        self._cold = None
+        self._block = []
+        self._blocks = []
+        self._offset = 0
+
+    @classmethod
+    def open(cls, path, options):
+        return cls(path, options.get('cold_block', DEFAULT_COLD_BLOCK))
+
+    @classmethod
+    def outputs(cls, path):
+        return [path, path + '.gz', path + '.br'] + list(cold_paths(path))
+
+    def __enter__(self):
+        super().__enter__()
+        self._cold = open(self.cold_path, 'wb')
+        return self
+
+    def write_formatted(self, record):
+        hot, question_id, explanations = record
+        super().write_formatted(hot)
+        self._block.append((question_id, explanations))
+        if len(self._block) == self.block_size:
+            self._flush_block()
+
+    def _flush_block(self):
+        ids = [question_id for question_id, _ in self._block]
+        line = (f'{{"i":{json.dumps(ids)},"e":['
+                + ','.join(explanations for _, explanations in self._block) + ']}').encode('utf-8')
+        self._cold.write(line + b'\n')
+        self._blocks.append({"offset": self._offset, "length": len(line), "ids": ids})
+        self._offset += len(line) + 1
+        self._block = []
+
+    def __exit__(self, exc_type, exc, tb):
+        super().__exit__(exc_type, exc, tb)
+        if self._block and exc_type is None:
+            self._flush_block()
+        self._cold.close()
+        self._cold = None
+        if exc_type is None:
+            write_compressed(self.path)
+            self._write_index()
+        return False
+
+    def _write_index(self):
+        index = {
+            "v": COLD_INDEX_VERSION,
+            "file": os.path.basename(self.cold_path),
+            "blockSize": self.block_size,
+            "count": self.count,
+            "bytes": self._offset,
+            "sha256": file_sha256(self.cold_path),
+            "blocks": self._blocks
+        }
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
@@ -0,0 +1,176 @@
+"""Incremental builds keyed on content hashes of the source rows.
+
+Each language keeps a sidecar next to its outputs,
+.cdmp_questions_<lang>.buildcache.json, holding
+
+- the CSV's size and mtime, so an untouched file is skipped after one stat;
+- a fingerprint of the artifacts and options the outputs were built with;
+- a hash of every raw CSV row, keyed by question number;
+- a digest of the question numbers in CSV order;
+- with --drop-duplicates, each dropped question and the question it
+  duplicated, as [dropped id, kept id].
+
+When the CSV has been touched its rows are hashed and compared with the
+cache. Nothing is written if no row changed. Otherwise the whole-bank
+artifacts of that language are rewritten, but only the practice-set shards
+holding a changed, added or removed question are, so the others keep their
+bytes, hashes and CDN cache entries. Rows that only moved change no row
+hash but do change the order digest; the bank and the sets keep CSV order,
+so that is a full rebuild.
+
+A dropped near-duplicate can sit in another set than the question it
+duplicates, so an edit can drop or restore a question whose own row did not
+change. The sets of both ends of every pair touching a changed row are
+rewritten: pairs of the last build are known up front, and a build that
+finds a new pair reaching an untouched set reports it through stale_sets()
+so the caller can rewrite that set too.
+"""
+import hashlib
+import json
+import os
+
+from .artifacts import artifact_path
+from .reader import iter_rows
+from .schema import COLUMNS
+from .shards import DEFAULT_SET_SIZES, SetLayout
+
+CACHE_VERSION = 3
+
+
+def row_hash(row):
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update('\x1f'.join(row.get(column) or '' for column in COLUMNS).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def cache_path(out_dir, language):
+    return os.path.join(out_dir, f'.cdmp_questions_{language}.buildcache.json')
+
+
+def build_fingerprint(artifacts, options):
+    """Identify the outputs' shape; any change forces a full rebuild."""
+    key = json.dumps([CACHE_VERSION, sorted(artifacts), options], sort_keys=True)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+
+def hash_rows(csv_path):
+    """({number: row hash}, digest of the numbers in row order).
+
+    Repeated numbers accumulate so any copy changing is seen.
+    """
+    hashes = {}
+    order = hashlib.blake2b(digest_size=8)
+    for _, row in iter_rows(csv_path):
+        number = (row.get('number') or '').strip()
+        hashes[number] = hashes.get(number, '') + row_hash(row)
+        order.update(number.encode('utf-8') + b'\x1f')
+    return hashes, order.hexdigest()
+
+
+class BuildCache:
+    """Decides what a build of one language has to rewrite, and remembers it."""
+
+    def __init__(self, csv_path, out_dir, language, artifacts, options):
+        self.csv_path = csv_path
+        self.out_dir = out_dir
+        self.language = language
+        self.artifacts = list(artifacts)
+        self.options = dict(options)
+        self.path = cache_path(out_dir, language)
+        self.fingerprint = build_fingerprint(self.artifacts, self.options)
+        self.previous = self._load()
+        self.stamp = None
+        self.rows = None
+        self.order = None
+        self.changed = None
+        self.reordered = False
+        self.layout = SetLayout(self.options.get('set_sizes', DEFAULT_SET_SIZES))
+        self._changed_ids = None
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if data.get('version') == CACHE_VERSION else None
+
+    @property
+    def count(self):
+        return self.previous['count'] if self.previous else 0
+
+    def _outputs_exist(self):
+        return all(os.path.exists(artifact_path(self.out_dir, self.language, name, self.options))
+                   for name in self.artifacts)
+
+    def plan(self, force=False):
+        """Return the sink options for this build, or None if outputs are current."""
+        try:
+            st = os.stat(self.csv_path)
+        except OSError:
+            return dict(self.options)  # let the compiler report the missing file
+        self.stamp = [st.st_size, st.st_mtime_ns]
+
+        previous = self.previous
+        reusable = (not force and previous is not None
+                    and previous['fingerprint'] == self.fingerprint and self._outputs_exist())
+        if reusable and previous['source'] == self.stamp:
+            return None
+
+        self.rows, self.order = hash_rows(self.csv_path)
+        if not reusable:
+            return dict(self.options)
+        if previous['order'] != self.order:
+            self.reordered = True  # rows moved: every order-dependent output has to follow
+            return dict(self.options)
+
+        old_rows = previous['rows']
+        self.changed = {number for number, digest in self.rows.items() if old_rows.get(number) != digest}
+        self.changed.update(old_rows.keys() - self.rows.keys())
+        if not self.changed:
+            self.save(previous['count'], previous['duplicates'])  # touched but identical: refresh the stamp only
+            return None
+
+        try:
+            self._changed_ids = {int(number) for number in self.changed}
+        except ValueError:
+            return dict(self.options)  # an unparsable number could belong anywhere
+        only_sets = {self.layout.set_for_id(question_id) for question_id in self._changed_ids}
+        only_sets.update(self.duplicate_sets(previous.get('duplicates', [])))
+        return dict(self.options, only_sets=sorted(only_sets))
+
+    def duplicate_sets(self, pairs):
+        """Sets holding either question of a [dropped, kept] pair that touches a changed row."""
+        sets = set()
+        for pair in pairs:
+            if self._changed_ids.intersection(pair):
+                sets.update(self.layout.set_for_id(question_id) for question_id in pair)
+        return sets
+
+    def stale_sets(self, sink_options, pairs):
+        """Sets a finished build's near-duplicate pairs reach but its only_sets left alone."""
+        if 'only_sets' not in sink_options:
+            return set()
+        return self.duplicate_sets(pairs) - set(sink_options['only_sets'])
+
+    def describe(self, sink_options):
+        if self.reordered:
+            return "rows reordered; full rebuild"
+        if self.changed is None:
+            return "full rebuild"
+        sets = ', '.join(str(n) for n in sink_options.get('only_sets', []))
+        return f"{len(self.changed)} changed rows; practice sets to rewrite: {sets}"
+
+    def save(self, count, duplicates=None):
+        data = {
+            "version": CACHE_VERSION,
+            "fingerprint": self.fingerprint,
+            "source": self.stamp,
+            "count": count,
+            "rows": self.rows,
+            "order": self.order,
+            "duplicates": duplicates or []
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        self.previous = data
@@ -0,0 +1,202 @@
+"""Incremental answer_logs aggregates with a watermark checkpoint.
+
+An export is read in fixed-size chunks (analysis.iter_answer_logs). Each chunk
+is folded into running totals and then dropped:
+
+- per question: attempts, corrects, last answered_at, and counts per chosen
+  position;
+- per user: attempts, corrects, last answered_at.
+
+Memory therefore grows with the number of users and questions, not with the
+length of the history.
+
+The totals are saved with a watermark: the largest (answered_at, id) folded
+in so far. The next run reads the new export and skips every row at or below
+the watermark, so a daily refresh only pays for the day's rows. answered_at
+defaults to now() on insert, so new rows land above the watermark. Parquet
+row groups that end before the watermark are not even read. When the
+export has no id column, answered_at alone decides.
+
+Checkpoints are .npz files written atomically. They contain user ids, so keep
+them out of public/.
+"""
+import json
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .analysis import DEFAULT_CHUNK_ROWS, iter_answer_logs
+from .schema import CHOICE_COUNT
+
+CHECKPOINT_VERSION = 1
+
+
+def _grow(array, size):
+    if len(array) >= size:
+        return array
+    grown = np.zeros((max(size, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def format_timestamp(micros):
+    if not micros:
+        return None
+    return datetime.fromtimestamp(micros / 1_000_000, timezone.utc).isoformat()
+
+
+class AnswerAggregates:
+    """Running per-question and per-user totals of answer_logs."""
+
+    def __init__(self):
+        self.rows = 0
+        self.watermark = (0, 0)  # rows at or below this (answered_at, id) are already counted
+        self.high_water = (0, 0)
+        self.question_attempts = np.zeros(0, dtype=np.int64)  # indexed by question_id
+        self.question_corrects = np.zeros(0, dtype=np.int64)
+        self.question_last = np.zeros(0, dtype=np.int64)
+        self.question_choices = np.zeros((0, CHOICE_COUNT), dtype=np.int64)
+        self.users = []
+        self._user_codes = {}
+        self.user_attempts = np.zeros(0, dtype=np.int64)
+        self.user_corrects = np.zeros(0, dtype=np.int64)
+        self.user_last = np.zeros(0, dtype=np.int64)
+
+    def _user_code(self, user_id):
+        code = self._user_codes.get(user_id)
+        if code is None:
+            code = self._user_codes[user_id] = len(self.users)
+            self.users.append(user_id)
+        return code
+
+    def _is_new(self, chunk):
+        at, row_id = self.watermark
+        new = chunk.answered_at > at
+        if chunk.ids is not None:
+            new |= (chunk.answered_at == at) & (chunk.ids > row_id)
+        return new
+
+    def update(self, chunk):
+        """Fold one AnswerLogs chunk in; returns the number of rows counted."""
+        keep = self._is_new(chunk) & (chunk.chosen >= 0) & (chunk.chosen < CHOICE_COUNT) & (chunk.question >= 0)
+        if not keep.all():
+            chunk = chunk.select(keep)
+        if not len(chunk):
+            return 0
+
+        present = np.flatnonzero(np.bincount(chunk.user, minlength=len(chunk.users)))
+        lookup = np.zeros(len(chunk.users), dtype=np.int64)
+        lookup[present] = [self._user_code(chunk.users[i]) for i in present]
+        user = lookup[chunk.user]
+        question = chunk.question.astype(np.int64)
+        correct = chunk.correct.astype(np.int64)
+
+        questions = int(question.max()) + 1
+        self.question_attempts = _grow(self.question_attempts, questions)
+        self.question_corrects = _grow(self.question_corrects, questions)
+        self.question_last = _grow(self.question_last, questions)
+        self.question_choices = _grow(self.question_choices, questions)
+        size = len(self.question_attempts)
+        self.question_attempts += np.bincount(question, minlength=size)
+        self.question_corrects += np.bincount(question, weights=correct, minlength=size).astype(np.int64)
+        self.question_choices += np.bincount(question * CHOICE_COUNT + chunk.chosen,
+                                             minlength=size * CHOICE_COUNT).reshape(size, CHOICE_COUNT)
+        np.maximum.at(self.question_last, question, chunk.answered_at)
+
+        self.user_attempts = _grow(self.user_attempts, len(self.users))
+        self.user_corrects = _grow(self.user_corrects, len(self.users))
+        self.user_last = _grow(self.user_last, len(self.users))
+        size = len(self.user_attempts)
+        self.user_attempts += np.bincount(user, minlength=size)
+        self.user_corrects += np.bincount(user, weights=correct, minlength=size).astype(np.int64)
+        np.maximum.at(self.user_last, user, chunk.answered_at)
+
+        latest = int(chunk.answered_at.max())
+        latest_id = int(chunk.ids[chunk.answered_at == latest].max()) if chunk.ids is not None else 0
+        self.high_water = max(self.high_water, (latest, latest_id))
+        self.rows += len(chunk)
+        return len(chunk)
+
+    def ingest(self, path, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Fold a whole export in, chunk by chunk; returns (rows read, rows counted)."""
+        read = counted = 0
+        for chunk in iter_answer_logs(path, chunk_rows, since=self.watermark[0]):
+            read += len(chunk)
+            counted += self.update(chunk)
+        self.watermark = self.high_water
+        return read, counted
+
+    def question_stats(self):
+        """One dict per answered question, ordered by id."""
+        stats = []
+        for question_id in np.flatnonzero(self.question_attempts).tolist():
+            attempts = int(self.question_attempts[question_id])
+            corrects = int(self.question_corrects[question_id])
+            stats.append({
+                "id": question_id,
+                "attempts": attempts,
+                "corrects": corrects,
+                "pValue": round(corrects / attempts, 4),
+                "lastAnsweredAt": format_timestamp(int(self.question_last[question_id])),
+                "choiceCounts": self.question_choices[question_id].tolist()
+            })
+        return stats
+
+    def user_stats(self, user_id):
+        code = self._user_codes.get(user_id)
+        if code is None:
+            return None
+        return {
+            "userId": user_id,
+            "attempts": int(self.user_attempts[code]),
+            "corrects": int(self.user_corrects[code]),
+            "lastAnsweredAt": format_timestamp(int(self.user_last[code]))
+        }
+
+    def save(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        users = len(self.users)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, version=CHECKPOINT_VERSION, rows=self.rows,
+                     watermark=np.array(self.watermark, dtype=np.int64),
+                     question_attempts=self.question_attempts, question_corrects=self.question_corrects,
+                     question_last=self.question_last, question_choices=self.question_choices,
+                     users=np.array([u.encode('utf-8') for u in self.users], dtype=bytes),
+                     user_attempts=self.user_attempts[:users], user_corrects=self.user_corrects[:users],
+                     user_last=self.user_last[:users])
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Aggregates from a checkpoint, or empty ones if path is missing or outdated."""
+        aggregates = cls()
+        try:
+            data = np.load(path)
+        except (OSError, ValueError):
+            return aggregates
+        with data:
+            if int(data['version']) != CHECKPOINT_VERSION:
+                return aggregates
+            aggregates.rows = int(data['rows'])
+            aggregates.watermark = aggregates.high_water = tuple(int(v) for v in data['watermark'])
+            for name in ('question_attempts', 'question_corrects', 'question_last', 'question_choices',
+                         'user_attempts', 'user_corrects', 'user_last'):
+                setattr(aggregates, name, data[name])
+            aggregates.users = [u.decode('utf-8') for u in data['users'].tolist()]
+        aggregates._user_codes = {user_id: code for code, user_id in enumerate(aggregates.users)}
+        return aggregates
+
+
+def write_question_stats(aggregates, path):
+    data = {
+        "version": CHECKPOINT_VERSION,
+        "answers": aggregates.rows,
+        "users": len(aggregates.users),
+        "watermark": format_timestamp(aggregates.watermark[0]),
+        "questions": aggregates.question_stats()
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
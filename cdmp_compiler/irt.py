@@ -0,0 +1,232 @@
+"""IRT calibration from answer_logs and maximum-information item selection.
+
+calibrate() fits the 1PL (Rasch) or 2PL logistic model
+
+    P(correct | theta) = 1 / (1 + exp(-a * (theta - b)))
+
+by joint maximum a posteriori estimation. Each iteration takes one Newton
+step for every user ability theta, then one for every item. An item is a
+logistic regression of its answers on theta with slope a and intercept
+d = -a * b; for 1PL only d moves. The gradients and curvatures are grouped
+sums over the whole export, computed with np.bincount like the rest of the
+analysis. Weak normal priors keep all-correct or all-wrong users and items
+finite. After every iteration the abilities are rescaled to mean 0 (and sd
+1 for 2PL) and the items follow, so that the scale stays identified.
+
+ItemSelector turns calibrated items into lookup tables over a fixed ability
+grid:
+
+- the items ranked by Fisher information a^2 P (1 - P) at each grid point;
+- log P and log(1 - P) per item and grid point.
+
+AdaptiveSession keeps the learner's posterior over the grid. An answer adds
+one row of the log tables. The next question is the first unseen item in the
+ranking at the grid point nearest the current estimate. Both operations
+touch O(grid) numbers whatever the bank size.
+"""
+import json
+
+import numpy as np
+
+from .analysis import dense_codes
+
+PARAMETERS_VERSION = 1
+MODELS = ('1pl', '2pl')
+DEFAULT_MAX_ITERATIONS = 100
+DEFAULT_TOLERANCE = 1e-3
+MAX_STEP = 1.0
+ABILITY_PRIOR_SD = 1.0
+INTERCEPT_PRIOR_SD = 3.0
+SLOPE_PRIOR_SD = 1.0
+SLOPE_RANGE = (0.05, 5.0)
+
+GRID = np.linspace(-4.0, 4.0, 161)
+RANKING_DEPTH = 64
+DEFAULT_TARGET_SE = 0.3
+PASSING_SCORE = 0.7  # the app's pass mark (MyPage / test_results)
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def calibrate(logs, model='2pl', max_iterations=DEFAULT_MAX_ITERATIONS, tolerance=DEFAULT_TOLERANCE):
+    """Fit item parameters to an AnswerLogs; returns a dict of arrays aligned on 'questionId'.
+
+    The dict also holds 'userId' and 'theta' (one ability per user who has
+    answered), 'iterations' and 'converged'.
+    """
+    if model not in MODELS:
+        raise ValueError(f"unknown IRT model {model!r}; expected one of {', '.join(MODELS)}")
+    q, question_ids = dense_codes(logs.question)
+    u, user_codes = dense_codes(logs.user)
+    items, users = len(question_ids), len(user_codes)
+    x = logs.correct.astype(np.float64)
+
+    attempts = np.bincount(q, minlength=items)
+    p_value = (np.bincount(q, weights=x, minlength=items) + 0.5) / (attempts + 1.0)
+    a = np.ones(items)
+    d = np.log(p_value / (1 - p_value))  # intercept: logit = a * theta + d, so b = -d / a
+    theta = np.zeros(users)
+
+    iteration, converged = 0, False
+    while iteration < max_iterations and not converged:
+        iteration += 1
+        previous = theta.copy(), a.copy(), d.copy()
+        slope = a[q]
+        p = _sigmoid(slope * theta[u] + d[q])
+        residual, weight = x - p, p * (1 - p)
+        gradient = np.bincount(u, weights=slope * residual, minlength=users) - theta / ABILITY_PRIOR_SD ** 2
+        curvature = np.bincount(u, weights=slope * slope * weight, minlength=users) + 1 / ABILITY_PRIOR_SD ** 2
+        theta += np.clip(gradient / curvature, -MAX_STEP, MAX_STEP)
+
+        # Items: per item a logistic regression of the answers on theta, one Newton step
+        # on (a, d) with the 2x2 curvature solved in closed form.
+        t = theta[u]
+        p = _sigmoid(slope * t + d[q])
+        residual, weight = x - p, p * (1 - p)
+        g_d = np.bincount(q, weights=residual, minlength=items) - d / INTERCEPT_PRIOR_SD ** 2
+        h_dd = np.bincount(q, weights=weight, minlength=items) + 1 / INTERCEPT_PRIOR_SD ** 2
+        if model == '2pl':
+            g_a = np.bincount(q, weights=t * residual, minlength=items) - (a - 1) / SLOPE_PRIOR_SD ** 2
+            h_aa = np.bincount(q, weights=t * t * weight, minlength=items) + 1 / SLOPE_PRIOR_SD ** 2
+            h_ad = np.bincount(q, weights=t * weight, minlength=items)
+            determinant = h_aa * h_dd - h_ad * h_ad
+            a = np.clip(a + np.clip((h_dd * g_a - h_ad * g_d) / determinant, -MAX_STEP, MAX_STEP), *SLOPE_RANGE)
+            d += np.clip((h_aa * g_d - h_ad * g_a) / determinant, -MAX_STEP, MAX_STEP)
+        else:
+            d += np.clip(g_d / h_dd, -MAX_STEP, MAX_STEP)
+
+        # Pin the ability scale (mean 0, sd 1 for 2PL); the item parameters follow.
+        shift = theta.mean()
+        scale = theta.std() if model == '2pl' and theta.std() > 0 else 1.0
+        d += a * shift
+        a *= scale
+        theta = (theta - shift) / scale
+        converged = max(np.abs(new - old).max(initial=0)
+                        for new, old in zip((theta, a, d), previous)) < tolerance
+
+    b = -d / a
+    p = _sigmoid(a[q] * (theta[u] - b[q]))
+    information = np.bincount(q, weights=a[q] ** 2 * p * (1 - p), minlength=items)
+    return {
+        'questionId': question_ids,
+        'attempts': attempts,
+        'a': a,
+        'b': b,
+        'seB': 1 / np.sqrt(information),
+        'userId': [logs.users[code] for code in user_codes.tolist()],
+        'theta': theta,
+        'model': model,
+        'iterations': iteration,
+        'converged': bool(converged)
+    }
+
+
+def write_item_parameters(params, path):
+    data = {
+        "v": PARAMETERS_VERSION,
+        "model": params['model'],
+        "iterations": params['iterations'],
+        "converged": params['converged'],
+        "items": [
+            {"id": question_id, "attempts": attempts, "a": round(a, 4), "b": round(b, 4), "seB": round(se, 4)}
+            for question_id, attempts, a, b, se in zip(
+                params['questionId'].tolist(), params['attempts'].tolist(), params['a'].tolist(),
+                params['b'].tolist(), params['seB'].tolist())
+        ]
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+
+def load_item_parameters(path):
+    """(ids, a, b) arrays from write_item_parameters() output."""
+    with open(path, 'r', encoding='utf-8') as f:
+        items = json.load(f)['items']
+    return (np.array([item['id'] for item in items], dtype=np.int64),
+            np.array([item['a'] for item in items], dtype=np.float64),
+            np.array([item['b'] for item in items], dtype=np.float64))
+
+
+class ItemSelector:
+    """Lookup tables for maximum-information selection over a fixed ability grid."""
+
+    def __init__(self, ids, a, b, grid=GRID, depth=RANKING_DEPTH):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.index = {question_id: i for i, question_id in enumerate(self.ids.tolist())}
+        self.grid = np.asarray(grid, dtype=np.float64)
+        self.step = self.grid[1] - self.grid[0]
+        a = np.asarray(a, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        p = _sigmoid(a * (self.grid[:, None] - b))  # grid x items
+        information = a * a * p * (1 - p)
+        self.information = information
+        depth = min(depth, len(self.ids))
+        top = np.argpartition(-information, depth - 1, axis=1)[:, :depth]
+        order = np.argsort(-np.take_along_axis(information, top, axis=1), axis=1, kind='stable')
+        self.ranking = np.take_along_axis(top, order, axis=1).tolist()
+        tiny = np.finfo(np.float64).tiny
+        self.log_p = np.log(np.maximum(p.T, tiny))  # items x grid
+        self.log_q = np.log(np.maximum(1 - p.T, tiny))
+        self.expected_score = p.mean(axis=1)  # share of the bank answered correctly, per grid point
+        self.prior = -0.5 * (self.grid / ABILITY_PRIOR_SD) ** 2
+
+    @classmethod
+    def from_parameters(cls, path, **kwargs):
+        return cls(*load_item_parameters(path), **kwargs)
+
+    def grid_point(self, theta):
+        return min(max(int(round((theta - self.grid[0]) / self.step)), 0), len(self.grid) - 1)
+
+    def next_item(self, theta, seen):
+        """Index of the most informative item at theta that is not in seen (a set of indexes)."""
+        point = self.grid_point(theta)
+        for index in self.ranking[point]:
+            if index not in seen:
+                return index
+        if len(seen) >= len(self.ids):
+            return None
+        # Past the precomputed depth: rank the rest of the bank at this grid point.
+        information = self.information[point].copy()
+        information[list(seen)] = -1
+        return int(information.argmax())
+
+
+class AdaptiveSession:
+    """One learner's posterior over the ability grid; EAP estimate and its standard error."""
+
+    def __init__(self, selector):
+        self.selector = selector
+        self.log_posterior = selector.prior.copy()
+        self.seen = set()
+        self.answers = 0
+        self._update()
+
+    def _update(self):
+        weights = np.exp(self.log_posterior - self.log_posterior.max())
+        self.posterior = weights / weights.sum()
+        self.theta = float(self.posterior @ self.selector.grid)
+        self.se = float(np.sqrt(self.posterior @ (self.selector.grid - self.theta) ** 2))
+
+    def next_question(self):
+        """Question id to ask next, or None once the bank is exhausted."""
+        index = self.selector.next_item(self.theta, self.seen)
+        return None if index is None else int(self.selector.ids[index])
+
+    def answer(self, question_id, correct):
+        index = self.selector.index.get(question_id)
+        if index is None or index in self.seen:
+            return
+        self.seen.add(index)
+        self.answers += 1
+        self.log_posterior += self.selector.log_p[index] if correct else self.selector.log_q[index]
+        self._update()
+
+    def done(self, target_se=DEFAULT_TARGET_SE):
+        return self.se <= target_se
+
+    def readiness(self, passing=PASSING_SCORE):
+        """(expected share correct on the bank, probability of reaching passing)."""
+        expected = float(self.posterior @ self.selector.expected_score)
+        return expected, float(self.posterior[self.selector.expected_score >= passing].sum())
@@ -0,0 +1,451 @@
+"""Lint the question CSVs without converting them: a rule registry run in parallel.
+
+Rules are registered in RULES with the @rule decorator and come in three
+scopes:
+
+- row rules see one parsed CSV row (the correct range, blank or duplicate
+  choices, the domain) and return a message or None;
+- bank rules see the per-row facts of one language's whole bank (id
+  uniqueness and contiguity, text lengths far outside their knowledge
+  area's range) and yield (row, id, message);
+- cross rules compare the banks of every language (ids or correct answers
+  that differ between en and ja) and yield (language, row, id, message).
+
+Each CSV is cut into row-aligned byte ranges (parallel.plan_chunks) and the
+ranges of every language are linted by a process pool at once. A worker
+runs the row rules over its range and returns the findings plus a few
+compact columns per row (id, correct, domain code, text lengths), so the
+parent never holds the text. Bank and cross rules then run on those columns, and every
+finding goes into one LintReport.
+"""
+import collections
+import csv
+import io
+import json
+import math
+import operator
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .domains import UNKNOWN_CODE, DomainTable
+from .parallel import DEFAULT_CHUNK_BYTES, plan_chunks
+from .schema import CHOICE_COUNT, COLUMNS, csv_filename
+from .transform import CHOICE_COLUMNS, EXPLANATION_COLUMNS
+
+REPORT_VERSION = 1
+SCOPES = ('row', 'bank', 'cross')
+SEVERITIES = ('error', 'warning')
+LENGTH_FIELDS = {'question': 1, 'choice': CHOICE_COUNT, 'explanation': CHOICE_COUNT}  # lengths per row
+OUTLIER_FENCE = 3.0      # interquartile ranges of log length past the quartiles at which a length is reported
+MIN_OUTLIER_SAMPLE = 20  # fewer lengths than this give no usable spread
+BLANK = ('', 'nan')      # pandas writes empty cells as 'nan'
+NAN_SPELLINGS = frozenset(['nan', 'NaN', 'NAN'])
+
+Rule = collections.namedtuple('Rule', 'name scope severity description check')
+Finding = collections.namedtuple('Finding', 'rule severity language row id message')
+LintRow = collections.namedtuple(
+    'LintRow', 'width header_width number correct_text id correct question choices explanations domain')
+
+RULES = {}
+
+
+def rule(name, scope, severity, description):
+    """Decorator registering a check in RULES under name."""
+    if scope not in SCOPES or severity not in SEVERITIES:
+        raise ValueError(f"rule {name!r}: bad scope {scope!r} or severity {severity!r}")
+
+    def register(check):
+        RULES[name] = Rule(name, scope, severity, description, check)
+        return check
+    return register
+
+
+def _integer(text):
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+def _normalize(text):
+    return ' '.join(text.split()).casefold()
+
+
+def _text(cell):
+    """Stripped cell text, '' for pandas' 'nan'."""
+    text = cell.strip()
+    return '' if text in NAN_SPELLINGS else text
+
+
+# Row rules: check(row, domains) -> message or None.
+
+@rule('id_format', 'row', 'error', 'number is a positive integer')
+def check_id_format(row, domains):
+    if row.id is None:
+        return f"number {row.number!r} is not an integer"
+    if row.id <= 0:
+        return f"number {row.id} is not positive"
+
+
+@rule('row_width', 'row', 'warning', 'a row has as many cells as the header')
+def check_row_width(row, domains):
+    if row.width != row.header_width:
+        return f"{row.width} cells, the header has {row.header_width} (unquoted comma or missing cells?)"
+
+
+@rule('missing_question', 'row', 'error', 'question text is not blank')
+def check_missing_question(row, domains):
+    if not row.question:
+        return "question text is blank or 'nan'"
+
+
+@rule('correct_range', 'row', 'error', f'correct is an integer from 1 to {CHOICE_COUNT}')
+def check_correct_range(row, domains):
+    if row.correct is None or not 1 <= row.correct <= CHOICE_COUNT:
+        return f"correct {row.correct_text!r} is not 1-{CHOICE_COUNT}"
+
+
+@rule('blank_choice', 'row', 'error', 'every choice has text')
+def check_blank_choice(row, domains):
+    blank = [str(i) for i, choice in enumerate(row.choices, 1) if not choice]
+    if blank:
+        return f"choice {', '.join(blank)} blank or 'nan'"
+
+
+@rule('blank_explanation', 'row', 'error', 'every choice has an explanation')
+def check_blank_explanation(row, domains):
+    blank = [str(i) for i, explanation in enumerate(row.explanations, 1) if not explanation]
+    if blank:
+        return f"explanation {', '.join(blank)} blank or 'nan'"
+
+
+@rule('duplicate_choice', 'row', 'error', 'no two choices have the same text')
+def check_duplicate_choice(row, domains):
+    keys = [_normalize(choice) for choice in row.choices]
+    filled = [key for key in keys if key]
+    if len(set(filled)) == len(filled):
+        return None
+    first = {}
+    for i, key in enumerate(keys, 1):
+        if key in first:
+            return f"choices {first[key]} and {i} are both {row.choices[i - 1]!r}"
+        if key:
+            first[key] = i
+
+
+@rule('nan_domain', 'row', 'warning', "domain is not blank or pandas' 'nan'")
+def check_nan_domain(row, domains):
+    if row.domain is not None and _normalize(row.domain) in BLANK:
+        return f"domain {row.domain!r} resolves to Unknown"
+
+
+@rule('unknown_domain', 'row', 'warning', 'domain resolves to a DMBOK knowledge area')
+def check_unknown_domain(row, domains):
+    if row.domain is not None and _normalize(row.domain) not in BLANK \
+            and domains.code(row.domain) == UNKNOWN_CODE:
+        return f"domain {row.domain!r} matches no knowledge area or alias"
+
+
+# Bank rules: check(bank) -> (row, id, message)...
+
+@rule('missing_columns', 'bank', 'error', 'the header names every column of the schema')
+def check_missing_columns(bank):
+    missing = [column for column in COLUMNS if column not in bank.header]
+    if not bank.header:
+        yield None, None, "the file is empty"
+    elif missing:
+        yield None, None, f"header lacks {', '.join(missing)}"
+
+
+@rule('duplicate_id', 'bank', 'error', 'every number is used once')
+def check_duplicate_id(bank):
+    first = {}
+    for row, question_id in enumerate(bank.ids, 1):
+        if question_id is None:
+            continue
+        if question_id in first:
+            yield row, question_id, f"number {question_id} is already used on row {first[question_id]}"
+        else:
+            first[question_id] = row
+
+
+@rule('id_gaps', 'bank', 'warning', 'numbers run from 1 without gaps')
+def check_id_gaps(bank):
+    ids = sorted({question_id for question_id in bank.ids if question_id is not None and question_id > 0})
+    previous = 0
+    for question_id in ids:
+        if question_id > previous + 1:
+            gap = f"{previous + 1}" if question_id == previous + 2 else f"{previous + 1}-{question_id - 1}"
+            yield None, question_id, f"number{'' if question_id == previous + 2 else 's'} {gap} missing " \
+                                     f"before {question_id}"
+        previous = question_id
+
+
+def _quantile(histogram, total, fraction):
+    """Lower quantile of a {value: count} histogram holding total values."""
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= total * fraction:
+            return value
+    return 0
+
+
+def length_bounds(lengths):
+    """(median, low, high) of the non-zero lengths; lengths outside [low, high] are outliers.
+
+    Text lengths are skewed, so the fences are Tukey's "far out" ones on log
+    lengths: OUTLIER_FENCE interquartile ranges below the first quartile and
+    above the third. Returns None for samples too small to have a usable
+    spread.
+    """
+    histogram = collections.Counter(lengths)
+    histogram.pop(0, None)  # blank cells are the blank_* rules' business
+    total = sum(histogram.values())
+    if total < MIN_OUTLIER_SAMPLE:
+        return None
+    first, third = (math.log(_quantile(histogram, total, fraction)) for fraction in (0.25, 0.75))
+    spread = max(third - first, 0.1)
+    return (_quantile(histogram, total, 0.5), math.exp(first - OUTLIER_FENCE * spread),
+            math.exp(third + OUTLIER_FENCE * spread))
+
+
+@rule('length_outlier', 'bank', 'warning', 'text lengths are not far outside their knowledge area\'s range')
+def check_length_outlier(bank):
+    for field, per_row in LENGTH_FIELDS.items():
+        lengths = bank.lengths[field]
+        groups = {}
+        for i, length in enumerate(lengths):
+            groups.setdefault(bank.domains[i // per_row], array('l')).append(length)
+        # Each knowledge area has its own range; one too small for a spread falls back to the bank's.
+        overall = length_bounds(lengths)
+        bounds = {}
+        for code, group in groups.items():
+            area = length_bounds(group)
+            bounds[code] = (area, 'knowledge area') if area is not None else (overall, 'bank')
+        for i, length in enumerate(lengths):
+            row = i // per_row + 1
+            limits, scope = bounds[bank.domains[row - 1]]
+            if limits is None or not length:
+                continue
+            median, low, high = limits
+            if length < low or length > high:
+                label = field if per_row == 1 else f"{field} {i % per_row + 1}"
+                yield row, bank.ids[row - 1], f"{label} is {length:,} characters ({scope} median {median:,})"
+
+
+# Cross rules: check(banks) -> (language, row, id, message)...
+
+def _first_rows(bank):
+    """{id: row} of each id's first row."""
+    rows = {}
+    for row, question_id in enumerate(bank.ids, 1):
+        if question_id is not None and question_id not in rows:
+            rows[question_id] = row
+    return rows
+
+
+@rule('language_ids', 'cross', 'error', 'every language has the same numbers')
+def check_language_ids(banks):
+    if len(banks) < 2:
+        return
+    rows = {language: _first_rows(bank) for language, bank in banks.items()}
+    owner = {}
+    for language, ids in rows.items():
+        for question_id in ids:
+            owner.setdefault(question_id, language)
+    for language, own in rows.items():
+        for question_id in sorted(owner.keys() - own.keys()):
+            yield language, None, question_id, f"number {question_id} is in {owner[question_id]} but not in {language}"
+
+
+@rule('language_correct', 'cross', 'error', 'a number has the same correct answer in every language')
+def check_language_correct(banks):
+    if len(banks) < 2:
+        return
+    (reference, base), *others = banks.items()
+    expected = {question_id: base.corrects[row - 1] for question_id, row in _first_rows(base).items()}
+    for language, bank in others:
+        for question_id, row in _first_rows(bank).items():
+            correct = bank.corrects[row - 1]
+            if question_id in expected and correct != expected[question_id]:
+                yield language, row, question_id, \
+                    f"correct {correct} here but {expected[question_id]} in {reference}"
+
+
+class BankFacts:
+    """Per-row columns of one language's bank, gathered from the worker chunks."""
+
+    def __init__(self, language, csv_path, header):
+        self.language = language
+        self.csv_path = csv_path
+        self.header = header
+        self.ids = []
+        self.corrects = []
+        self.domains = array('l')
+        self.lengths = {field: array('l') for field in LENGTH_FIELDS}
+
+    def extend(self, ids, corrects, domains, lengths):
+        self.ids.extend(ids)
+        self.corrects.extend(corrects)
+        self.domains.extend(domains)
+        for field in LENGTH_FIELDS:
+            self.lengths[field].extend(lengths[field])
+
+    @property
+    def rows(self):
+        return len(self.ids)
+
+
+def lint_chunk(csv_path, header, start, end, rule_names, domain_config):
+    """Worker: (rows, findings, ids, corrects, domain codes, lengths) for one byte range.
+
+    findings are (rule, row, id, message) with rows counted from the start
+    of the range.
+    """
+    with open(csv_path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+    width = len(header)
+    positions = {}
+    for i, name in enumerate(header):
+        positions[name] = i  # a repeated name keeps its last column, as DictReader does
+    # A column the header lacks reads the padding cell past the last column, ''.
+    number, question, correct, domain = (positions.get(name, width)
+                                         for name in ('number', 'question', 'correct', 'domain'))
+    choices = operator.itemgetter(*(positions.get(name, width) for name in CHOICE_COLUMNS))
+    explanations = operator.itemgetter(*(positions.get(name, width) for name in EXPLANATION_COLUMNS))
+    has_domain = 'domain' in positions
+    checks = [(name, RULES[name].check) for name in rule_names]
+    domains = DomainTable.from_config(domain_config)
+
+    findings = []
+    ids, corrects = [], []
+    codes = array('l')
+    lengths = {field: array('l') for field in LENGTH_FIELDS}
+    row_num = 0
+    for cells in csv.reader(io.StringIO(text, newline='')):
+        if not cells:
+            continue  # blank lines are not rows, as in csv.DictReader
+        row_num += 1
+        cell_count = len(cells)
+        cells.extend([''] * (width + 1 - cell_count))
+        row = LintRow(
+            cell_count, width, cells[number], cells[correct], _integer(cells[number]), _integer(cells[correct]),
+            _text(cells[question]), [_text(cell) for cell in choices(cells)],
+            [_text(cell) for cell in explanations(cells)], cells[domain] if has_domain else None)
+        for name, check in checks:
+            message = check(row, domains)
+            if message:
+                findings.append((name, row_num, row.id, message))
+        ids.append(row.id)
+        corrects.append(row.correct)
+        codes.append(domains.code(row.domain))
+        lengths['question'].append(len(row.question))
+        lengths['choice'].extend(map(len, row.choices))
+        lengths['explanation'].extend(map(len, row.explanations))
+    return row_num, findings, ids, corrects, codes, lengths
+
+
+class LintReport:
+    """Every finding of one lint run, with per-rule counts and a console summary."""
+
+    def __init__(self):
+        self.findings = []
+        self.rows = {}
+
+    def add(self, rule_name, language, row, question_id, message):
+        self.findings.append(Finding(rule_name, RULES[rule_name].severity, language, row, question_id, message))
+
+    def counts(self):
+        return collections.Counter(finding.rule for finding in self.findings)
+
+    @property
+    def errors(self):
+        return sum(1 for finding in self.findings if finding.severity == 'error')
+
+    @property
+    def warnings(self):
+        return len(self.findings) - self.errors
+
+    def failed(self, strict=False):
+        """True when CI should fail: any error, or with strict=True any finding."""
+        return bool(self.findings if strict else self.errors)
+
+    def sorted_findings(self):
+        return sorted(self.findings, key=lambda f: (f.rule, f.language, f.row or 0, f.id or 0))
+
+    def summary(self, limit=5):
+        """Lines for the console: one per rule that fired, errors first, with up to limit examples."""
+        lines = []
+        by_rule = collections.defaultdict(list)
+        for finding in self.sorted_findings():
+            by_rule[finding.rule].append(finding)
+        for name in sorted(by_rule, key=lambda name: (SEVERITIES.index(RULES[name].severity), name)):
+            findings = by_rule[name]
+            lines.append(f"  {RULES[name].severity:<8} {name:<18} {len(findings):>8,}  {RULES[name].description}")
+            for finding in findings[:limit]:
+                where = ' '.join(filter(None, [finding.language,
+                                               f"row {finding.row}" if finding.row else None,
+                                               f"(id {finding.id})" if finding.id is not None else None]))
+                lines.append(f"      {where}: {finding.message}")
+            if len(findings) > limit:
+                lines.append(f"      ... {len(findings) - limit:,} more")
+        return lines
+
+    def to_dict(self):
+        return {
+            "v": REPORT_VERSION,
+            "rows": self.rows,
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "counts": dict(sorted(self.counts().items())),
+            "findings": [finding._asdict() for finding in self.sorted_findings()]
+        }
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+def lint_banks(src_dir, languages, jobs=1, chunk_bytes=DEFAULT_CHUNK_BYTES, disabled=(), domain_config=None):
+    """Run every enabled rule over the languages' CSVs; returns a LintReport.
+
+    With jobs > 1 the chunks of all languages go to a process pool.
+    """
+    enabled = [rule for name, rule in RULES.items() if name not in disabled]
+    row_rules = [rule.name for rule in enabled if rule.scope == 'row']
+    report = LintReport()
+    banks = {}
+    tasks = []
+    for language in languages:
+        csv_path = os.path.join(src_dir, csv_filename(language))
+        header, ranges = plan_chunks(csv_path, chunk_bytes)
+        banks[language] = BankFacts(language, csv_path, header)
+        tasks.extend((language, (csv_path, header, start, end, row_rules, domain_config)) for start, end in ranges)
+
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(lint_chunk, *task) for _, task in tasks]
+            results = [future.result() for future in futures]
+    else:
+        results = [lint_chunk(*task) for _, task in tasks]
+
+    for (language, _), (rows, findings, ids, corrects, codes, lengths) in zip(tasks, results):
+        bank = banks[language]
+        for name, row, question_id, message in findings:
+            report.add(name, language, bank.rows + row, question_id, message)
+        bank.extend(ids, corrects, codes, lengths)
+
+    for bank in banks.values():
+        report.rows[bank.language] = bank.rows
+        for rule in enabled:
+            if rule.scope == 'bank':
+                for row, question_id, message in rule.check(bank):
+                    report.add(rule.name, bank.language, row, question_id, message)
+    for rule in enabled:
+        if rule.scope == 'cross':
+            for language, row, question_id, message in rule.check(banks):
+                report.add(rule.name, language, row, question_id, message)
+    return report
@@ -0,0 +1,224 @@
+"""Batched writes of answer events into answer_logs.
+
+The log-answer edge function inserts one row per answered question, so each
+answer costs its own round trip and commit. BatchWriter gathers the events
+that arrive close together and writes each group with a single multi-row
+INSERT. A batch goes out when it reaches max_rows or when its oldest event has
+waited max_delay seconds, whichever comes first. DirectWriter keeps today's
+one-insert-per-answer behaviour so the two can be compared.
+
+Every event carries an idempotency key. Rows are inserted with
+ON CONFLICT (idempotency_key) DO NOTHING, so a batch retried after a failure,
+or an answer the client sent twice, is stored once.
+
+AnswerLogStore stands in for the answer_logs table. It uses SQLite (a file or
+':memory:') or, when psycopg is installed, a local Postgres URL. The table is
+the Supabase one without the auth.users foreign key and with the extra key
+column. One connection serializes writes, as the database would for commits.
+"""
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+
+try:
+    import psycopg
+except ImportError:  # optional: pip install psycopg
+    psycopg = None
+
+from .schema import CHOICE_COUNT
+
+DEFAULT_BATCH_ROWS = 500
+DEFAULT_BATCH_DELAY = 0.02
+DEFAULT_RETRIES = 3
+RETRY_BACKOFF = 0.05
+MAX_PARAMS = 30000  # below SQLite's and Postgres' limits on bound parameters per statement
+
+AnswerEvent = namedtuple('AnswerEvent', 'key user_id question_id chosen_index is_correct answered_at')
+
+TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answer_logs (
+  id {id_type} PRIMARY KEY,
+  idempotency_key TEXT NOT NULL UNIQUE,
+  user_id TEXT NOT NULL,
+  question_id INTEGER NOT NULL,
+  chosen_index SMALLINT NOT NULL CHECK (chosen_index >= 0 AND chosen_index <= {last_choice}),
+  is_correct BOOLEAN NOT NULL,
+  answered_at {time_type} NOT NULL,
+  created_at {time_type} NOT NULL DEFAULT CURRENT_TIMESTAMP
+)"""
+COLUMNS = 'idempotency_key, user_id, question_id, chosen_index, is_correct, answered_at'
+
+
+class AnswerLogStore:
+    """An answer_logs table behind one serialized connection."""
+
+    def __init__(self, target=':memory:', round_trip=0.0):
+        self.round_trip = round_trip  # seconds added per transaction, to model the network hop
+        self.transactions = 0
+        self._lock = threading.Lock()
+        if target.startswith(('postgres://', 'postgresql://')):
+            if psycopg is None:
+                raise RuntimeError("a Postgres target needs psycopg (pip install psycopg)")
+            self.connection = psycopg.connect(target)
+            self._transaction = self.connection.transaction  # `with connection` would close it
+            self.placeholder = '%s'
+            self.retryable = (psycopg.OperationalError,)
+            schema = TABLE_SCHEMA.format(id_type='BIGSERIAL', time_type='TIMESTAMPTZ',
+                                         last_choice=CHOICE_COUNT - 1)
+        else:
+            self.connection = sqlite3.connect(target, check_same_thread=False, timeout=1.0)
+            self._transaction = lambda: self.connection
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=FULL')
+            self.placeholder = '?'
+            self.retryable = (sqlite3.OperationalError,)
+            schema = TABLE_SCHEMA.format(id_type='INTEGER', time_type='TEXT', last_choice=CHOICE_COUNT - 1)
+        with self._transaction():
+            self.connection.execute(schema)
+
+    def _insert_sql(self, rows):
+        values = '(' + ', '.join([self.placeholder] * len(AnswerEvent._fields)) + ')'
+        return (f'INSERT INTO answer_logs ({COLUMNS}) VALUES {", ".join([values] * rows)} '
+                'ON CONFLICT (idempotency_key) DO NOTHING')
+
+    def insert(self, events):
+        """Insert events in one transaction of multi-row INSERTs; returns the rows added."""
+        per_statement = MAX_PARAMS // len(AnswerEvent._fields)
+        added = 0
+        with self._lock:
+            if self.round_trip:
+                time.sleep(self.round_trip)
+            with self._transaction():
+                cursor = self.connection.cursor()
+                for start in range(0, len(events), per_statement):
+                    part = events[start:start + per_statement]
+                    cursor.execute(self._insert_sql(len(part)), [value for event in part for value in event])
+                    added += max(cursor.rowcount, 0)
+            self.transactions += 1
+        return added
+
+    def clear(self):
+        with self._lock, self._transaction():
+            self.connection.execute('DELETE FROM answer_logs')
+
+    def count(self):
+        with self._lock:
+            return self.connection.execute('SELECT COUNT(*) FROM answer_logs').fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+
+def validate_event(event):
+    """Reject what the edge function rejects, before one bad row can fail a whole batch."""
+    if (not isinstance(event.question_id, int) or not isinstance(event.chosen_index, int)
+            or not 0 <= event.chosen_index < CHOICE_COUNT or not isinstance(event.is_correct, bool)
+            or not event.key or not event.user_id):
+        raise ValueError(f"invalid answer event: {event!r}")
+
+
+def _insert_with_retry(store, events, retries):
+    for attempt in range(retries + 1):
+        try:
+            return store.insert(events)
+        except store.retryable:
+            if attempt == retries:
+                raise
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+
+class DirectWriter:
+    """One insert and commit per answer, as the edge function does today."""
+
+    def __init__(self, store, retries=DEFAULT_RETRIES):
+        self.store = store
+        self.retries = retries
+        self.batches = 0
+
+    def submit(self, event):
+        validate_event(event)
+        future = Future()
+        try:
+            future.set_result(_insert_with_retry(self.store, [event], self.retries))
+        except Exception as e:
+            future.set_exception(e)
+        self.batches += 1
+        return future
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class BatchWriter(DirectWriter):
+    """Coalesces submitted events into multi-row inserts on a background thread.
+
+    submit() returns a Future that resolves once the event's batch has committed
+    (its result is the number of rows the batch added).
+    """
+
+    def __init__(self, store, max_rows=DEFAULT_BATCH_ROWS, max_delay=DEFAULT_BATCH_DELAY,
+                 retries=DEFAULT_RETRIES):
+        super().__init__(store, retries)
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._pending = []  # (event, future, arrival time)
+        self._ready = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='answer-log-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, event):
+        validate_event(event)
+        future = Future()
+        with self._ready:
+            if self._closed:
+                raise RuntimeError("BatchWriter is closed")
+            self._pending.append((event, future, time.monotonic()))
+            if len(self._pending) == 1 or len(self._pending) >= self.max_rows:
+                self._ready.notify()
+        return future
+
+    def _next_batch(self):
+        with self._ready:
+            while not self._pending and not self._closed:
+                self._ready.wait()
+            if self._pending:
+                deadline = self._pending[0][2] + self.max_delay
+                while len(self._pending) < self.max_rows and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._ready.wait(remaining)
+            batch = self._pending[:self.max_rows]
+            del self._pending[:self.max_rows]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            try:
+                added = _insert_with_retry(self.store, [event for event, _, _ in batch], self.retries)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+            else:
+                for _, future, _ in batch:
+                    future.set_result(added)
+            self.batches += 1
+
+    def close(self):
+        """Flush whatever is pending and stop the writer thread."""
+        with self._ready:
+            self._closed = True
+            self._ready.notify()
+        self._thread.join()
@@ -0,0 +1,247 @@
+"""Stage timers, counters and optional profiling for a build.
+
+A Metrics object is handed to compile_languages(). The pipeline reports to
+it while it runs:
+
+- stage time: parse, validate, transform, dedup and serialize (one
+  stage per artifact). Time is exclusive: while a downstream stage pulls a
+  row from an upstream one, the clock runs for the upstream stage. Each
+  stage also counts the items it handled, which gives its throughput;
+- counters: rows read, questions written, rows skipped by validation rule,
+  duplicates dropped.
+
+Every measurement carries the labels active at the time, such as the
+language. With profile='cpu' each stage gets its own cProfile.Profile that
+runs only while the stage does. With profile='memory', tracemalloc records
+the largest allocation peak each stage reached above its starting point.
+
+The results can be written as JSON Lines, one record per measurement, or
+in the Prometheus text exposition format, e.g. for the node exporter's
+textfile collector.
+"""
+import cProfile
+import json
+import os
+import re
+import time
+import tracemalloc
+from collections import defaultdict
+
+METRICS_FORMATS = ('jsonl', 'prometheus')
+PROFILE_MODES = ('cpu', 'memory')
+PROMETHEUS_PREFIX = 'cdmp_build'
+
+
+class _Stage:
+    """Context manager timing one stage section; reused for every row."""
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.metrics._enter(self.name)
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics._leave()
+
+
+class Metrics:
+    """Collects stage timings, counters and (optionally) per-stage profiles for one build."""
+
+    def __init__(self, profile=None):
+        if profile not in (None,) + PROFILE_MODES:
+            raise ValueError(f"unknown profile mode {profile!r}; expected one of {', '.join(PROFILE_MODES)}")
+        self.profile = profile
+        self._labels = ()
+        self._keys = {}
+        self.seconds = defaultdict(float)  # (stage, labels) -> exclusive seconds
+        self.items = defaultdict(int)      # (stage, labels) -> items handled
+        self.counters = defaultdict(int)   # (name, labels) -> value
+        self.memory_peaks = defaultdict(int)
+        self.profiles = {}
+        self._stack = []
+        self._since = 0.0
+        self._memory_start = 0
+        self._stages = {}
+
+    @property
+    def labels(self):
+        return dict(self._labels)
+
+    @labels.setter
+    def labels(self, labels):
+        self._labels = tuple(sorted(labels.items()))
+        self._keys = {}
+
+    def _key(self, name, labels=None):
+        if labels:
+            return name, tuple(sorted(dict(self._labels, **labels).items()))
+        key = self._keys.get(name)
+        if key is None:
+            key = self._keys[name] = (name, self._labels)
+        return key
+
+    # Stage bookkeeping. Only the innermost active stage is on the clock.
+    def _enter(self, name):
+        now = time.perf_counter()
+        if self._stack:
+            self._pause(self._stack[-1], now)
+        self._stack.append(self._key(name))
+        self._resume(self._stack[-1], now)
+
+    def _leave(self):
+        now = time.perf_counter()
+        self._pause(self._stack.pop(), now)
+        if self._stack:
+            self._resume(self._stack[-1], now)
+
+    def _resume(self, key, now):
+        self._since = now
+        if self.profile == 'cpu':
+            self.profiles.setdefault(key, cProfile.Profile()).enable()
+        elif self.profile == 'memory':
+            tracemalloc.reset_peak()
+            self._memory_start = tracemalloc.get_traced_memory()[0]
+
+    def _pause(self, key, now):
+        self.seconds[key] += now - self._since
+        if self.profile == 'cpu':
+            self.profiles[key].disable()
+        elif self.profile == 'memory':
+            peak = tracemalloc.get_traced_memory()[1] - self._memory_start
+            if peak > self.memory_peaks[key]:
+                self.memory_peaks[key] = peak
+
+    def stage(self, name):
+        """Context manager charging the enclosed work to stage `name`."""
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = _Stage(self, name)
+        return stage
+
+    def timed(self, name, iterable):
+        """Yield from iterable, charging the time spent producing each item to stage `name`."""
+        iterator = iter(iterable)
+        stage = self.stage(name)
+        while True:
+            with stage:
+                item = next(iterator, _DONE)
+                if item is not _DONE:
+                    self.items[self._key(name)] += 1
+            if item is _DONE:
+                return
+            yield item
+
+    def handled(self, name, amount=1):
+        """Count items handled by stage `name` (timed() counts its own)."""
+        self.items[self._key(name)] += amount
+
+    def count(self, name, amount=1, **labels):
+        self.counters[self._key(name, labels)] += amount
+
+    def start(self):
+        if self.profile == 'memory' and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return self
+
+    def stop(self):
+        if self.profile == 'memory' and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def records(self):
+        """Every measurement as a flat dict, timers first."""
+        records = []
+        for (stage, labels), seconds in sorted(self.seconds.items()):
+            items = self.items.get((stage, labels), 0)
+            record = {"type": "stage", "stage": stage, **dict(labels), "seconds": round(seconds, 6),
+                      "items": items, "perSecond": round(items / seconds, 1) if seconds and items else None}
+            if (stage, labels) in self.memory_peaks:
+                record["memoryPeakBytes"] = self.memory_peaks[(stage, labels)]
+            records.append(record)
+        for (name, labels), value in sorted(self.counters.items()):
+            records.append({"type": "counter", "name": name, **dict(labels), "value": value})
+        return records
+
+    def to_jsonl(self):
+        return ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in self.records())
+
+    def to_prometheus(self):
+        lines = []
+        families = defaultdict(list)
+        for (stage, labels), seconds in sorted(self.seconds.items()):
+            tags = (('stage', stage),) + labels
+            families[('stage_seconds_total', 'counter', 'Exclusive time spent in each pipeline stage.')].append(
+                (tags, round(seconds, 6)))
+            families[('stage_items_total', 'counter', 'Items each pipeline stage handled.')].append(
+                (tags, self.items.get((stage, labels), 0)))
+            if (stage, labels) in self.memory_peaks:
+                families[('stage_memory_peak_bytes', 'gauge', 'Largest traced allocation peak within a stage.')
+                         ].append((tags, self.memory_peaks[(stage, labels)]))
+        for (name, labels), value in sorted(self.counters.items()):
+            families[(f'{_metric_name(name)}_total', 'counter', f'Count of {name.replace("_", " ")}.')].append(
+                (labels, value))
+        for (name, kind, help_text), samples in families.items():
+            lines.append(f'# HELP {PROMETHEUS_PREFIX}_{name} {help_text}')
+            lines.append(f'# TYPE {PROMETHEUS_PREFIX}_{name} {kind}')
+            for tags, value in samples:
+                rendered = ','.join(f'{_metric_name(key)}="{_escape(value)}"' for key, value in tags)
+                lines.append(f'{PROMETHEUS_PREFIX}_{name}{{{rendered}}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path, metrics_format='jsonl'):
+        """Write the measurements; JSON Lines are appended so nightly runs accumulate."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        if metrics_format == 'prometheus':
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(path + '.tmp', path)
+        else:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(self.to_jsonl())
+
+    def write_profiles(self, directory):
+        """Dump each stage's cProfile as <stage>[-<label>...].prof; returns the paths."""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for (stage, labels), profile in sorted(self.profiles.items(), key=lambda item: item[0]):
+            name = '-'.join([stage] + [str(value) for _, value in labels])
+            path = os.path.join(directory, re.sub(r'[^\w.-]+', '_', name) + '.prof')
+            profile.dump_stats(path)
+            paths.append(path)
+        return paths
+
+    def summary(self):
+        """Lines for the console: slowest stages first, then the counters."""
+        lines = []
+        for record in sorted(self.records(), key=lambda r: -r.get('seconds', 0)):
+            labels = ' '.join(f'{key}={value}' for key, value in record.items()
+                              if key not in ('type', 'stage', 'name', 'seconds', 'items', 'perSecond',
+                                             'memoryPeakBytes', 'value'))
+            if record['type'] == 'stage':
+                rate = f"{record['perSecond']:>12,.0f}/s" if record['perSecond'] else ' ' * 14
+                memory = (f"  peak {record['memoryPeakBytes'] / 1024:,.0f} KiB"
+                          if 'memoryPeakBytes' in record else '')
+                lines.append(f"  {record['stage']:<18} {labels:<14} {record['seconds']:>9.3f}s "
+                             f"{record['items']:>10,} {rate}{memory}")
+            else:
+                lines.append(f"  {record['name']:<18} {labels:<14} {record['value']:>10,}")
+        return lines
+
+
+_DONE = object()
+
+
+def _metric_name(name):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,145 @@
+"""Newline-delimited JSON bank: a header line, then one compact record per line.
+
+cdmp_questions_en.ndjson (with .gz/.br siblings) starts with
+
+    {"v": 1, "count": 799, "setSizes": [200],
+     "sets": [{"set": 1, "start": 1, "end": 200, "count": 200}, ...]}
+
+followed by the compact records of compact.py, one per line, in practice-set
+order (within a set, in CSV order). A consumer can act on the first record,
+or the first complete set, before the rest has arrived, and never holds more
+than one record.
+
+The writer appends records to a spool file next to the output and remembers
+each one's set and offset; on exit it writes the header and copies the lines
+over set by set. Memory stays at two integers per question.
+"""
+import array
+import gzip
+import json
+import os
+import shutil
+
+from .compact import from_compact, write_compressed
+from .shards import DEFAULT_SET_SIZES, SetLayout, format_shard_record
+
+NDJSON_VERSION = 1
+COPY_BUFFER = 1024 * 1024
+
+
+class NdjsonWriter:
+    """Stream questions into an NDJSON bank ordered by practice set."""
+
+    suffix = '.ndjson'
+    format = staticmethod(format_shard_record)
+
+    def __init__(self, path, layout=None):
+        self.path = path
+        self.layout = layout or SetLayout()
+        self.count = 0
+        self._spool = None
+        self._sets = array.array('q')
+        self._offsets = array.array('q')
+
+    @classmethod
+    def open(cls, path, options):
+        return cls(path, SetLayout(options.get('set_sizes', DEFAULT_SET_SIZES)))
+
+    @classmethod
+    def outputs(cls, path):
+        return [path, path + '.gz', path + '.br']
+
+    def __enter__(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._spool = open(self.path + '.spool', 'w+b')
+        return self
+
+    def write(self, question):
+        self.write_formatted(self.format(question))
+
+    def write_formatted(self, record):
+        question_id, text = record
+        self._sets.append(self.layout.set_for_id(question_id))
+        self._offsets.append(self._spool.tell())
+        self._spool.write(text.encode('utf-8') + b'\n')
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self._offsets.append(self._spool.tell())
+                self._write_bank()
+        finally:
+            self._spool.close()
+            os.remove(self._spool.name)
+            self._spool = None
+        if exc_type is None:
+            write_compressed(self.path)
+        return False
+
+    def header(self):
+        counts = {}
+        for set_number in self._sets:
+            counts[set_number] = counts.get(set_number, 0) + 1
+        sets = []
+        for set_number in sorted(counts):
+            first, last = self.layout.id_range(set_number)
+            sets.append({"set": set_number, "start": first, "end": last, "count": counts[set_number]})
+        return {"v": NDJSON_VERSION, "count": self.count, "setSizes": self.layout.set_sizes, "sets": sets}
+
+    def _write_bank(self):
+        with open(self.path, 'wb') as f:
+            f.write(json.dumps(self.header(), ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n')
+            if all(a <= b for a, b in zip(self._sets, self._sets[1:])):
+                self._spool.seek(0)
+                shutil.copyfileobj(self._spool, f, COPY_BUFFER)
+                return
+            for k in sorted(range(self.count), key=self._sets.__getitem__):  # stable: CSV order within a set
+                self._spool.seek(self._offsets[k])
+                f.write(self._spool.read(self._offsets[k + 1] - self._offsets[k]))
+
+
+class NdjsonReader:
+    """Read an NDJSON bank (plain or .gz) one record at a time.
+
+    header is read on open; iterating yields the app's question dicts, and
+    records() the compact records as stored.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if path.endswith('.gz'):
+            self._file = gzip.open(path, 'rt', encoding='utf-8', newline='\n')
+        else:
+            self._file = open(path, 'r', encoding='utf-8', newline='\n')
+        line = self._file.readline()
+        if not line:
+            self._file.close()
+            raise ValueError(f"{path}: empty NDJSON bank")
+        self.header = json.loads(line)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        self._file.close()
+
+    def records(self):
+        for line in self._file:
+            if line.strip():
+                yield json.loads(line)
+
+    def __iter__(self):
+        return map(from_compact, self.records())
+
+
+def iter_ndjson(path):
+    """Yield the questions of an NDJSON bank in file order."""
+    with NdjsonReader(path) as reader:
+        yield from reader
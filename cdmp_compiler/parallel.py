@@ -0,0 +1,177 @@
+"""Process-pool conversion: every language at once, large CSVs split into chunks.
+
+A CSV is cut into byte ranges that each start and end on a row boundary. A
+newline ends a row only when it sits outside a quoted field, which is the
+case exactly when the number of '"' bytes before it is even (escaped quotes
+come in pairs). Workers parse, validate and serialize their range; the parent
+only writes the finished text in chunk order, so the output is identical to
+the serial path.
+"""
+import collections
+import contextlib
+import csv
+import io
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .artifacts import ARTIFACTS, DEFAULT_ARTIFACTS, open_sinks
+from .compiler import describe_error, make_detector, report_written, rewrite_stale_sets, transform_rows
+from .dedup import DuplicateFilter, signature
+from .domains import DomainTable
+from .incremental import BuildCache
+from .schema import csv_filename, normalize_header
+
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def _next_row_end(mm, start, pos):
+    """Offset just past the first row-ending newline at or after pos."""
+    quotes = mm[start:pos].count(b'"')
+    while True:
+        newline = mm.find(b'\n', pos)
+        if newline == -1:
+            return len(mm)
+        quotes += mm[pos:newline].count(b'"')
+        if quotes % 2 == 0:
+            return newline + 1
+        pos = newline + 1
+
+
+def plan_chunks(csv_path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Return (header, ranges) where ranges are (start, end) byte offsets of row chunks."""
+    with open(csv_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return [], []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header_end = _next_row_end(mm, 0, 0)
+            header_line = mm[:header_end].decode('utf-8-sig')
+            header = normalize_header(next(csv.reader([header_line]), []))
+
+            ranges = []
+            start = header_end
+            while start < len(mm):
+                end = _next_row_end(mm, start, min(start + chunk_bytes, len(mm)))
+                ranges.append((start, end))
+                start = end
+    return header, ranges
+
+
+def convert_chunk(csv_path, header, start, end, artifacts, domain_config, with_signatures=False):
+    """Worker: turn one byte range into (rows_seen, texts per artifact, errors, signatures).
+
+    signatures is a list of (id, MinHash signature) per question when the
+    build drops near-duplicates, otherwise None.
+    """
+    with open(csv_path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+
+    reader = csv.DictReader(io.StringIO(text, newline=''), fieldnames=header, restval='')
+    rows = list(enumerate(reader, 1))
+    errors = []
+    formats = [ARTIFACTS[name].format for name in artifacts]
+    formatted = [[] for _ in formats]
+    signatures = [] if with_signatures else None
+    domains = DomainTable.from_config(domain_config)
+    for question in transform_rows(rows, lambda row_num, e: errors.append((row_num, e)), domains):
+        for texts, format_record in zip(formatted, formats):
+            texts.append(format_record(question))
+        if with_signatures:
+            signatures.append((question['id'], signature(question)))
+    return len(rows), formatted, errors, signatures
+
+
+def _ordered_submit(pool, tasks, window):
+    """Submit tasks keeping at most `window` in flight; yield futures in task order."""
+    pending = collections.deque()
+    for task in tasks:
+        pending.append(pool.submit(convert_chunk, *task))
+        if len(pending) >= window:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
+def compile_languages_parallel(src_dir, out_dir, languages, jobs, chunk_bytes=DEFAULT_CHUNK_BYTES,
+                               artifacts=DEFAULT_ARTIFACTS, options=None, incremental=False, force=False):
+    """Parallel counterpart of compile_languages(); returns counts by language."""
+    options = options or {}
+    counts = {}
+    plans = []
+    for language in languages:
+        csv_path = os.path.join(src_dir, csv_filename(language))
+        sink_options = options
+        cache = None
+        if incremental:
+            cache = BuildCache(csv_path, out_dir, language, artifacts, options)
+            sink_options = cache.plan(force)
+            if sink_options is None:
+                print(f"{csv_path} is up to date")
+                counts[language] = cache.count
+                continue
+            print(f"{csv_path}: {cache.describe(sink_options)}")
+        try:
+            header, ranges = plan_chunks(csv_path, chunk_bytes)
+        except Exception as e:
+            print(f"Error converting {csv_path}: {e}")
+            counts[language] = 0
+            continue
+        plans.append((language, csv_path, header, ranges, sink_options, cache))
+
+    detector = make_detector(options)
+    tasks = [(csv_path, header, start, end, artifacts, options.get('domains'), detector is not None)
+             for _, csv_path, header, ranges, _, _ in plans
+             for start, end in ranges]
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = _ordered_submit(pool, tasks, window=jobs * 2)
+
+        for i, (language, csv_path, header, ranges, sink_options, cache) in enumerate(plans):
+            if i:
+                print('---')
+            print(f"Converting {csv_path} ({len(ranges)} chunks)...")
+
+            sinks = open_sinks(out_dir, language, artifacts, sink_options)
+            duplicates = DuplicateFilter(detector, language) if detector is not None else None
+            rows_before = 0
+            count = 0
+            failure = None
+            with contextlib.ExitStack() as stack:
+                for sink in sinks:
+                    stack.enter_context(sink)
+                for _ in ranges:
+                    future = next(futures)
+                    if failure is not None:
+                        continue
+                    try:
+                        rows_seen, formatted, errors, signatures = future.result()
+                    except Exception as e:
+                        failure = e
+                        continue
+                    for row_num, error in errors:
+                        print(describe_error(rows_before + row_num, error))
+                    rows_before += rows_seen
+                    for k in range(rows_seen - len(errors)):
+                        if duplicates is not None and not duplicates.keep(*signatures[k]):
+                            continue
+                        for sink, texts in zip(sinks, formatted):
+                            sink.write_formatted(texts[k])
+                        count += 1
+
+            if failure is not None:
+                print(f"Error converting {csv_path}: {failure}")
+                counts[language] = 0
+                continue
+
+            report_written(count, sinks)
+            counts[language] = count
+            if cache is not None and count:
+                rewritten, duplicates = rewrite_stale_sets(csv_path, out_dir, language, artifacts, options,
+                                                           sink_options, cache, duplicates)
+                if rewritten is not None:
+                    counts[language] = count = rewritten
+                if count:
+                    cache.save(count, duplicates.pairs if duplicates is not None else None)
+
+    return {language: counts[language] for language in languages}
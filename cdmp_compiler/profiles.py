@@ -0,0 +1,176 @@
+"""Per-user weakness profiles and review queues materialized from answer_logs.
+
+MyPage used to fetch every wrong answer of the user and deduplicate them in
+the browser. This batch job reads an answer_logs export once and writes one
+small document per user. A single keyed read of that document then serves
+the page:
+
+    {"v": 1, "asOf": ..., "answers": n, "corrects": c, "lastAnsweredAt": ...,
+     "domains": [{"code", "attempts", "corrects", "accuracy", "lastSeenAt"}, ...],
+     "missed": [question ids ever answered wrongly],
+     "review": [{"id", "box", "misses", "lastSeenAt", "due"}, ...]}
+
+The domains list is ordered weakest first. The review queue follows a Leitner
+schedule:
+
+- a question's box is the number of correct answers in a row since it was
+  last missed;
+- it is due BASE_INTERVAL_DAYS * 2**box days after it was last seen;
+- it retires once it reaches RETIRE_BOX.
+
+Queued questions are ranked by how far past due they are, relative to their
+interval. Everything up to that ranking is computed with sorts, bincounts and
+accumulates over the whole export. Only the assembly of each document loops
+over users.
+"""
+import json
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .domains import DMBOK_DOMAINS, UNKNOWN_CODE
+
+PROFILE_VERSION = 1
+BASE_INTERVAL_DAYS = 1
+RETIRE_BOX = 5
+DEFAULT_QUEUE_SIZE = 50
+DAY_US = 86_400_000_000
+
+
+def domain_lookup(domain_index):
+    """Array mapping question id -> domain code, from load_domain_index() output."""
+    ids = [question_id for entry in domain_index.values() for question_id in entry['ids']]
+    lookup = np.full(max(ids, default=0) + 1, UNKNOWN_CODE, dtype=np.int64)
+    for code, entry in domain_index.items():
+        lookup[entry['ids']] = code
+    return lookup
+
+
+def domain_slots(domain_index):
+    """Domain columns per user: room for every DMBOK code and every code in domain_index."""
+    return max(max(DMBOK_DOMAINS), max(domain_index, default=0)) + 1
+
+
+def iso_times(micros):
+    """Vectorized µs-since-epoch -> 'YYYY-MM-DDTHH:MM:SSZ' strings."""
+    return np.datetime_as_string(np.asarray(micros, dtype='datetime64[us]'), unit='s', timezone='UTC')
+
+
+def _question_domains(questions, lookup):
+    known = questions < len(lookup)
+    return np.where(known, lookup[np.minimum(questions, len(lookup) - 1)], UNKNOWN_CODE)
+
+
+def _pair_summaries(logs):
+    """Collapse logs to one row per (user, question), in time order within each pair."""
+    order = np.lexsort((logs.answered_at, logs.question, logs.user))
+    user = logs.user[order].astype(np.int64)
+    question = logs.question[order].astype(np.int64)
+    correct = logs.correct[order]
+    answered_at = logs.answered_at[order]
+
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (user[1:] != user[:-1]) | (question[1:] != question[:-1])
+    starts = np.flatnonzero(first)
+    ends = np.append(starts[1:], len(order)) - 1
+    position = np.arange(len(order))
+
+    # Position of the latest miss up to each row; group_start - 1 when there is none yet.
+    group_start = np.repeat(starts, np.diff(np.append(starts, len(order))))
+    last_miss = np.maximum.accumulate(np.where(correct, group_start - 1, position))[ends]
+    return {
+        'user': user[starts],
+        'question': question[starts],
+        'box': ends - last_miss,
+        'misses': np.add.reduceat((~correct).astype(np.int64), starts),
+        'lastSeen': answered_at[ends]
+    }
+
+
+def build_profiles(logs, domain_index, now=None, queue_size=DEFAULT_QUEUE_SIZE):
+    """Yield (user_id, profile) for every user in logs."""
+    if not len(logs):
+        return
+    now = now if now is not None else round(datetime.now(timezone.utc).timestamp() * 1_000_000)
+    lookup = domain_lookup(domain_index)
+    slots = domain_slots(domain_index)  # --domain-aliases names may add codes past the DMBOK ones
+    users = len(logs.users)
+    correct = logs.correct.astype(np.int64)
+
+    answers = np.bincount(logs.user, minlength=users)
+    corrects = np.bincount(logs.user, weights=correct, minlength=users).astype(np.int64)
+    last_answer = np.zeros(users, dtype=np.int64)
+    np.maximum.at(last_answer, logs.user, logs.answered_at)
+
+    cell = logs.user.astype(np.int64) * slots + _question_domains(logs.question, lookup)
+    cells = users * slots
+    domain_attempts = np.bincount(cell, minlength=cells).reshape(users, slots)
+    domain_corrects = np.bincount(cell, weights=correct, minlength=cells).astype(np.int64).reshape(users, slots)
+    domain_last = np.zeros(cells, dtype=np.int64)
+    np.maximum.at(domain_last, cell, logs.answered_at)
+    domain_last = domain_last.reshape(users, slots)
+
+    pairs = _pair_summaries(logs)
+    # Leitner schedule; queued pairs are ranked within each user and cut to queue_size.
+    interval = BASE_INTERVAL_DAYS * DAY_US * 2 ** np.minimum(pairs['box'], RETIRE_BOX)
+    due = pairs['lastSeen'] + interval
+    overdue = (now - due) / interval
+    missed = pairs['misses'] > 0
+    queued = missed & (pairs['box'] < RETIRE_BOX)
+    missed_at = np.searchsorted(pairs['user'][missed], np.arange(users + 1))
+    missed_ids = pairs['question'][missed]
+    queue = np.flatnonzero(queued)
+    queue = queue[np.lexsort((-overdue[queue], pairs['user'][queue]))]
+    queue_at = np.searchsorted(pairs['user'][queue], np.arange(users + 1))
+    rank = np.arange(len(queue)) - queue_at[pairs['user'][queue]]
+    queue = queue[rank < queue_size]
+    queue_at = np.searchsorted(pairs['user'][queue], np.arange(users + 1))
+
+    as_of = str(iso_times([now])[0])
+    domain_seen = iso_times(domain_last)
+    review_ids = pairs['question'][queue].tolist()
+    review_box = pairs['box'][queue].tolist()
+    review_misses = pairs['misses'][queue].tolist()
+    review_seen = iso_times(pairs['lastSeen'][queue]).tolist()
+    review_due = iso_times(due[queue]).tolist()
+    last_answered = iso_times(last_answer).tolist()
+    for code, user_id in enumerate(logs.users):
+        if not answers[code]:
+            continue
+        seen = np.flatnonzero(domain_attempts[code])
+        accuracy = domain_corrects[code, seen] / domain_attempts[code, seen]
+        domains = [
+            {"code": d, "attempts": int(domain_attempts[code, d]), "corrects": int(domain_corrects[code, d]),
+             "accuracy": round(a, 4), "lastSeenAt": str(domain_seen[code, d])}
+            for d, a in sorted(zip(seen.tolist(), accuracy.tolist()), key=lambda item: (item[1], item[0]))
+        ]
+        review = [
+            {"id": review_ids[r], "box": review_box[r], "misses": review_misses[r],
+             "lastSeenAt": review_seen[r], "due": review_due[r]}
+            for r in range(queue_at[code], queue_at[code + 1])
+        ]
+        yield user_id, {
+            "v": PROFILE_VERSION,
+            "asOf": as_of,
+            "answers": int(answers[code]),
+            "corrects": int(corrects[code]),
+            "lastAnsweredAt": last_answered[code],
+            "domains": domains,
+            "missed": missed_ids[missed_at[code]:missed_at[code + 1]].tolist(),
+            "review": review
+        }
+
+
+def write_profiles(profiles, path):
+    """Write (user_id, profile) pairs as JSON Lines ready for an upsert into user_profiles."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    count = 0
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        for user_id, profile in profiles:
+            f.write(json.dumps({"user_id": user_id, "profile": profile}, ensure_ascii=False,
+                               separators=(',', ':')) + '\n')
+            count += 1
+    os.replace(path + '.tmp', path)
+    return count
@@ -0,0 +1,19 @@
+"""Row generator over a question CSV."""
+import csv
+
+from .schema import normalize_header
+
+
+def iter_rows(csv_path):
+    """Yield (row_num, row) pairs one at a time without loading the whole file.
+
+    Row numbers start at 1 for the first data row and skip blank lines, the
+    same numbering csv.DictReader gives. Missing trailing cells read as ''.
+    """
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as csvfile:
+        header = next(csv.reader(csvfile), None)
+        if header is None:
+            return
+        reader = csv.DictReader(csvfile, fieldnames=normalize_header(header), restval='')
+        for row_num, row in enumerate(reader, 1):
+            yield row_num, row
@@ -0,0 +1,332 @@
+"""Versioned releases of a compiled bank, with per-question patches to the latest.
+
+A release is a bank's compact records keyed by id (a repeated id keeps its
+first row), in id order. Its version is the first 16 hex digits of the
+sha256 of those records, one canonical JSON line each, so identical content
+always gets the same version.
+
+For cdmp_questions_en.releases.json (the manifest) the files go into
+releases/cdmp_questions_en/ next to it:
+
+- <version>.ndjson.gz, each retained release: a header line
+  {"v": 1, "version": ..., "count": ...} and then one record per line;
+- patch-<from>-<to>.json (with .gz/.br siblings), from every older retained
+  release to the latest:
+
+    {"v": 1, "from": ..., "to": ..., "added": [records], "changed": [records], "removed": [ids]}
+
+The manifest names the latest version and lists the last `keep` releases and
+the patches. A build whose content matches the latest release changes
+nothing. apply_patch() turns the records of one release into the next and
+checks both hashes.
+
+The writer spools records to a file next to the manifest and keeps only each
+record's id and offset. On exit it sorts an index of those (first row of a
+repeated id wins), hashes and writes the release by reading the spool back in
+id order, and diffs it against each older release by merging the two id-ordered
+streams, so no release is ever held in memory whole.
+"""
+import array
+import gzip
+import hashlib
+import json
+import os
+
+from .compact import to_compact, write_compressed
+from .shards import file_sha256
+
+RELEASE_FORMAT = 1
+DEFAULT_KEEP = 5
+RELEASES_DIR = 'releases'
+VERSION_DIGITS = 16
+
+
+def canonical(record):
+    return json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def format_release_record(question):
+    return question['id'], canonical(to_compact(question))
+
+
+def in_id_order(lines):
+    """(id, line) pairs of {id: canonical record line}, in id order."""
+    return ((question_id, lines[question_id]) for question_id in sorted(lines))
+
+
+def records_version(records):
+    """Version of a release given its (id, canonical record line) pairs in id order."""
+    digest = hashlib.sha256()
+    for _, line in records:
+        digest.update(line.encode('utf-8') + b'\n')
+    return digest.hexdigest()[:VERSION_DIGITS]
+
+
+def release_version(lines):
+    """Version of a release given {id: canonical record line}."""
+    return records_version(in_id_order(lines))
+
+
+def iter_release(path):
+    """(id, canonical record line) pairs of a release file, in id order."""
+    with gzip.open(path, 'rt', encoding='utf-8', newline='\n') as f:
+        f.readline()  # header
+        for line in f:
+            line = line.rstrip('\n')
+            yield json.loads(line)['i'], line
+
+
+def read_release(path):
+    """(header, {id: canonical record line}) of a release file."""
+    with gzip.open(path, 'rt', encoding='utf-8', newline='\n') as f:
+        header = json.loads(f.readline())
+    return header, dict(iter_release(path))
+
+
+def write_records(path, version, count, records):
+    """Write a release file from (id, canonical record line) pairs in id order."""
+    header = {"v": RELEASE_FORMAT, "version": version, "count": count}
+    with open(path, 'wb') as raw:
+        with gzip.GzipFile(filename='', mode='wb', fileobj=raw, compresslevel=9, mtime=0) as f:
+            f.write(json.dumps(header, separators=(',', ':')).encode('utf-8') + b'\n')
+            for _, line in records:
+                f.write(line.encode('utf-8') + b'\n')
+
+
+def write_release(path, lines):
+    """Write a release file for {id: canonical record line}; returns its version."""
+    version = release_version(lines)
+    write_records(path, version, len(lines), in_id_order(lines))
+    return version
+
+
+def load_release(path):
+    """Records of a release file, in id order."""
+    _, lines = read_release(path)
+    return [json.loads(lines[question_id]) for question_id in sorted(lines)]
+
+
+def read_patch(path):
+    """Load a patch (plain or .gz)."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def diff_records(old, new, old_version, new_version):
+    """Patch between two releases given as (id, canonical record line) pairs in id order.
+
+    The two streams are merged, so each side is read once and never held.
+    """
+    added, changed, removed = [], [], []
+    old, new = iter(old), iter(new)
+    old_record, new_record = next(old, None), next(new, None)
+    while old_record is not None or new_record is not None:
+        if new_record is None or (old_record is not None and old_record[0] < new_record[0]):
+            removed.append(old_record[0])
+            old_record = next(old, None)
+        elif old_record is None or new_record[0] < old_record[0]:
+            added.append(json.loads(new_record[1]))
+            new_record = next(new, None)
+        else:
+            if new_record[1] != old_record[1]:
+                changed.append(json.loads(new_record[1]))
+            old_record, new_record = next(old, None), next(new, None)
+    return {"v": RELEASE_FORMAT, "from": old_version, "to": new_version,
+            "added": added, "changed": changed, "removed": removed}
+
+
+def diff_releases(old, new):
+    """Patch between two {id: canonical record line} releases."""
+    return diff_records(in_id_order(old), in_id_order(new), release_version(old), release_version(new))
+
+
+def patch_lines(lines, patch):
+    """{id: canonical record line} of release patch['to'] from those of patch['from'].
+
+    Raises ValueError when lines are not release patch['from'] or the result
+    does not hash to patch['to'].
+    """
+    if release_version(lines) != patch['from']:
+        raise ValueError(f"records are not release {patch['from']}")
+    lines = dict(lines)
+    for question_id in patch['removed']:
+        lines.pop(question_id, None)
+    for record in patch['added'] + patch['changed']:
+        lines[record['i']] = canonical(record)
+    if release_version(lines) != patch['to']:
+        raise ValueError(f"patched records do not match release {patch['to']}")
+    return lines
+
+
+def apply_patch(records, patch):
+    """Records of release patch['to'] from those of patch['from'] (see patch_lines), in id order."""
+    lines = {}
+    for record in records:
+        lines.setdefault(record['i'], canonical(record))
+    lines = patch_lines(lines, patch)
+    return [json.loads(lines[question_id]) for question_id in sorted(lines)]
+
+
+def read_manifest(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class ReleaseWriter:
+    """Spool a build's records and publish them as a release with patches."""
+
+    suffix = '.releases.json'
+    format = staticmethod(format_release_record)
+
+    def __init__(self, path, keep=DEFAULT_KEEP):
+        if keep < 1:
+            raise ValueError(f"releases to keep must be positive: {keep!r}")
+        self.path = path
+        self.keep = keep
+        self.count = 0
+        self.version = None
+        self._spool = None
+        self._ids = array.array('q')
+        self._offsets = array.array('q')
+        self._order = array.array('q')
+        base = os.path.basename(path)[:-len(self.suffix)]
+        self.directory = os.path.join(os.path.dirname(path), RELEASES_DIR, base)
+
+    @classmethod
+    def open(cls, path, options):
+        return cls(path, options.get('keep_releases', DEFAULT_KEEP))
+
+    @classmethod
+    def outputs(cls, path):
+        if not os.path.exists(path):
+            return [path]
+        base_dir = os.path.dirname(path)
+        manifest = read_manifest(path)
+        paths = [path]
+        paths.extend(os.path.join(base_dir, entry['path']) for entry in manifest['releases'])
+        for entry in manifest['patches']:
+            patch = os.path.join(base_dir, entry['path'])
+            paths.extend([patch, patch + '.gz', patch + '.br'])
+        return paths
+
+    def __enter__(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._spool = open(self.path + '.spool', 'w+b')
+        return self
+
+    def write(self, question):
+        self.write_formatted(self.format(question))
+
+    def write_formatted(self, record):
+        question_id, line = record
+        self._ids.append(question_id)
+        self._offsets.append(self._spool.tell())
+        self._spool.write(line.encode('utf-8') + b'\n')
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self._offsets.append(self._spool.tell())
+                self._order = self._id_index()
+                self._publish()
+        finally:
+            self._spool.close()
+            os.remove(self._spool.name)
+            self._spool = None
+            self._ids, self._offsets, self._order = array.array('q'), array.array('q'), array.array('q')
+        return False
+
+    def _id_index(self):
+        """Spool positions of the release's records in id order; a repeated id keeps its first row."""
+        ids = self._ids
+        if all(a <= b for a, b in zip(ids, ids[1:])):
+            positions = range(len(ids))
+        else:
+            positions = sorted(range(len(ids)), key=ids.__getitem__)  # stable: first row first
+        order = array.array('q')
+        previous = None
+        for k in positions:
+            if ids[k] != previous:
+                order.append(k)
+                previous = ids[k]
+        return order
+
+    def _records(self):
+        """(id, canonical record line) of the release in id order, read back from the spool."""
+        for k in self._order:
+            self._spool.seek(self._offsets[k])
+            yield self._ids[k], self._spool.read(self._offsets[k + 1] - self._offsets[k] - 1).decode('utf-8')
+
+    def _relative(self, path):
+        return os.path.relpath(path, os.path.dirname(self.path) or '.')
+
+    def _release_path(self, version):
+        return os.path.join(self.directory, f'{version}.ndjson.gz')
+
+    def _patch_path(self, old, new):
+        return os.path.join(self.directory, f'patch-{old}-{new}.json')
+
+    def _publish(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.version = records_version(self._records())
+        manifest = read_manifest(self.path) if os.path.exists(self.path) else None
+        if manifest and manifest['latest'] == self.version and os.path.exists(self._release_path(self.version)):
+            return
+
+        write_records(self._release_path(self.version), self.version, len(self._order), self._records())
+        previous = [entry for entry in manifest['releases'] if entry['version'] != self.version] if manifest else []
+        previous = [entry for entry in previous if os.path.exists(self._release_path(entry['version']))]
+        releases = previous[-(self.keep - 1):] if self.keep > 1 else []
+        sequence = max((entry['sequence'] for entry in manifest['releases']), default=0) + 1 if manifest else 1
+        path = self._release_path(self.version)
+        releases.append({"version": self.version, "sequence": sequence, "count": len(self._order),
+                         "path": self._relative(path), "bytes": os.path.getsize(path),
+                         "sha256": file_sha256(path)})
+
+        patches = [self._write_patch(entry['version']) for entry in releases[:-1]]
+        self._remove_stale(releases, patches)
+        manifest = {
+            "v": RELEASE_FORMAT,
+            "latest": self.version,
+            "releases": releases,
+            "patches": patches
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    def _write_patch(self, old_version):
+        patch = diff_records(iter_release(self._release_path(old_version)), self._records(),
+                             old_version, self.version)
+        path = self._patch_path(old_version, self.version)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(patch, f, ensure_ascii=False, separators=(',', ':'))
+        write_compressed(path)
+        return {"from": old_version, "to": self.version, "path": self._relative(path),
+                "bytes": os.path.getsize(path), "gzipBytes": os.path.getsize(path + '.gz'),
+                "sha256": file_sha256(path), "added": len(patch['added']),
+                "changed": len(patch['changed']), "removed": len(patch['removed'])}
+
+    def _remove_stale(self, releases, patches):
+        """Delete releases and patches the new manifest no longer lists."""
+        keep = {os.path.basename(entry['path']) for entry in releases}
+        for entry in patches:
+            name = os.path.basename(entry['path'])
+            keep.update([name, name + '.gz', name + '.br'])
+        for name in os.listdir(self.directory):
+            if name not in keep and (name.endswith('.ndjson.gz') or name.startswith('patch-')):
+                os.remove(os.path.join(self.directory, name))
+
+
+def describe(manifest_path):
+    """Console lines summarizing a release manifest."""
+    manifest = read_manifest(manifest_path)
+    lines = [f"Release {manifest['latest']} of {os.path.basename(manifest_path)}: "
+             f"{len(manifest['releases'])} retained"]
+    for entry in manifest['patches']:
+        lines.append(f"  patch from {entry['from']}: +{entry['added']} ~{entry['changed']} -{entry['removed']} "
+                     f"({entry['gzipBytes']:,} bytes gzipped)")
+    return lines
@@ -0,0 +1,35 @@
+"""Column layout and file naming shared by every stage of the compiler."""
+
+CHOICE_COUNT = 5
+
+COLUMNS = (
+    ['number', 'question']
+    + [name
+       for i in range(1, CHOICE_COUNT + 1)
+       for name in (f'choice_{i}', f'explanation_{i}')]
+    + ['correct', 'domain']
+)
+
+# The Japanese export ships with translated header names; map them onto the
+# canonical column names so every language goes through the same code path.
+HEADER_ALIASES = {
+    '番号': 'number',
+    '質問': 'question',
+    **{f'選択肢{i}': f'choice_{i}' for i in range(1, CHOICE_COUNT + 1)},
+    **{f'説明_{i}': f'explanation_{i}' for i in range(1, CHOICE_COUNT + 1)},
+}
+
+LANGUAGES = ('en', 'ja')
+
+
+def normalize_header(header):
+    """Return the canonical column names for a CSV header row."""
+    return [HEADER_ALIASES.get(name.strip(), name.strip()) for name in header]
+
+
+def csv_filename(language):
+    return f'cdmp_questions_{language}.csv'
+
+
+def json_filename(language):
+    return f'cdmp_questions_{language}.json'
@@ -0,0 +1,187 @@
+"""Inverted full-text index over question text, choices and explanations.
+
+Tokenization is script-aware, so one tokenizer serves both banks: after NFKC
+normalization and lower-casing, runs of Latin letters/digits become word
+tokens (minus a few stopwords) and runs of kana/kanji become overlapping
+character bigrams (a lone character is kept as a unigram). The index also
+holds every kana/kanji character as a unigram, so a one-character query such
+as "表" finds the questions where it appears inside a longer run. Queries go
+through the same tokenizer (bigrams only) and match questions containing
+every token.
+
+cdmp_questions_<lang>.search.json:
+
+    {"version": 2, "count": 799,
+     "terms": {"master": [12, 3, 40, ...], ...}}
+
+Each posting list is delta-encoded: the first entry is a question id and
+every following entry is the gap to the previous id, so lists of nearby ids
+are mostly one- or two-digit numbers.
+"""
+import array
+import itertools
+import json
+import os
+import re
+import unicodedata
+
+from .compact import write_compressed
+
+INDEX_VERSION = 2
+
+_TOKEN = re.compile(r'[a-z0-9]+|[぀-ヿ㐀-䶿一-鿿豈-﫿]+')
+_LATIN = re.compile(r'[a-z0-9]')
+
+STOPWORDS = frozenset(
+    'a an and are as at be by for from in is it of on or that the this to was were which with'.split()
+)
+
+
+def tokenize(text, unigrams=False):
+    """Yield index terms for a piece of text, in order, duplicates included.
+
+    With unigrams, every kana/kanji character is yielded too, after the
+    bigrams of its run.
+    """
+    for run in _TOKEN.findall(unicodedata.normalize('NFKC', text).lower()):
+        if _LATIN.match(run):
+            if run not in STOPWORDS:
+                yield run
+        elif len(run) == 1:
+            yield run
+        else:
+            for i in range(len(run) - 1):
+                yield run[i:i + 2]
+            if unigrams:
+                yield from run
+
+
+def question_terms(question):
+    """Distinct terms of every searchable field of a question."""
+    terms = set(tokenize(question['text'], unigrams=True))
+    for option in question['options']:
+        terms.update(tokenize(option['text'], unigrams=True))
+    for explanation in question['explanations']:
+        terms.update(tokenize(explanation, unigrams=True))
+    return terms
+
+
+def delta_encode(ids):
+    previous = 0
+    encoded = []
+    for question_id in ids:
+        encoded.append(question_id - previous)
+        previous = question_id
+    return encoded
+
+
+def delta_decode(deltas):
+    return list(itertools.accumulate(deltas))
+
+
+def format_search_record(question):
+    return question['id'], sorted(question_terms(question))
+
+
+class SearchIndexWriter:
+    """Accumulate postings while the bank streams by; write them on close."""
+
+    suffix = '.search.json'
+    format = staticmethod(format_search_record)
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._postings = {}
+
+    @classmethod
+    def open(cls, path, options):
+        return cls(path)
+
+    @classmethod
+    def outputs(cls, path):
+        return [path, path + '.gz', path + '.br']
+
+    def __enter__(self):
+        return self
+
+    def write(self, question):
+        self.write_formatted(self.format(question))
+
+    def write_formatted(self, record):
+        question_id, terms = record
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = array.array('i')
+            postings.append(question_id)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            return False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        index = {
+            "version": INDEX_VERSION,
+            "count": self.count,
+            "terms": {term: delta_encode(sorted(set(self._postings[term])))
+                      for term in sorted(self._postings)}
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+        write_compressed(self.path)
+        return False
+
+
+class SearchIndex:
+    """Query API over a .search.json artifact.
+
+    Posting lists stay delta-encoded until a query first touches a term.
+    """
+
+    def __init__(self, terms):
+        self._encoded = terms
+        self._decoded = {}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"{path}: unsupported search index version {data.get('version')!r}")
+        return cls(data['terms'])
+
+    @classmethod
+    def build(cls, questions):
+        """In-memory index straight from question dicts (no artifact needed)."""
+        postings = {}
+        for question in questions:
+            for term in question_terms(question):
+                postings.setdefault(term, []).append(question['id'])
+        return cls({term: delta_encode(sorted(set(ids))) for term, ids in postings.items()})
+
+    def __len__(self):
+        return len(self._encoded)
+
+    def postings(self, term):
+        ids = self._decoded.get(term)
+        if ids is None:
+            ids = self._decoded[term] = delta_decode(self._encoded.get(term, ()))
+        return ids
+
+    def search(self, query):
+        """Sorted ids of questions containing every term of the query."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        lists = sorted((self.postings(term) for term in terms), key=len)
+        if not lists[0]:
+            return []
+        result = set(lists[0])
+        for ids in lists[1:]:
+            result.intersection_update(ids)
+            if not result:
+                return []
+        return sorted(result)
@@ -0,0 +1,164 @@
+"""Per-practice-set shards of the compact bank, plus a manifest.
+
+Practice sets are contiguous id ranges. The layout is a list of set sizes;
+the last size repeats, so the default [200] gives 1-200, 201-400, ... and
+[100, 300] gives 1-100, 101-400, 401-700, ...
+
+For cdmp_questions_en.sets.json the shards are written next to it as
+cdmp_questions_en.set-<n>.min.json (with .gz/.br siblings), and the manifest
+lists each shard's id range, question count, sizes and sha256 so a client can
+fetch only the set it needs and cache it by content.
+"""
+import bisect
+import hashlib
+import itertools
+import json
+import os
+
+from .compact import CompactWriter, format_compact
+
+DEFAULT_SET_SIZES = (200,)
+MANIFEST_VERSION = 1
+HASH_BUFFER = 1024 * 1024
+
+
+class SetLayout:
+    """Maps question ids to practice-set numbers for a list of set sizes."""
+
+    def __init__(self, set_sizes=DEFAULT_SET_SIZES):
+        if not set_sizes or any(size < 1 for size in set_sizes):
+            raise ValueError(f"set sizes must be positive: {set_sizes!r}")
+        self.set_sizes = list(set_sizes)
+        self._ends = list(itertools.accumulate(self.set_sizes))
+
+    def set_for_id(self, question_id):
+        """1-based practice set containing question_id (ids below 1 land in set 1)."""
+        offset = max(question_id, 1) - 1
+        if offset < self._ends[-1]:
+            return bisect.bisect_right(self._ends, offset) + 1
+        return len(self._ends) + (offset - self._ends[-1]) // self.set_sizes[-1] + 1
+
+    def id_range(self, set_number):
+        """(first, last) question id covered by a practice set."""
+        if set_number <= len(self._ends):
+            end = self._ends[set_number - 1]
+            return end - self.set_sizes[set_number - 1] + 1, end
+        end = self._ends[-1] + (set_number - len(self._ends)) * self.set_sizes[-1]
+        return end - self.set_sizes[-1] + 1, end
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BUFFER), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def shard_path(manifest_path, set_number):
+    base = manifest_path[:-len(PracticeSetWriter.suffix)]
+    return f'{base}.set-{set_number}{CompactWriter.suffix}'
+
+
+def format_shard_record(question):
+    return question['id'], format_compact(question)
+
+
+def read_manifest(manifest_path):
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class PracticeSetWriter:
+    """Route each question to the compact shard of its practice set.
+
+    With only_sets, shards of other sets are left untouched on disk and their
+    manifest entries are carried over; incremental builds use this so an edit
+    in one set does not change the bytes (or hashes) of the others.
+    """
+
+    suffix = '.sets.json'
+    format = staticmethod(format_shard_record)
+
+    def __init__(self, path, layout=None, only_sets=None):
+        self.path = path
+        self.layout = layout or SetLayout()
+        self.only_sets = None if only_sets is None else set(only_sets)
+        self.count = 0
+        self._shards = {}
+
+    @classmethod
+    def open(cls, path, options):
+        return cls(path, SetLayout(options.get('set_sizes', DEFAULT_SET_SIZES)), options.get('only_sets'))
+
+    @classmethod
+    def outputs(cls, path):
+        if not os.path.exists(path):
+            return [path]
+        base_dir = os.path.dirname(path)
+        paths = [path]
+        for entry in read_manifest(path)['sets']:
+            shard = os.path.join(base_dir, entry['path'])
+            paths.extend(CompactWriter.outputs(shard))
+        return paths
+
+    def __enter__(self):
+        return self
+
+    def write(self, question):
+        self.write_formatted(self.format(question))
+
+    def write_formatted(self, record):
+        question_id, text = record
+        self.count += 1
+        set_number = self.layout.set_for_id(question_id)
+        if self.only_sets is not None and set_number not in self.only_sets:
+            return
+        shard = self._shards.get(set_number)
+        if shard is None:
+            shard = self._shards[set_number] = CompactWriter(shard_path(self.path, set_number)).__enter__()
+        shard.write_formatted(text)
+
+    def __exit__(self, exc_type, exc, tb):
+        for shard in self._shards.values():
+            shard.__exit__(exc_type, exc, tb)
+        if exc_type is None:
+            self._write_manifest()
+        return False
+
+    def _write_manifest(self):
+        base_dir = os.path.dirname(self.path)
+        previous = read_manifest(self.path)['sets'] if os.path.exists(self.path) else []
+
+        entries = {}
+        if self.only_sets is not None:
+            entries.update((entry['set'], entry) for entry in previous if entry['set'] not in self.only_sets)
+        for set_number, shard in self._shards.items():
+            first, last = self.layout.id_range(set_number)
+            entries[set_number] = {
+                "set": set_number,
+                "start": first,
+                "end": last,
+                "count": shard.count,
+                "path": os.path.relpath(shard.path, base_dir or '.'),
+                "bytes": os.path.getsize(shard.path),
+                "gzipBytes": os.path.getsize(shard.path + '.gz'),
+                "sha256": file_sha256(shard.path)
+            }
+
+        # Sets that emptied out, or that belonged to an older layout, would
+        # otherwise linger next to the current shards.
+        stale = {entry['set'] for entry in previous} | set(range(1, max(entries, default=0) + 1))
+        for set_number in stale - set(entries):
+            for path in CompactWriter.outputs(shard_path(self.path, set_number)):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "setSizes": self.layout.set_sizes,
+            "count": self.count,
+            "sets": [entries[set_number] for set_number in sorted(entries)]
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,199 @@
+"""Copy source data files into public/data, checksummed and resumable.
+
+Files are copied as bytes, never decoded. Each file is mapped once. Every
+block is hashed from the mapping and then handed to the kernel with
+copy_file_range or sendfile, with a plain write as the fallback. That gives
+the SHA-256 of the copy without a second read.
+
+A copy goes to a hidden .part file next to the destination. That file is
+renamed into place only once it is complete. A small journal records which
+version of the source the .part belongs to. If the copy is interrupted, the
+next run carries on from where it stopped.
+
+A manifest in the destination directory (.cdmp_sync.json) keeps each file's
+source and destination size, mtime and hash:
+
+- a file whose source and destination stat match the manifest is skipped
+  after two stats;
+- a file with a changed stat is hashed, and skipped if the contents still
+  match;
+- anything else is copied.
+
+Files are synced concurrently on a thread pool. The hashing and the copy
+syscalls run without the GIL, so threads are enough.
+"""
+import fnmatch
+import hashlib
+import json
+import mmap
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from .shards import file_sha256
+
+COPY_BLOCK = 8 * 1024 * 1024
+MANIFEST_NAME = '.cdmp_sync.json'
+MANIFEST_VERSION = 1
+DEFAULT_PATTERNS = ('*.csv',)
+
+_unsupported = set()  # kernel copy calls that failed on this platform/filesystem
+
+
+def file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def part_path(dst):
+    head, tail = os.path.split(dst)
+    return os.path.join(head, f'.{tail}.part')
+
+
+def _copy_range(src_fd, dst_fd, view, offset, count):
+    """Append view[offset:offset+count] (== src_fd at offset) to dst_fd."""
+    end = offset + count
+    while offset < end:
+        n = 0
+        if 'copy_file_range' not in _unsupported and hasattr(os, 'copy_file_range'):
+            try:
+                n = os.copy_file_range(src_fd, dst_fd, end - offset, offset)
+            except OSError:
+                _unsupported.add('copy_file_range')
+        if not n and 'sendfile' not in _unsupported and hasattr(os, 'sendfile'):
+            try:
+                n = os.sendfile(dst_fd, src_fd, offset, end - offset)
+            except OSError:
+                _unsupported.add('sendfile')
+        if not n:
+            n = os.write(dst_fd, view[offset:end])
+        offset += n
+
+
+def _resume_offset(part, journal, stamp):
+    """Bytes of part that can be kept: only if it was started from this very source."""
+    try:
+        with open(journal, 'r', encoding='utf-8') as f:
+            started_from = json.load(f).get('source')
+        done = os.path.getsize(part)
+    except (OSError, ValueError):
+        return 0
+    return min(done, stamp[0]) if started_from == stamp else 0
+
+
+def copy_file(src, dst, block_size=COPY_BLOCK):
+    """Copy src to dst; returns (sha256 hex of the bytes copied, byte offset resumed from)."""
+    stamp = file_stamp(src)
+    if stamp is None:
+        raise FileNotFoundError(src)
+    size = stamp[0]
+    os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+    part = part_path(dst)
+    journal = part + '.json'
+
+    resumed = offset = _resume_offset(part, journal, stamp)
+    digest = hashlib.sha256()
+    if offset:
+        with open(part, 'rb') as f:
+            while f.tell() < offset:
+                digest.update(f.read(min(block_size, offset - f.tell())))
+    else:
+        with open(journal, 'w', encoding='utf-8') as f:
+            json.dump({"source": stamp}, f)
+
+    with open(src, 'rb') as source, open(part, 'r+b' if offset else 'wb') as target:
+        target.truncate(offset)
+        target.seek(offset)
+        if size:
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    while offset < size:
+                        count = min(block_size, size - offset)
+                        digest.update(view[offset:offset + count])
+                        _copy_range(source.fileno(), target.fileno(), view, offset, count)
+                        offset += count
+                finally:
+                    view.release()
+
+    if os.path.getsize(part) != size or file_stamp(src) != stamp:
+        os.remove(part)
+        os.remove(journal)
+        raise OSError(f"{src} changed while it was being copied")
+    shutil.copystat(src, part)
+    os.replace(part, dst)
+    os.remove(journal)
+    return digest.hexdigest(), resumed
+
+
+def load_manifest(dst_dir):
+    try:
+        with open(os.path.join(dst_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('files', {}) if data.get('version') == MANIFEST_VERSION else {}
+
+
+def save_manifest(dst_dir, files):
+    path = os.path.join(dst_dir, MANIFEST_NAME)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({"version": MANIFEST_VERSION, "files": files}, f, ensure_ascii=False,
+                  indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def list_files(src_dir, patterns=DEFAULT_PATTERNS):
+    """Relative paths under src_dir matching any pattern; dot files and dirs are left out."""
+    found = []
+    for root, dirs, files in os.walk(src_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for name in sorted(files):
+            if not name.startswith('.') and any(fnmatch.fnmatch(name, p) for p in patterns):
+                found.append(os.path.relpath(os.path.join(root, name), src_dir))
+    return found
+
+
+def sync_file(src, dst, entry, verify=False):
+    """Bring dst up to date with src; returns (action, new manifest entry, resumed offset)."""
+    src_stamp = file_stamp(src)
+    dst_stamp = file_stamp(dst)
+    if entry and dst_stamp and entry['source'] == src_stamp and entry['dest'] == dst_stamp:
+        return 'current', entry, 0
+
+    if dst_stamp and src_stamp and dst_stamp[0] == src_stamp[0]:
+        known = entry['sha256'] if entry and entry['dest'] == dst_stamp else None
+        src_hash = file_sha256(src)
+        if src_hash == (known or file_sha256(dst)):
+            return 'unchanged', {"source": src_stamp, "dest": dst_stamp, "sha256": src_hash}, 0
+
+    digest, resumed = copy_file(src, dst)
+    if verify and file_sha256(dst) != digest:
+        raise OSError(f"{dst} does not match {src} after copying")
+    return 'copied', {"source": file_stamp(src), "dest": file_stamp(dst), "sha256": digest}, resumed
+
+
+def sync_tree(src_dir, dst_dir, patterns=DEFAULT_PATTERNS, jobs=4, verify=False):
+    """Sync every matching file of src_dir into dst_dir; returns [(relpath, action, detail)]."""
+    os.makedirs(dst_dir, exist_ok=True)
+    manifest = load_manifest(dst_dir)
+    names = list_files(src_dir, patterns)
+
+    def run(name):
+        try:
+            return sync_file(os.path.join(src_dir, name), os.path.join(dst_dir, name),
+                             manifest.get(name), verify)
+        except OSError as e:
+            return 'failed', None, e
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for name, (action, entry, detail) in zip(names, pool.map(run, names)):
+            if entry is not None:
+                manifest[name] = entry
+            results.append((name, action, detail))
+    save_manifest(dst_dir, manifest)
+    return results
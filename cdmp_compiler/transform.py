@@ -0,0 +1,79 @@
+"""Validation and transformation of a single CSV row into a question."""
+from collections import namedtuple
+
+from .domains import DEFAULT_DOMAINS
+from .schema import CHOICE_COUNT
+
+CHOICE_COLUMNS = [f'choice_{i}' for i in range(1, CHOICE_COUNT + 1)]
+EXPLANATION_COLUMNS = [f'explanation_{i}' for i in range(1, CHOICE_COUNT + 1)]
+
+RowFields = namedtuple('RowFields', 'id correct text choices explanations domain')
+
+
+class SkipRow(Exception):
+    """Raised when a row is well-formed CSV but not a usable question.
+
+    reason names the validation rule that failed, for counting skips.
+    """
+
+    def __init__(self, message, reason='invalid'):
+        super().__init__(message)
+        self.reason = reason
+
+
+def validate_row(row):
+    """Check a CSV row and return its parsed RowFields.
+
+    Raises SkipRow for rows that fail validation and ValueError/KeyError for
+    rows whose numeric fields cannot be parsed.
+    """
+    question_id = int(row['number'])
+    correct = int(row['correct'])
+    text = row['question'].strip()
+
+    if not text or not question_id or not correct:
+        raise SkipRow('Missing required fields', 'missing_required')
+
+    if correct < 1 or correct > CHOICE_COUNT:
+        raise SkipRow(f'Invalid correct index {correct}', 'correct_out_of_range')
+
+    choices = [row.get(column, '').strip() for column in CHOICE_COLUMNS]
+    explanations = [row.get(column, '').strip() for column in EXPLANATION_COLUMNS]
+
+    if not all(choices):
+        raise SkipRow('Missing choices', 'missing_choices')
+
+    if not all(explanations):
+        raise SkipRow('Missing explanations', 'missing_explanations')
+
+    return RowFields(question_id, correct, text, choices, explanations, row.get('domain'))
+
+
+def build_question(fields, domains=DEFAULT_DOMAINS):
+    """The question dict the app expects, from validated RowFields.
+
+    The domain is replaced by its canonical name from the DomainTable.
+    """
+    question_id = fields.id
+    options = [
+        {
+            "id": question_id * 10 + i + 1,
+            "text": choice,
+            "explanation": explanation
+        }
+        for i, (choice, explanation) in enumerate(zip(fields.choices, fields.explanations))
+    ]
+
+    return {
+        "id": question_id,
+        "text": fields.text,
+        "options": options,
+        "correctIndex": fields.correct - 1,
+        "explanations": fields.explanations,
+        "domain": domains.canonical(fields.domain)
+    }
+
+
+def row_to_question(row, domains=DEFAULT_DOMAINS):
+    """Validate a CSV row and build the question dict the app expects."""
+    return build_question(validate_row(row), domains)
@@ -0,0 +1,377 @@
+"""Watch mode: rebuild a language's artifacts whenever its CSV is saved.
+
+The source directory is watched with inotify (through libc, Linux only) for
+files closed after writing, moved into place or deleted. Elsewhere, or when
+inotify is unavailable, the CSVs are polled with stat(). A burst of saves is
+debounced into one rebuild of only the languages whose CSV changed.
+
+Each rebuild runs in a hidden staging directory outside the served tree:
+under .cache/watch by default, or out_dir's parent when that directory is on
+another filesystem (os.replace cannot cross one). The language's current outputs and build cache are copied
+there first, so incremental builds, practice-set manifests and release
+history carry on as usual; the CSV is synced into it too. When the build
+succeeds, the staged files are moved into place with os.replace: data files
+and the CSV copy first, then the manifests and indexes that point at them,
+then files the build dropped are removed. A reader therefore sees either the
+old or the new version of any file, never a partial one. A failed build
+leaves the served files untouched. Staging directories are named after the
+watcher's pid; ones left by a watcher that was killed are removed when the
+next one starts.
+
+Every rebuild logs its edit-to-artifact latency: from the newest CSV mtime
+to the moment the last file was swapped in.
+"""
+import contextlib
+import ctypes
+import ctypes.util
+import io
+import json
+import os
+import select
+import shutil
+import signal
+import struct
+import sys
+import tempfile
+import time
+
+from .artifacts import ARTIFACTS, artifact_path
+from .bilingual import (BUNDLE_FILENAME, REPORT_FILENAME, describe as describe_bundle, remove_served_sources,
+                        source_path, write_bundle)
+from .compiler import compile_languages
+from .hotcold import cold_paths
+from .incremental import cache_path
+from .schema import csv_filename
+from .sync import MANIFEST_NAME, sync_tree
+
+DEFAULT_DEBOUNCE = 0.3
+DEFAULT_POLL_INTERVAL = 0.5
+STAGING_PREFIX = '.cdmp-watch-'
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Names of watched files in a directory that were written, moved or deleted."""
+
+    kind = 'inotify'
+
+    def __init__(self, directory, names):
+        self.names = set(names)
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f'cannot watch {directory}')
+
+    def wait(self, timeout=None):
+        """Changed names, or an empty set if nothing changed within timeout seconds."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        data = os.read(self._fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if name in self.names:
+                changed.add(name)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """The same interface on stat(): a file changed when its size or mtime did."""
+
+    kind = 'polling'
+
+    def __init__(self, directory, names, interval=DEFAULT_POLL_INTERVAL):
+        self.directory = directory
+        self.names = set(names)
+        self.interval = interval
+        self._stamps = self._stat()
+
+    def _stat(self):
+        stamps = {}
+        for name in self.names:
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                stamps[name] = None
+            else:
+                stamps[name] = (st.st_size, st.st_mtime_ns)
+        return stamps
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            stamps = self._stat()
+            changed = {name for name in self.names if stamps[name] != self._stamps[name]}
+            self._stamps = stamps
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            pause = self.interval if deadline is None else min(self.interval, max(0, deadline - time.monotonic()))
+            time.sleep(pause)
+
+    def close(self):
+        pass
+
+
+def open_watcher(directory, names, polling=False, interval=DEFAULT_POLL_INTERVAL):
+    """InotifyWatcher where the platform has it, PollingWatcher otherwise."""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory, names)
+        except (OSError, AttributeError, TypeError):
+            pass  # no inotify here (or no watches left): fall back to polling
+    return PollingWatcher(directory, names, interval)
+
+
+def language_outputs(out_dir, language, artifacts):
+    """Relative paths of the existing files a build of `language` owns (with its build cache)."""
+    paths = [cache_path(out_dir, language)]
+    for name in artifacts:
+        paths.extend(ARTIFACTS[name].outputs(artifact_path(out_dir, language, name)))
+    return [os.path.relpath(path, out_dir) for path in dict.fromkeys(paths) if os.path.exists(path)]
+
+
+def _copy_in(out_dir, staging, relpaths):
+    for relpath in relpaths:
+        target = os.path.join(staging, relpath)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(os.path.join(out_dir, relpath), target)
+
+
+def _staged_files(staging):
+    for root, _, names in os.walk(staging):
+        for name in names:
+            yield os.path.relpath(os.path.join(root, name), staging)
+
+
+def manifest_paths(out_dir, languages, all_languages, artifacts):
+    """Relative paths of files that point at other outputs, in the order they are safe to swap in."""
+    paths = []
+    for language in languages:
+        for name in artifacts:
+            path = artifact_path(out_dir, language, name)
+            if name == 'hot':
+                paths.append(cold_paths(path)[1])  # the index points into the blocks; the hot file at the index
+            paths.append(path)
+    paths = [os.path.relpath(path, out_dir) for path in paths]
+    if len(all_languages) > 1:
+        paths.extend([BUNDLE_FILENAME, REPORT_FILENAME])
+    return paths
+
+
+def staging_parent(out_dir, preferred=None):
+    """Where staging directories for out_dir go: preferred if it shares out_dir's filesystem, else out_dir's parent."""
+    if preferred:
+        os.makedirs(preferred, exist_ok=True)
+        if os.stat(preferred).st_dev == os.stat(out_dir).st_dev:
+            return preferred
+    return os.path.dirname(os.path.abspath(out_dir))
+
+
+def _running(pid):
+    if os.name != 'posix':
+        return True  # no harmless liveness probe here: leave the directory alone
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def remove_stale_staging(directory):
+    """Remove staging directories in directory left by watchers that are no longer running."""
+    removed = 0
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return 0
+    for name in names:
+        if not name.startswith(STAGING_PREFIX):
+            continue
+        pid = name[len(STAGING_PREFIX):].split('-', 1)[0]
+        if pid.isdigit() and _running(int(pid)):
+            continue
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+        removed += 1
+    return removed
+
+
+def swap_in(staging, out_dir, manifests, dropped):
+    """Move every staged file into out_dir, manifests last and in order, then remove dropped files."""
+    order = {relpath: k for k, relpath in enumerate(manifests)}
+    staged = sorted(_staged_files(staging), key=lambda relpath: order.get(relpath, -1))
+    for relpath in staged:
+        target = os.path.join(out_dir, relpath)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(os.path.join(staging, relpath), target)
+    for relpath in dropped:
+        path = os.path.join(out_dir, relpath)
+        if os.path.exists(path):
+            os.remove(path)
+    return len(staged)
+
+
+def rebuild(src_dir, out_dir, languages, all_languages, artifacts, options, bilingual=True, sync=False,
+            staging_dir=None):
+    """Build `languages` in a staging directory and swap the results into out_dir.
+
+    With sync, the languages' CSVs are also copied into out_dir, in the same
+    swap. Returns {language: question count}; nothing is swapped unless every
+    language built.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f'{STAGING_PREFIX}{os.getpid()}-', dir=staging_parent(out_dir, staging_dir))
+    try:
+        before = set()
+        for language in languages:
+            relpaths = language_outputs(out_dir, language, artifacts)
+            _copy_in(out_dir, staging, relpaths)
+            before.update(relpaths)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            counts = compile_languages(src_dir, staging, languages, artifacts, options, incremental=True)
+        if not all(counts.values()):
+            print(output.getvalue(), end='')
+            return counts
+        if sync:
+            # Start from the served copies and sync manifest, so unchanged CSVs are recognised and skipped.
+            names = [csv_filename(language) for language in languages]
+            _copy_in(out_dir, staging, [relpath for relpath in names + [MANIFEST_NAME]
+                                        if os.path.exists(os.path.join(out_dir, relpath))])
+            for name, action, detail in sync_tree(src_dir, staging, names):
+                if action == 'failed':
+                    print(f"Could not copy {name}: {detail}; keeping the previous copy")
+                    if os.path.exists(os.path.join(out_dir, name)):
+                        _copy_in(out_dir, staging, [name])
+        if bilingual and len(all_languages) > 1:
+            # The CLI keeps every language's sources in options['bilingual_dir']; without it, rebuilt
+            # languages have theirs in staging and the others in out_dir.
+            directory = options.get('bilingual_dir')
+            sources = {language: source_path(directory or (staging if language in languages else out_dir), language)
+                       for language in all_languages}
+            if all(os.path.exists(path) for path in sources.values()):
+                report = write_bundle(staging, sources, explanations='hot' not in artifacts, previous_dir=out_dir)
+                for line in describe_bundle(report) if report else []:
+                    print(line)
+        swap_in(staging, out_dir, manifest_paths(out_dir, languages, all_languages, artifacts),
+                before - set(_staged_files(staging)))
+        return counts
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def log_rebuild(log_path, entry):
+    """Append one rebuild record to a JSON Lines log."""
+    directory = os.path.dirname(log_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(log_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def newest_mtime(src_dir, names):
+    mtimes = []
+    for name in names:
+        try:
+            mtimes.append(os.stat(os.path.join(src_dir, name)).st_mtime)
+        except OSError:
+            pass
+    return max(mtimes, default=None)
+
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt
+
+
+def watch(src_dir, out_dir, languages, artifacts, options, debounce=DEFAULT_DEBOUNCE,
+          polling=False, interval=DEFAULT_POLL_INTERVAL, log_path=None, bilingual=True, sync=True, staging_dir=None):
+    """Rebuild on every debounced burst of CSV saves until interrupted."""
+    names = {csv_filename(language): language for language in languages}
+    watcher = open_watcher(src_dir, names, polling, interval)
+    copy_sources = sync and os.path.abspath(src_dir) != os.path.abspath(out_dir)
+    print(f"Watching {src_dir} ({watcher.kind}) for {', '.join(sorted(names))}; writing to {out_dir}")
+    requested, staging_dir = staging_dir, staging_parent(out_dir, staging_dir)
+    if requested and staging_dir != requested:
+        print(f"{requested} is not on the filesystem of {out_dir}; staging rebuilds in {staging_dir}")
+    # Earlier versions staged inside out_dir and then in its parent; clear leftovers of killed watchers there too.
+    removed = sum(remove_stale_staging(directory) for directory in
+                  {staging_dir, os.path.abspath(out_dir), os.path.dirname(os.path.abspath(out_dir))})
+    if removed:
+        print(f"Removed {removed} staging director{'y' if removed == 1 else 'ies'} left by an earlier watcher")
+    if options.get('bilingual_dir') and remove_served_sources(out_dir, languages):
+        print(f"Removed join sources left in {out_dir}; they are kept in {options['bilingual_dir']}")
+
+    def run(changed, noticed, initial=False):
+        changed_languages = [language for language in languages if csv_filename(language) in changed]
+        present = [language for language in changed_languages
+                   if os.path.exists(os.path.join(src_dir, csv_filename(language)))]
+        for language in changed_languages:
+            if language not in present:
+                print(f"{csv_filename(language)} was removed; keeping the last build")
+        if not present:
+            return
+        edited = None if initial else newest_mtime(src_dir, [csv_filename(language) for language in present])
+        started = time.time()
+        counts = rebuild(src_dir, out_dir, present, languages, artifacts, options, bilingual, copy_sources,
+                         staging_dir)
+        finished = time.time()
+        built = all(counts.values())
+        entry = {
+            "at": time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime(finished)),
+            "languages": present,
+            "counts": counts,
+            "swapped": built,
+            "watcher": watcher.kind,
+            "debounceMs": round((started - noticed) * 1000, 1),
+            "buildMs": round((finished - started) * 1000, 1),
+            "latencyMs": round((finished - edited) * 1000, 1) if edited is not None else None
+        }
+        summary = ', '.join(f"{language} {count}" for language, count in counts.items())
+        if built:
+            latency = f"; edit-to-artifact {entry['latencyMs']:,.0f} ms" if edited is not None else ''
+            print(f"Rebuilt {summary} questions in {entry['buildMs']:,.0f} ms{latency}")
+        else:
+            print(f"Build failed ({summary}); still serving the previous artifacts")
+        if log_path:
+            log_rebuild(log_path, entry)
+
+    # Stop the same way on Ctrl-C and on a service manager's SIGTERM, so staging is cleaned up.
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        run(set(names), time.time(), initial=True)  # bring the outputs up to date before waiting
+        while True:
+            changed = watcher.wait()
+            noticed = time.time()
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            run(changed, noticed)
+    except KeyboardInterrupt:
+        print("Stopped watching")
+    finally:
+        watcher.close()
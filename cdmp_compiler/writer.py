@@ -0,0 +1,83 @@
+"""Incremental writers for the JSON artifacts."""
+import json
+import os
+
+
+def format_question(question):
+    """Serialize one question the way it appears inside the questions list."""
+    # json.dumps escapes newlines inside strings, so every '\n' here is a
+    # structural line break that needs the list's indentation.
+    return '    ' + json.dumps(question, ensure_ascii=False, indent=2).replace('\n', '\n    ')
+
+
+class ListWriter:
+    """Stream a JSON list of records between a fixed opening and closing.
+
+    Subclasses describe the framing and provide format(question), a pure
+    function that can run in a worker process; write_formatted() appends its
+    result. Only one record is held in memory at a time.
+    """
+
+    suffix = ''
+    opening = '['
+    lead = ''
+    separator = ','
+    closing = ']'
+    empty_closing = ']'
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = None
+
+    @classmethod
+    def open(cls, path, options):
+        """Build the writer for `path`; options are the build's artifact options."""
+        return cls(path)
+
+    @classmethod
+    def outputs(cls, path):
+        """Files a finished write to `path` leaves behind."""
+        return [path]
+
+    @staticmethod
+    def format(question):
+        raise NotImplementedError
+
+    def __enter__(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._file.write(self.opening)
+        return self
+
+    def write(self, question):
+        self.write_formatted(self.format(question))
+
+    def write_formatted(self, text):
+        """Append a record already serialized with format()."""
+        self._file.write((self.separator if self.count else self.lead) + text)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.write(self.closing if self.count else self.empty_closing)
+        self._file.close()
+        self._file = None
+        return False
+
+
+class QuestionsWriter(ListWriter):
+    """The app's {"questions": [...]} document.
+
+    The output is byte-for-byte what json.dump(..., indent=2,
+    ensure_ascii=False) produces for the whole list.
+    """
+
+    suffix = '.json'
+    opening = '{\n  "questions": ['
+    lead = '\n'
+    separator = ',\n'
+    closing = '\n  ]\n}'
+    empty_closing = ']\n}'
+    format = staticmethod(format_question)
@@ -1,52 +1,13 @@
 #!/usr/bin/env python3
 import json
-import csv
 import os
 
+from cdmp_compiler import row_to_question
+
 def parse_csv_row(row):
     """Parse a single CSV row into question format"""
     try:
-        question_id = int(row['number'])
-        correct_index = int(row['correct']) - 1  # Convert from 1-based to 0-based
-        
-        # Extract choices and explanations
-        choices = [
-            row['choice_1'],
-            row['choice_2'], 
-            row['choice_3'],
-            row['choice_4'],
-            row['choice_5']
-        ]
-        
-        explanations = [
-            row['explanation_1'],
-            row['explanation_2'],
-            row['explanation_3'],
-            row['explanation_4'],
-            row['explanation_5']
-        ]
-        
-        # Create options array
-        options = []
-        for i, (choice, explanation) in enumerate(zip(choices, explanations)):
-            options.append({
-                "id": question_id * 10 + i + 1,
-                "text": choice.strip(),
-                "explanation": explanation.strip()
-            })
-        
-        # Create question object
-        question = {
-            "id": question_id,
-            "text": row['question'].strip(),
-            "options": options,
-            "correctIndex": correct_index,
-            "explanations": [exp.strip() for exp in explanations],
-            "domain": row['domain'].strip() if row['domain'] else "Unknown"
-        }
-        
-        return question
-        
+        return row_to_question(row)
     except Exception as e:
         print(f"Error parsing question {row.get('number', 'unknown')}: {e}")
         return None
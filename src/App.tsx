@@ -8,11 +8,11 @@ import MyPage from './pages/MyPage';
 import Auth from './components/Auth';
 import { useQuizStore } from './store/quizStore';
 import { useAuthStore } from './store/authStore';
-import { loadQuestions } from './utils/questionLoader';
+import { loadPracticeSets, loadQuestions, prefetchExplanations } from './utils/questionLoader';
 import { supabase } from './lib/supabase';
 
 function App() {
-  const { setAllQuestions, language } = useQuizStore();
+  const { setAllQuestions, setPracticeSets, language } = useQuizStore();
   const { user, loading, setUser, setLoading } = useAuthStore();
 
   useEffect(() => {
@@ -41,16 +41,35 @@ function App() {
   }, [setUser, setLoading]);
 
   useEffect(() => {
+    let cancelled = false;
     const initializeQuestions = async () => {
       console.log(`Loading all questions in ${language}...`);
+      // 演習セットの区切りはビルドのマニフェストから（無い古いビルドでは既定の区切り）
+      loadPracticeSets(language).then(sets => {
+        if (!cancelled) setPracticeSets(sets ?? []);
+      });
       // 全ての問題を読み込み（演習セット別のフィルタリングは後で行う）
-      const questions = await loadQuestions(language);
+      // 受信途中でも演習セット単位で読み終えた問題から使えるようにする
+      const questions = await loadQuestions(language, undefined, partial => {
+        if (!cancelled) setAllQuestions(partial);
+      });
       console.log('Loaded all questions:', questions.length);
+      if (cancelled) return;
       setAllQuestions(questions);
+
+      // 解説が別ファイル（cold ブロック）の場合は、表示後にバックグラウンドで取得して補う
+      const explained = await prefetchExplanations(language, questions);
+      if (explained && !cancelled) {
+        console.log('Loaded explanations in the background');
+        setAllQuestions(explained);
+      }
     };
     
     initializeQuestions();
-  }, [setAllQuestions, language]);
+    return () => {
+      cancelled = true;
+    };
+  }, [setAllQuestions, setPracticeSets, language]);
 
   if (loading) {
     return (
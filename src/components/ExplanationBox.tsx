@@ -1,13 +1,16 @@
 import React from 'react';
 import { useQuizStore } from '../store/quizStore';
+import { useExplanations } from '../hooks/useExplanations';
+import { explanationsMissing } from '../utils/questionLoader';
 import type { Question } from '../types';
 
 interface ExplanationBoxProps {
   question: Question;
 }
 
-const ExplanationBox: React.FC<ExplanationBoxProps> = ({ question }) => {
+const ExplanationBox: React.FC<ExplanationBoxProps> = (props) => {
   const { showExplanation, selectedAnswer } = useQuizStore();
+  const question = useExplanations(props.question) ?? props.question;
 
   if (!showExplanation || selectedAnswer === null) {
     return null;
@@ -30,6 +33,9 @@ const ExplanationBox: React.FC<ExplanationBoxProps> = ({ question }) => {
       
       <div className="bg-gray-50 p-4 rounded-lg">
         <h3 className="font-bold text-gray-800 mb-3">解説</h3>
+        {explanationsMissing(question) && (
+          <p className="text-sm text-gray-500 mb-3">解説を読み込み中...</p>
+        )}
         <div className="space-y-3">
           {question.options.map((option, index) => {
             const isCorrectOption = index === question.correctIndex;
@@ -0,0 +1,61 @@
+import React from 'react';
+import { useExplanations } from '../hooks/useExplanations';
+import { explanationsMissing } from '../utils/questionLoader';
+import type { Question } from '../types';
+
+interface IncorrectQuestionCardProps {
+  question: Question;
+}
+
+// マイページの「間違えた問題」の1問。解説が cold ブロックにあれば、この問題の分だけ取得する
+const IncorrectQuestionCard: React.FC<IncorrectQuestionCardProps> = (props) => {
+  const question = useExplanations(props.question) ?? props.question;
+
+  return (
+    <div className="border rounded-lg p-4">
+      <div className="flex justify-between items-start mb-3">
+        <h3 className="font-medium text-gray-900">
+          問題 {question.id}
+        </h3>
+        {question.domain && (
+          <span className="px-2 py-1 bg-blue-100 text-blue-800 text-xs rounded">
+            {question.domain}
+          </span>
+        )}
+      </div>
+      <p className="text-gray-700 mb-4">{question.text}</p>
+      <div className="space-y-2">
+        {question.options.map((option, index) => (
+          <div
+            key={index}
+            className={`p-2 rounded text-sm ${
+              index === question.correctIndex
+                ? 'bg-green-100 text-green-800 font-medium'
+                : 'bg-gray-50 text-gray-700'
+            }`}
+          >
+            <span className="mr-2">
+              {String.fromCharCode(65 + index)}.
+            </span>
+            {option.text}
+            {index === question.correctIndex && (
+              <span className="ml-2 text-green-600">✓ 正解</span>
+            )}
+          </div>
+        ))}
+      </div>
+      {explanationsMissing(question) && (
+        <p className="mt-4 text-sm text-gray-500">解説を読み込み中...</p>
+      )}
+      {!explanationsMissing(question) && question.explanations[question.correctIndex] && (
+        <div className="mt-4 p-3 bg-blue-50 rounded">
+          <p className="text-sm text-blue-800">
+            <strong>解説:</strong> {question.explanations[question.correctIndex]}
+          </p>
+        </div>
+      )}
+    </div>
+  );
+};
+
+export default IncorrectQuestionCard;
@@ -1,13 +1,22 @@
 import React from 'react';
 import { useQuizStore } from '../store/quizStore';
+import { fallbackPracticeSets } from '../utils/questionLoader';
 
 interface PracticeSetSelectorProps {
   onSetSelect: (set: number) => void;
   onSetDoubleClick: (set: number, setInfo: { name: string; range: string }) => void;
 }
 
+// 既定の区切り（--set-size 200）の各セットの説明。区切りを変えたビルドでは表示しない
+const SET_DESCRIPTIONS: Record<string, string> = {
+  '1-200': 'データ管理基礎',
+  '201-400': 'データアーキテクチャ',
+  '401-600': 'データストレージと運用',
+  '601-800': 'データセキュリティと品質'
+};
+
 const PracticeSetSelector: React.FC<PracticeSetSelectorProps> = ({ onSetSelect, onSetDoubleClick }) => {
-  const { practiceSet, setPracticeSet } = useQuizStore();
+  const { practiceSet, setPracticeSet, practiceSets, allQuestions } = useQuizStore();
 
   const handleSingleClick = (set: number) => {
     // 即座に選択状態を更新
@@ -20,12 +29,15 @@ const PracticeSetSelector: React.FC<PracticeSetSelectorProps> = ({ onSetSelect,
     onSetDoubleClick(set, setInfo);
   };
 
-  const practiceSetOptions = [
-    { id: 1, name: '演習1', range: '問題 1-200', description: 'データ管理基礎' },
-    { id: 2, name: '演習2', range: '問題 201-400', description: 'データアーキテクチャ' },
-    { id: 3, name: '演習3', range: '問題 401-600', description: 'データストレージと運用' },
-    { id: 4, name: '演習4', range: '問題 601-799', description: 'データセキュリティと品質' }
-  ];
+  // 演習セットはビルドのマニフェスト（cdmp_questions_<lang>.sets.json）から。最後のセットは実際の最終問題まで表示する
+  const sets = practiceSets.length ? practiceSets : fallbackPracticeSets(allQuestions);
+  const lastId = allQuestions.reduce((max, q) => Math.max(max, q.id), 0);
+  const practiceSetOptions = sets.map(entry => ({
+    id: entry.set,
+    name: `演習${entry.set}`,
+    range: `問題 ${entry.start}-${lastId ? Math.min(entry.end, lastId) : entry.end}`,
+    description: SET_DESCRIPTIONS[`${entry.start}-${entry.end}`] ?? ''
+  }));
 
   return (
     <div className="space-y-4">
@@ -51,7 +63,9 @@ const PracticeSetSelector: React.FC<PracticeSetSelectorProps> = ({ onSetSelect,
               <div>
                 <h4 className="font-semibold text-gray-900">{option.name}</h4>
                 <p className="text-sm text-gray-600 mt-1">{option.range}</p>
-                <p className="text-sm text-gray-500 mt-1">{option.description}</p>
+                {option.description && (
+                  <p className="text-sm text-gray-500 mt-1">{option.description}</p>
+                )}
                 {practiceSet === option.id && (
                   <p className="text-xs text-blue-600 mt-2 font-medium">
                     ダブルクリックで開始 →
@@ -1,5 +1,7 @@
 import React, { useState } from 'react';
 import type { Question } from '../types';
+import { useExplanations } from '../hooks/useExplanations';
+import { explanationsMissing } from '../utils/questionLoader';
 
 interface TestExplanationsProps {
   testQuestions: Question[];
@@ -43,7 +45,7 @@ const TestExplanations: React.FC<TestExplanationsProps> = ({
   };
 
   const filteredQuestions = getFilteredQuestions();
-  const currentQuestion = filteredQuestions[currentQuestionIndex];
+  const currentQuestion = useExplanations(filteredQuestions[currentQuestionIndex]);
   const currentQuestionIndexInOriginal = testQuestions.findIndex(q => q.id === currentQuestion?.id);
   const selectedAnswer = selectedAnswers[currentQuestionIndexInOriginal];
   const status = getQuestionStatus(currentQuestion?.id || 0);
@@ -242,7 +244,9 @@ const TestExplanations: React.FC<TestExplanationsProps> = ({
             <h3 className="text-lg font-semibold text-gray-900 mb-4">解説</h3>
             <div className="bg-blue-50 p-6 rounded-lg">
               <p className="text-gray-800 leading-relaxed">
-                {currentQuestion.explanations[currentQuestion.correctIndex]}
+                {explanationsMissing(currentQuestion)
+                  ? '解説を読み込み中...'
+                  : currentQuestion.explanations[currentQuestion.correctIndex]}
               </p>
             </div>
           </div>
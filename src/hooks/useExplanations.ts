@@ -0,0 +1,32 @@
+import { useEffect, useState } from 'react';
+import { useQuizStore } from '../store/quizStore';
+import { explanationsMissing, loadExplanations, withExplanations } from '../utils/questionLoader';
+import type { Question } from '../types';
+
+// 解説が cold ブロックにある問題（explanationsMissing）は、表示するときに解説を取得して補う
+export function useExplanations(question: Question | undefined): Question | undefined {
+  const language = useQuizStore(state => state.language);
+  const [loaded, setLoaded] = useState<{ id: number; explanations: string[] } | null>(null);
+  const missing = !!question && explanationsMissing(question);
+  const questionId = question?.id;
+
+  useEffect(() => {
+    if (!missing || questionId === undefined) {
+      return;
+    }
+    let cancelled = false;
+    loadExplanations(language, questionId).then(explanations => {
+      if (!cancelled && explanations) {
+        setLoaded({ id: questionId, explanations });
+      }
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [missing, questionId, language]);
+
+  if (!question || !missing || !loaded || loaded.id !== question.id) {
+    return question;
+  }
+  return withExplanations(question, loaded.explanations);
+}
@@ -87,7 +87,7 @@ const Home: React.FC = () => {
                 </div>
                 <h3 className="text-xl font-semibold text-gray-900 mb-2">演習モード</h3>
                 <p className="text-gray-600">
-                  799問から200問ずつを選んで練習します。
+                  {allQuestions.length ? `${allQuestions.length}問を` : '問題を'}演習セットに分けて練習します。
                   各問題で即座に解説を確認できます。
                 </p>
               </div>
@@ -3,6 +3,7 @@ import { useAuthStore } from '../store/authStore';
 import { useQuizStore } from '../store/quizStore';
 import { supabase } from '../lib/supabase';
 import TestExplanations from '../components/TestExplanations';
+import IncorrectQuestionCard from '../components/IncorrectQuestionCard';
 
 interface TestResult {
   id: string;
@@ -59,17 +60,31 @@ const MyPage: React.FC = () => {
         setTestResults(testData || []);
       }
 
-      // 間違えた問題を取得
-      const { data: answerData, error: answerError } = await supabase
+      // 間違えた問題を取得（夜間バッチで作成したプロフィール＋それ以降の解答ログ）
+      const { data: profileData } = await supabase
+        .from('user_profiles')
+        .select('profile')
+        .eq('user_id', user.id)
+        .maybeSingle();
+      const profile = profileData?.profile as { missed?: number[]; lastAnsweredAt?: string } | undefined;
+
+      let answerQuery = supabase
         .from('answer_logs')
         .select('question_id')
         .eq('user_id', user.id)
         .eq('is_correct', false);
+      if (profile?.lastAnsweredAt) {
+        answerQuery = answerQuery.gt('answered_at', profile.lastAnsweredAt);
+      }
+      const { data: answerData, error: answerError } = await answerQuery;
 
       if (answerError) {
         console.error('Error fetching answer logs:', answerError);
       } else {
-        const incorrectIds = [...new Set(answerData?.map(log => log.question_id) || [])];
+        const incorrectIds = [...new Set([
+          ...(profile?.missed || []),
+          ...(answerData?.map(log => log.question_id) || [])
+        ])];
         setIncorrectQuestions(incorrectIds);
       }
     } catch (error) {
@@ -258,46 +273,7 @@ const MyPage: React.FC = () => {
                 ) : (
                   <div className="space-y-4">
                     {getIncorrectQuestionsData().map((question) => (
-                      <div key={question.id} className="border rounded-lg p-4">
-                        <div className="flex justify-between items-start mb-3">
-                          <h3 className="font-medium text-gray-900">
-                            問題 {question.id}
-                          </h3>
-                          {question.domain && (
-                            <span className="px-2 py-1 bg-blue-100 text-blue-800 text-xs rounded">
-                              {question.domain}
-                            </span>
-                          )}
-                        </div>
-                        <p className="text-gray-700 mb-4">{question.text}</p>
-                        <div className="space-y-2">
-                          {question.options.map((option, index) => (
-                            <div
-                              key={index}
-                              className={`p-2 rounded text-sm ${
-                                index === question.correctIndex
-                                  ? 'bg-green-100 text-green-800 font-medium'
-                                  : 'bg-gray-50 text-gray-700'
-                              }`}
-                            >
-                              <span className="mr-2">
-                                {String.fromCharCode(65 + index)}.
-                              </span>
-                              {option.text}
-                              {index === question.correctIndex && (
-                                <span className="ml-2 text-green-600">✓ 正解</span>
-                              )}
-                            </div>
-                          ))}
-                        </div>
-                        {question.explanations && question.explanations[question.correctIndex] && (
-                          <div className="mt-4 p-3 bg-blue-50 rounded">
-                            <p className="text-sm text-blue-800">
-                              <strong>解説:</strong> {question.explanations[question.correctIndex]}
-                            </p>
-                          </div>
-                        )}
-                      </div>
+                      <IncorrectQuestionCard key={question.id} question={question} />
                     ))}
                   </div>
                 )}
@@ -2,7 +2,8 @@ import React, { useState, useEffect } from 'react';
 import { useQuizStore } from '../store/quizStore';
 import { useAuthStore } from '../store/authStore';
 import { supabase } from '../lib/supabase';
-import { shuffleQuestionsAndOptions } from '../utils/shuffleUtils';
+import { permuteQuestionOptions, shuffleQuestionsAndOptions } from '../utils/shuffleUtils';
+import { explanationsMissing, withExplanations } from '../utils/questionLoader';
 import ConfirmDialog from '../components/ConfirmDialog';
 import TestSidebar from '../components/TestSidebar';
 import ESLTimeExtensionDialog from '../components/ESLTimeExtensionDialog';
@@ -60,6 +61,27 @@ const Test: React.FC = () => {
     return () => clearInterval(interval);
   }, [isTestActive, timeLeft]);
 
+  // 出題中の問題はコピーなので、バックグラウンドで取得した解説が allQuestions に届いたら反映する
+  useEffect(() => {
+    setTestQuestions(current => {
+      if (!current.some(explanationsMissing)) {
+        return current;
+      }
+      const byId = new Map(allQuestions.map(q => [q.id, q]));
+      let changed = false;
+      const updated = current.map(question => {
+        const source = byId.get(question.id);
+        if (!explanationsMissing(question) || !source || explanationsMissing(source)) {
+          return question;
+        }
+        changed = true;
+        // source は CSV の選択肢の順。withExplanations が option.id で出題時の並びに合わせる
+        return withExplanations(question, source.explanations);
+      });
+      return changed ? updated : current;
+    });
+  }, [allQuestions]);
+
   // ナビゲーションからのテスト完了イベントを監視
   useEffect(() => {
     const handleFinishTestEvent = () => {
@@ -116,21 +138,36 @@ const Test: React.FC = () => {
     waitForDataAndStartTest(NORMAL_TIME_SECONDS);
   };
 
-  const startTestWithTime = (timeInSeconds: number) => {
-    // 問題をシャッフルして選択
-    const shuffledQuestions = shuffleQuestionsAndOptions(allQuestions);
-    
-    // 問題数が足りない場合は繰り返し
-    let selectedQuestions: typeof allQuestions = [];
-    if (shuffledQuestions.length === 0) {
+  // python3 -m cdmp_compiler exams で事前生成した出題フォーム（ドメイン配分済み・重複なし）を1つ選ぶ。
+  // 一覧（フォーム数と置き場所）を読んでから、使うフォームのファイルだけを取得する
+  const loadExamForm = async (): Promise<typeof allQuestions | null> => {
+    try {
+      const response = await fetch(`/data/cdmp_exams_${language}.json`);
+      if (!response.ok) return null;
+      const manifest: { count: number; firstSeed: number; dir: string } = await response.json();
+      if (!manifest.count || !manifest.dir) return null;
+      const seed = manifest.firstSeed + Math.floor(Math.random() * manifest.count);
+      const formResponse = await fetch(`/data/${manifest.dir}/${seed}.json`);
+      if (!formResponse.ok) return null;
+      const form: { q: number[]; p: number[] } = await formResponse.json();
+      const byId = new Map(allQuestions.map(q => [q.id, q]));
+      const questions = form.q.map((id, i) => byId.has(id) ? permuteQuestionOptions(byId.get(id)!, form.p[i]) : null);
+      return questions.every(q => q !== null) ? questions as typeof allQuestions : null;
+    } catch (error) {
+      console.error('Error loading exam forms:', error);
+      return null;
+    }
+  };
+
+  const startTestWithTime = async (timeInSeconds: number) => {
+    if (allQuestions.length === 0) {
       alert('問題がありません。');
       return;
     }
-    
-    for (let i = 0; i < TEST_QUESTION_COUNT; i++) {
-      const questionIndex = i % shuffledQuestions.length;
-      selectedQuestions.push(shuffledQuestions[questionIndex]);
-    }
+
+    // フォームが無い場合は問題をシャッフルして選択（重複なし）
+    const selectedQuestions = await loadExamForm()
+      ?? shuffleQuestionsAndOptions(allQuestions).slice(0, TEST_QUESTION_COUNT);
     
     setTestQuestions(selectedQuestions);
     setSelectedAnswers(new Array(selectedQuestions.length).fill(null));
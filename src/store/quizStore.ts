@@ -1,6 +1,8 @@
 import { create } from 'zustand';
 import { persist } from 'zustand/middleware';
 import type { Question, FilterOption, DomainFilterOption } from '../types';
+import { fallbackPracticeSets, questionsInSet } from '../utils/questionLoader';
+import type { PracticeSet } from '../utils/questionLoader';
 
 interface PracticeProgress {
   questions: Question[];
@@ -23,7 +25,8 @@ interface QuizStore {
   isPracticeActive: boolean; // 演習モードが進行中か
   isTestActive: boolean; // テストモードが進行中か
   language: 'en' | 'ja'; // 言語設定
-  practiceSet: number; // 演習セット (1-4)
+  practiceSet: number; // 演習セット番号（sets.json の set）
+  practiceSets: PracticeSet[]; // 演習セットの区切り（sets.json から。空なら既定の区切り）
   currentQuestionNumber: number; // 現在の問題番号（言語切り替え時に維持）
   
   setQuestions: (questions: Question[]) => void;
@@ -44,6 +47,7 @@ interface QuizStore {
   setIsTestActive: (active: boolean) => void;
   setLanguage: (language: 'en' | 'ja') => void;
   setPracticeSet: (set: number) => void;
+  setPracticeSets: (sets: PracticeSet[]) => void;
 }
 
 export const useQuizStore = create<QuizStore>()(
@@ -63,6 +67,7 @@ export const useQuizStore = create<QuizStore>()(
       isTestActive: false,
       language: 'en',
       practiceSet: 1,
+      practiceSets: [],
       currentQuestionNumber: 1,
       
       setQuestions: (questions) => set({ questions }),
@@ -116,18 +121,10 @@ export const useQuizStore = create<QuizStore>()(
           return { questions: [] };
         }
         
-        // 演習セットに応じて問題をフィルタリング
-        let filteredQuestions = state.allQuestions;
-        if (state.practiceSet >= 1 && state.practiceSet <= 4) {
-          const startNum = (state.practiceSet - 1) * 200 + 1;
-          const endNum = Math.min(state.practiceSet * 200, 799);
-          console.log(`Filtering for practice set ${state.practiceSet}: ${startNum}-${endNum}`);
-          
-          filteredQuestions = state.allQuestions.filter(q => 
-            q.id >= startNum && q.id <= endNum
-          );
-          console.log(`Filtered to practice set ${state.practiceSet}: ${filteredQuestions.length} questions`);
-        }
+        // 演習セットに応じて問題をフィルタリング（ID の範囲はビルドのマニフェストから）
+        const sets = state.practiceSets.length ? state.practiceSets : fallbackPracticeSets(state.allQuestions);
+        const filteredQuestions = questionsInSet(state.allQuestions, sets, state.practiceSet);
+        console.log(`Filtered to practice set ${state.practiceSet}: ${filteredQuestions.length} questions`);
         
         if (filteredQuestions.length === 0) {
           console.error('No questions found for practice set:', state.practiceSet);
@@ -199,7 +196,9 @@ export const useQuizStore = create<QuizStore>()(
         // currentQuestionNumberは維持して言語切り替え時に同じ問題を表示
       })),
       
-      setPracticeSet: (practiceSetNumber) => set({ practiceSet: practiceSetNumber })
+      setPracticeSet: (practiceSetNumber) => set({ practiceSet: practiceSetNumber }),
+
+      setPracticeSets: (practiceSets) => set({ practiceSets })
     }),
     {
       name: 'quiz-storage',
@@ -15,71 +15,505 @@ interface BackupQuestion {
   domain: string;
 }
 
+// 言語共通のバンドル（cdmp_questions.bilingual.json）: ID・正解・領域は1回だけ保持
+interface BilingualBundle {
+  v: number;
+  languages: string[];
+  ids: number[];
+  a: number[];
+  d: number[];
+  domains: Record<string, string>;
+  text: Record<string, { file: string; bytes: number; sha256: string; cold?: string }>;
+}
+
+// 言語ごとの本文（cdmp_questions_<lang>.text.json）: ids と同じ並びの配列、無い問題は null
+interface BilingualText {
+  v: number;
+  language: string;
+  q: (string | null)[];
+  c: (string[] | null)[];
+  e?: (string[] | null)[]; // 解説を cold ブロックに分けたビルドでは無い
+}
+
+// NDJSON 形式（cdmp_questions_<lang>.ndjson）の先頭行: 演習セットごとの問題数
+interface NdjsonHeader {
+  v: number;
+  count: number;
+  setSizes: number[];
+  sets: { set: number; start: number; end: number; count: number }[];
+}
+
+// NDJSON 形式の2行目以降（コンパクト形式の1問）
+interface CompactRecord {
+  i: number;
+  q: string;
+  c: string[];
+  e: string[];
+  a: number;
+  d: string;
+}
+
+// 演習セットの区切り（cdmp_questions_<lang>.sets.json の1件）。ID の範囲はビルドの --set-size で決まる
+export interface PracticeSet {
+  set: number;
+  start: number;
+  end: number;
+  count: number;
+  path: string; // 演習セットの分割ファイル（cdmp_questions_<lang>.set-<n>.min.json）
+}
+
+interface PracticeSetManifest {
+  version: number;
+  setSizes: number[];
+  count: number;
+  sets: PracticeSet[];
+}
+
+// 演習セットの分割ファイル: コンパクト形式の問題の配列
+interface PracticeSetShard {
+  v: number;
+  q: CompactRecord[];
+}
+
+// 解説ブロックのオフセット索引（cdmp_questions_<lang>.cold.json）
+interface ColdIndex {
+  v: number;
+  file: string;
+  blockSize: number;
+  count: number;
+  bytes: number;
+  sha256: string;
+  blocks: { offset: number; length: number; ids: number[] }[];
+}
 
-export async function loadQuestions(language: 'en' | 'ja' = 'en', practiceSet?: number): Promise<Question[]> {
+// cold ブロック1行分: ids と同じ並びの解説
+interface ColdBlock {
+  i: number[];
+  e: string[][];
+}
+
+// 共通部分は1回、本文は言語ごとに1回だけ取得する（言語切り替えでは本文だけを追加で取得）
+let bundlePromise: Promise<BilingualBundle | null> | null = null;
+const textPromises = new Map<string, Promise<BilingualText | null>>();
+
+// 言語ごとの cold 索引のファイル名と、取得済み（取得中）の索引・ブロック
+const coldFiles = new Map<string, string>();
+const coldIndexPromises = new Map<string, Promise<{ index: ColdIndex; blockOf: Map<number, number> } | null>>();
+const blockPromises = new Map<string, Promise<Map<number, string[]> | null>>();
+const coldFilePromises = new Map<string, Promise<ArrayBuffer | null>>();
+const setManifestPromises = new Map<string, Promise<PracticeSetManifest | null>>();
+
+// 演習セットのマニフェストが無い古いビルド用: ビルドの既定（--set-size 200）で ID を区切る
+const FALLBACK_SET_SIZE = 200;
+
+async function fetchJson<T>(path: string): Promise<T | null> {
   try {
-    const fileName = language === 'ja' ? 'cdmp_questions_ja.json.backup' : 'cdmp_questions_en.json.backup';
-    console.log(`Fetching JSON file: ${fileName}...`);
-    const response = await fetch(`/data/${fileName}`);
-    console.log('Request URL:', new URL(`/data/${fileName}`, window.location.origin).href);
-    console.log('Response status:', response.status, response.statusText);
-    
+    const response = await fetch(path);
     if (!response.ok) {
-      throw new Error(`Failed to fetch questions: ${response.status} ${response.statusText}`);
+      return null;
     }
-    
-    const jsonText = await response.text();
-    console.log('JSON text length:', jsonText.length);
-    
-    if (jsonText.length < 100) {
-      throw new Error(`JSON file appears to be empty or too small. Length: ${jsonText.length}`);
+    return await response.json() as T;
+  } catch (error) {
+    console.warn(`Could not load ${path}:`, error);
+    return null;
+  }
+}
+
+async function loadBilingualQuestions(language: 'en' | 'ja'): Promise<Question[] | null> {
+  if (!bundlePromise) {
+    bundlePromise = fetchJson<BilingualBundle>('/data/cdmp_questions.bilingual.json');
+  }
+  const bundle = await bundlePromise;
+  const entry = bundle?.text[language];
+  if (!bundle || !entry) {
+    bundlePromise = null;
+    return null;
+  }
+
+  let textPromise = textPromises.get(language);
+  if (!textPromise) {
+    textPromise = fetchJson<BilingualText>(`/data/${entry.file}`);
+    textPromises.set(language, textPromise);
+  }
+  const text = await textPromise;
+  if (!text || text.q.length !== bundle.ids.length) {
+    textPromises.delete(language);
+    return null;
+  }
+
+  const questions: Question[] = [];
+  bundle.ids.forEach((id, k) => {
+    const questionText = text.q[k];
+    const choices = text.c[k];
+    // 解説が cold ブロックにある場合は空のまま返し、回答後に loadExplanations で取得する
+    const explanations = text.e ? text.e[k] : [];
+    if (questionText === null || !choices || !explanations) {
+      return; // この言語には無い問題
     }
-    
-    let backupQuestions: BackupQuestion[];
-    try {
-      backupQuestions = JSON.parse(jsonText);
-      console.log('JSON parsing successful');
-    } catch (parseError) {
-      console.error('JSON parsing failed:', parseError);
-      throw new Error(`JSON parsing error: ${parseError instanceof Error ? parseError.message : String(parseError)}`);
+    questions.push({
+      id,
+      text: questionText,
+      options: choices.map((choice, i) => ({
+        id: id * 10 + i + 1,
+        text: choice,
+        explanation: explanations[i] ?? ''
+      })),
+      correctIndex: bundle.a[k] as 0 | 1 | 2 | 3 | 4,
+      explanations: [...explanations],
+      domain: bundle.domains[String(bundle.d[k])]
+    });
+  });
+  if (!text.e && entry.cold) {
+    coldFiles.set(language, entry.cold);
+  }
+  console.log(`Loaded ${questions.length} questions from the bilingual bundle (${language})`);
+  return questions;
+}
+
+async function loadColdIndex(language: 'en' | 'ja') {
+  const file = coldFiles.get(language);
+  if (!file) {
+    return null;
+  }
+  let indexPromise = coldIndexPromises.get(language);
+  if (!indexPromise) {
+    indexPromise = fetchJson<ColdIndex>(`/data/${file}`).then(index => {
+      if (!index) {
+        return null;
+      }
+      const blockOf = new Map<number, number>();
+      index.blocks.forEach((block, b) => {
+        block.ids.forEach(id => {
+          if (!blockOf.has(id)) {
+            blockOf.set(id, b); // 重複した ID は最初の行の解説を使う
+          }
+        });
+      });
+      return { index, blockOf };
+    });
+    coldIndexPromises.set(language, indexPromise);
+  }
+  const loaded = await indexPromise;
+  if (!loaded) {
+    coldIndexPromises.delete(language);
+  }
+  return loaded;
+}
+
+// 1ブロック分のバイト列を Range リクエストで取得する。Range 非対応のサーバー（200 応答）では
+// ファイル全体を1回だけ取得して以後はそこから切り出す
+async function fetchBlockBytes(path: string, offset: number, length: number): Promise<ArrayBuffer | null> {
+  const whole = coldFilePromises.get(path);
+  if (whole) {
+    const buffer = await whole;
+    return buffer ? buffer.slice(offset, offset + length) : null;
+  }
+  try {
+    const response = await fetch(path, { headers: { Range: `bytes=${offset}-${offset + length - 1}` } });
+    if (response.status === 206) {
+      return await response.arrayBuffer();
     }
-    
-    if (!backupQuestions || backupQuestions.length === 0) {
-      throw new Error(`No questions found in JSON data. Found ${backupQuestions?.length || 0} questions.`);
+    if (!response.ok) {
+      return null;
     }
-    
-    // .backup形式から現在のアプリ形式に変換
-    let questions: Question[] = backupQuestions.map(backupQ => {
-      const options = backupQ.choices.map(choice => ({
-        id: 0, // 一時的なID
-        text: choice.choice,
-        explanation: choice.explanation
-      }));
-      
-      const explanations = backupQ.choices.map(choice => choice.explanation);
-      
-      return {
-        id: backupQ.number,
-        text: backupQ.question,
-        options: options,
-        correctIndex: (backupQ.correct - 1) as 0 | 1 | 2 | 3 | 4, // 1-basedから0-basedに変換
-        explanations: explanations,
-        domain: backupQ.domain
-      };
+    const buffer = response.arrayBuffer();
+    coldFilePromises.set(path, buffer.catch(() => null));
+    return (await buffer).slice(offset, offset + length);
+  } catch (error) {
+    console.warn(`Could not load ${path}:`, error);
+    return null;
+  }
+}
+
+async function loadBlock(language: 'en' | 'ja', index: ColdIndex, b: number) {
+  const key = `${language}:${b}`;
+  let blockPromise = blockPromises.get(key);
+  if (!blockPromise) {
+    const { offset, length } = index.blocks[b];
+    blockPromise = fetchBlockBytes(`/data/${index.file}`, offset, length).then(bytes => {
+      if (!bytes) {
+        return null;
+      }
+      const block = JSON.parse(new TextDecoder().decode(bytes)) as ColdBlock;
+      const explanations = new Map<number, string[]>();
+      block.i.forEach((id, k) => {
+        if (!explanations.has(id)) {
+          explanations.set(id, block.e[k]);
+        }
+      });
+      return explanations;
     });
+    blockPromises.set(key, blockPromise);
+  }
+  const explanations = await blockPromise;
+  if (!explanations) {
+    blockPromises.delete(key);
+  }
+  return explanations;
+}
+
+// 問題の解説（CSV の選択肢の順）を cold ブロックから取得する。解説が本体に含まれるビルドでは null
+export async function loadExplanations(language: 'en' | 'ja', questionId: number): Promise<string[] | null> {
+  const loaded = await loadColdIndex(language);
+  const b = loaded?.blockOf.get(questionId);
+  if (!loaded || b === undefined) {
+    return null;
+  }
+  const explanations = await loadBlock(language, loaded.index, b);
+  return explanations?.get(questionId) ?? null;
+}
+
+// 最初の問題を表示した後、解説ブロックを順にバックグラウンドで取得し、解説を補った問題を返す
+export async function prefetchExplanations(language: 'en' | 'ja', questions: Question[]): Promise<Question[] | null> {
+  const loaded = await loadColdIndex(language);
+  if (!loaded) {
+    return null;
+  }
+  const explanations = new Map<number, string[]>();
+  for (let b = 0; b < loaded.index.blocks.length; b++) {
+    const block = await loadBlock(language, loaded.index, b);
+    if (!block) {
+      return null;
+    }
+    block.forEach((value, id) => {
+      if (!explanations.has(id)) {
+        explanations.set(id, value);
+      }
+    });
+  }
+  return questions.map(question => {
+    const value = explanations.get(question.id);
+    return explanationsMissing(question) && value ? withExplanations(question, value) : question;
+  });
+}
+
+// 解説が未取得か。cold ブロックにある問題は explanations が空で、保存済みの結果などから戻した問題は要素が欠けていることがある
+export function explanationsMissing(question: Question): boolean {
+  return question.explanations.length === 0
+    || [...question.explanations].some(explanation => explanation === undefined || explanation === null);  // spread: 穴あき配列の穴も undefined として数える
+}
+
+// 取得した解説を問題に当てはめる。選択肢がシャッフルされていても option.id（id * 10 + n）で元の位置が分かる
+export function withExplanations(question: Question, explanations: string[]): Question {
+  const options = question.options.map(option => ({
+    ...option,
+    explanation: explanations[option.id - question.id * 10 - 1] ?? ''
+  }));
+  return { ...question, options, explanations: options.map(option => option.explanation) };
+}
+
+// レスポンスを受信しながら1行ずつ JSON として渡す（ファイル全体を文字列として保持しない）
+function fromCompact(record: CompactRecord): Question {
+  return {
+    id: record.i,
+    text: record.q,
+    options: record.c.map((choice, i) => ({
+      id: record.i * 10 + i + 1,
+      text: choice,
+      explanation: record.e[i]
+    })),
+    correctIndex: record.a as 0 | 1 | 2 | 3 | 4,
+    explanations: [...record.e],
+    domain: record.d
+  };
+}
+
+// 演習セットの一覧を cdmp_questions_<lang>.sets.json から取得する。マニフェストが無い古いビルドでは null
+export async function loadPracticeSets(language: 'en' | 'ja'): Promise<PracticeSet[] | null> {
+  let manifestPromise = setManifestPromises.get(language);
+  if (!manifestPromise) {
+    manifestPromise = fetchJson<PracticeSetManifest>(`/data/cdmp_questions_${language}.sets.json`);
+    setManifestPromises.set(language, manifestPromise);
+  }
+  const manifest = await manifestPromise;
+  if (!manifest?.sets?.length) {
+    setManifestPromises.delete(language);
+    return null;
+  }
+  return manifest.sets;
+}
+
+// マニフェストが無いときの演習セット: 読み込んだ問題の ID を FALLBACK_SET_SIZE ずつ区切る
+export function fallbackPracticeSets(questions: Question[]): PracticeSet[] {
+  const lastId = questions.reduce((max, q) => Math.max(max, q.id), 0);
+  const sets: PracticeSet[] = [];
+  for (let start = 1; start <= lastId; start += FALLBACK_SET_SIZE) {
+    const end = start + FALLBACK_SET_SIZE - 1;
+    sets.push({
+      set: sets.length + 1,
+      start,
+      end,
+      count: questions.filter(q => q.id >= start && q.id <= end).length,
+      path: ''
+    });
+  }
+  return sets;
+}
+
+// 演習セットの ID の範囲にある問題。一覧に無いセット番号なら絞り込まない
+export function questionsInSet(questions: Question[], sets: PracticeSet[], practiceSet: number): Question[] {
+  const entry = sets.find(s => s.set === practiceSet);
+  return entry ? questions.filter(q => q.id >= entry.start && q.id <= entry.end) : questions;
+}
+
+// 1つの演習セットだけを分割ファイルから読み込む（バンク全体は取得しない）
+async function loadPracticeSetQuestions(language: 'en' | 'ja', practiceSet: number): Promise<Question[] | null> {
+  const entry = (await loadPracticeSets(language))?.find(s => s.set === practiceSet);
+  if (!entry?.path) {
+    return null;
+  }
+  const shard = await fetchJson<PracticeSetShard>(`/data/${entry.path}`);
+  if (!shard?.q) {
+    return null;
+  }
+  console.log(`Loaded practice set ${practiceSet} from ${entry.path}: ${shard.q.length} questions`);
+  return shard.q.map(fromCompact);
+}
+
+async function streamNdjson(response: Response, onLine: (value: unknown) => void): Promise<void> {
+  if (!response.body) {
+    (await response.text()).split('\n').filter(line => line.trim()).forEach(line => onLine(JSON.parse(line)));
+    return;
+  }
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let pending = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    pending += decoder.decode(value, { stream: !done });
+    const lines = pending.split('\n');
+    pending = done ? '' : lines.pop() ?? '';
+    lines.filter(line => line.trim()).forEach(line => onLine(JSON.parse(line)));
+    if (done) {
+      return;
+    }
+  }
+}
+
+// 演習セット順の NDJSON を読み込み、演習セットを1つ読み終えるごとに onProgress へ途中までの問題を渡す
+async function loadNdjsonQuestions(
+  language: 'en' | 'ja',
+  onProgress?: (questions: Question[]) => void
+): Promise<Question[] | null> {
+  let response: Response;
+  try {
+    response = await fetch(`/data/cdmp_questions_${language}.ndjson`);
+  } catch (error) {
+    console.warn('Could not load the NDJSON bank:', error);
+    return null;
+  }
+  if (!response.ok) {
+    return null;
+  }
+
+  let header: NdjsonHeader | null = null;
+  const questions: Question[] = [];
+  const boundaries: number[] = [];
+  try {
+    await streamNdjson(response, value => {
+      if (!header) {
+        header = value as NdjsonHeader;
+        header.sets.reduce((end, set) => {
+          boundaries.push(end + set.count);
+          return end + set.count;
+        }, 0);
+        return;
+      }
+      questions.push(fromCompact(value as CompactRecord));
+      if (questions.length === boundaries[0]) {
+        boundaries.shift();
+        if (onProgress && questions.length < header.count) {
+          onProgress([...questions]);
+        }
+      }
+    });
+  } catch (error) {
+    console.warn('Could not read the NDJSON bank:', error);
+    return null;
+  }
+  console.log(`Loaded ${questions.length} questions from the NDJSON bank (${language})`);
+  return questions;
+}
+
+async function loadBackupQuestions(language: 'en' | 'ja'): Promise<Question[]> {
+  const fileName = language === 'ja' ? 'cdmp_questions_ja.json.backup' : 'cdmp_questions_en.json.backup';
+  console.log(`Fetching JSON file: ${fileName}...`);
+  const response = await fetch(`/data/${fileName}`);
+  console.log('Request URL:', new URL(`/data/${fileName}`, window.location.origin).href);
+  console.log('Response status:', response.status, response.statusText);
+
+  if (!response.ok) {
+    throw new Error(`Failed to fetch questions: ${response.status} ${response.statusText}`);
+  }
+
+  const jsonText = await response.text();
+  console.log('JSON text length:', jsonText.length);
+
+  if (jsonText.length < 100) {
+    throw new Error(`JSON file appears to be empty or too small. Length: ${jsonText.length}`);
+  }
+
+  let backupQuestions: BackupQuestion[];
+  try {
+    backupQuestions = JSON.parse(jsonText);
+    console.log('JSON parsing successful');
+  } catch (parseError) {
+    console.error('JSON parsing failed:', parseError);
+    throw new Error(`JSON parsing error: ${parseError instanceof Error ? parseError.message : String(parseError)}`);
+  }
+
+  if (!backupQuestions || backupQuestions.length === 0) {
+    throw new Error(`No questions found in JSON data. Found ${backupQuestions?.length || 0} questions.`);
+  }
+
+  // .backup形式から現在のアプリ形式に変換
+  return backupQuestions.map(backupQ => {
+    const options = backupQ.choices.map(choice => ({
+      id: 0, // 一時的なID
+      text: choice.choice,
+      explanation: choice.explanation
+    }));
+
+    const explanations = backupQ.choices.map(choice => choice.explanation);
+
+    return {
+      id: backupQ.number,
+      text: backupQ.question,
+      options: options,
+      correctIndex: (backupQ.correct - 1) as 0 | 1 | 2 | 3 | 4, // 1-basedから0-basedに変換
+      explanations: explanations,
+      domain: backupQ.domain
+    };
+  });
+}
+
+
+export async function loadQuestions(
+  language: 'en' | 'ja' = 'en',
+  practiceSet?: number,
+  onProgress?: (questions: Question[]) => void
+): Promise<Question[]> {
+  try {
+    // 演習セットを指定された場合は、そのセットの分割ファイルだけを読む
+    if (practiceSet) {
+      const shard = await loadPracticeSetQuestions(language, practiceSet);
+      if (shard?.length) {
+        return shard;
+      }
+    }
+
+    // バンドルが無い場合は NDJSON を受信しながら読み、それも無い（古いビルド）場合は従来の .backup ファイルを読む
+    let questions: Question[] = (await loadBilingualQuestions(language))
+      ?? (await loadNdjsonQuestions(language, onProgress))
+      ?? (await loadBackupQuestions(language));
     console.log('Total questions loaded:', questions.length);
     
-    // Filter by practice set if specified
-    if (practiceSet && practiceSet >= 1 && practiceSet <= 4) {
-      const startNum = (practiceSet - 1) * 200 + 1;
-      const endNum = Math.min(practiceSet * 200, 799);
-      console.log(`Filtering for practice set ${practiceSet}: ${startNum}-${endNum}`);
+    // Filter by practice set if specified (ranges from the sets manifest)
+    if (practiceSet) {
+      const sets = (await loadPracticeSets(language)) ?? fallbackPracticeSets(questions);
       console.log(`Questions before filtering: ${questions.length}`);
-      
-      questions = questions.filter(q => 
-        q.id >= startNum && q.id <= endNum
-      );
-      console.log(`Filtered to practice set ${practiceSet}: ${questions.length} questions (${startNum}-${endNum})`);
+      questions = questionsInSet(questions, sets, practiceSet);
+      console.log(`Filtered to practice set ${practiceSet}: ${questions.length} questions`);
     }
     
     console.log('Successfully loaded questions:', questions.length);
@@ -10,6 +10,11 @@ export const shuffleArray = <T>(array: T[]): T[] => {
   return shuffled;
 };
 
+// Reorder explanations along with the options; cold explanations (an empty array) stay empty
+// and are placed later through option.id, so no undefined slots are created
+const reorderExplanations = (explanations: string[], order: number[]): string[] =>
+  explanations.length === 0 ? [] : order.map(index => explanations[index]);
+
 // Shuffle questions
 export const shuffleQuestions = (questions: Question[]): Question[] => {
   return shuffleArray(questions);
@@ -27,7 +32,7 @@ export const shuffleQuestionOptions = (question: Question): Question => {
   
   // Reorder options, explanations, and find new correct index
   const shuffledOptions = shuffledIndices.map(index => originalOptions[index]);
-  const shuffledExplanations = shuffledIndices.map(index => originalExplanations[index]);
+  const shuffledExplanations = reorderExplanations(originalExplanations, shuffledIndices);
   const newCorrectIndex = shuffledIndices.indexOf(originalCorrectIndex);
   
   return {
@@ -38,6 +43,31 @@ export const shuffleQuestionOptions = (question: Question): Question => {
   };
 };
 
+// Decode a Lehmer code (0-119) into an option order, as cdmp_compiler/exams.py encodes it
+export const decodePermutation = (code: number, size = 5): number[] => {
+  const remaining = Array.from({ length: size }, (_, i) => i);
+  const factorials = [1];
+  for (let i = 1; i < size; i++) factorials.push(factorials[i - 1] * i);
+  const order: number[] = [];
+  for (let position = size - 1; position >= 0; position--) {
+    const digit = Math.floor(code / factorials[position]);
+    code %= factorials[position];
+    order.push(remaining.splice(digit, 1)[0]);
+  }
+  return order;
+};
+
+// Reorder options by a pre-generated permutation code while maintaining correctness
+export const permuteQuestionOptions = (question: Question, code: number): Question => {
+  const order = decodePermutation(code, question.options.length);
+  return {
+    ...question,
+    options: order.map(index => question.options[index]),
+    explanations: reorderExplanations(question.explanations, order),
+    correctIndex: order.indexOf(question.correctIndex) as 0 | 1 | 2 | 3 | 4
+  };
+};
+
 // Shuffle both questions and their options
 export const shuffleQuestionsAndOptions = (questions: Question[]): Question[] => {
   const shuffledQuestions = shuffleQuestions(questions);
@@ -0,0 +1,17 @@
+-- Create user_profiles table: one precomputed weakness profile per user,
+-- written by the nightly `python3 -m cdmp_compiler profiles` job
+CREATE TABLE IF NOT EXISTS public.user_profiles (
+  user_id UUID PRIMARY KEY REFERENCES auth.users(id) ON DELETE CASCADE,
+  profile JSONB NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Enable Row Level Security
+ALTER TABLE public.user_profiles ENABLE ROW LEVEL SECURITY;
+
+-- Create policy to allow users to view only their own profile
+CREATE POLICY "Users can view own profile" ON public.user_profiles
+  FOR SELECT USING (auth.uid() = user_id);
+
+-- Grant necessary permissions (the batch job writes with the service role)
+GRANT SELECT ON public.user_profiles TO authenticated;